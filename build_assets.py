@@ -0,0 +1,205 @@
+"""Build responsive variants of the showcase images.
+
+Transcodes every image in ``streamlit_app/`` (plus the email assistant image
+in the repository root) to WebP, and to AVIF when Pillow supports it, at a
+fixed set of widths. The variants and a ``manifest.json`` describing their
+dimensions and content hashes are written to ``streamlit_app/variants/``;
+``showcase.assets`` reads that manifest at runtime to pick the smallest
+variant that fills a column.
+
+Every variant Streamlit's static handler can serve, and each original, is
+also published to ``static/`` under a content-hashed file name. With
+``server.enableStaticServing`` on, the pages reference those URLs directly so
+browsers and proxies can cache them indefinitely.
+
+The shared stylesheet is minified to ``showcase/theme.min.css`` as well.
+
+Usage:
+    python build_assets.py [--force]
+"""
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import sys
+
+from PIL import Image
+
+from showcase import theme
+
+try:
+    import pillow_avif  # noqa: F401  (registers the AVIF plugin on older Pillow)
+except ImportError:
+    pass
+
+ROOT_DIR = os.path.dirname(os.path.abspath(__file__))
+ASSET_DIR = os.path.join(ROOT_DIR, "streamlit_app")
+VARIANT_DIR = os.path.join(ASSET_DIR, "variants")
+MANIFEST_PATH = os.path.join(VARIANT_DIR, "manifest.json")
+STATIC_DIR = os.path.join(ROOT_DIR, "static")
+EXTRA_SOURCES = ["ai_email_assistant.png"]
+SOURCE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".webp")
+
+WIDTHS = (320, 640, 960, 1280, 1920)
+FORMATS = {
+    "webp": {"format": "WEBP", "quality": 80, "method": 6},
+    "avif": {"format": "AVIF", "quality": 55},
+}
+# Extensions Streamlit's app/static handler serves with their real mimetype;
+# anything else (AVIF included) is sent as text/plain and will not render.
+STATIC_EXTENSIONS = (".png", ".jpg", ".jpeg", ".webp")
+
+
+def sha256_file(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def available_formats():
+    """Output formats this Pillow build can encode."""
+    registered = Image.registered_extensions()
+    return [fmt for fmt in FORMATS if "." + fmt in registered]
+
+
+def find_sources():
+    sources = []
+    for filename in sorted(os.listdir(ASSET_DIR)):
+        if filename.lower().endswith(SOURCE_EXTENSIONS):
+            sources.append("streamlit_app/" + filename)
+    for filename in EXTRA_SOURCES:
+        if os.path.exists(os.path.join(ROOT_DIR, filename)):
+            sources.append(filename)
+    return sources
+
+
+def target_widths(source_width):
+    widths = [w for w in WIDTHS if w < source_width]
+    # Always keep one variant at (capped) full resolution.
+    widths.append(min(source_width, WIDTHS[-1]))
+    return sorted(set(widths))
+
+
+def build_asset(source, formats):
+    """Encode every variant of ``source`` and return its manifest entry."""
+    source_path = os.path.join(ROOT_DIR, source)
+    stem = os.path.splitext(os.path.basename(source))[0]
+    variants = []
+    with Image.open(source_path) as image:
+        image.load()
+        width, height = image.size
+        if image.mode not in ("RGB", "RGBA"):
+            image = image.convert("RGBA" if "transparency" in image.info else "RGB")
+        for variant_width in target_widths(width):
+            variant_height = max(1, round(height * variant_width / width))
+            resized = image if variant_width == width else image.resize((variant_width, variant_height), Image.LANCZOS)
+            for fmt in formats:
+                filename = f"{stem}-{variant_width}.{fmt}"
+                out_path = os.path.join(VARIANT_DIR, filename)
+                resized.save(out_path, **FORMATS[fmt])
+                variants.append({
+                    "format": fmt,
+                    "width": variant_width,
+                    "height": variant_height,
+                    "bytes": os.path.getsize(out_path),
+                    "sha256": sha256_file(out_path),
+                    "path": "streamlit_app/variants/" + filename,
+                })
+    return {
+        "width": width,
+        "height": height,
+        "bytes": os.path.getsize(source_path),
+        "sha256": sha256_file(source_path),
+        "variants": variants,
+    }
+
+
+def static_name(path, digest):
+    """Content-hashed file name for ``path`` inside ``static/``."""
+    stem, ext = os.path.splitext(os.path.basename(path))
+    return f"{stem}.{digest[:12]}{ext}"
+
+
+def publish_static(entry, source):
+    """Copy ``source`` and its servable variants into ``static/``.
+
+    Adds a ``static`` key (file name relative to ``static/``) to the entry and
+    to each published variant, and returns the set of names written.
+    """
+    published = set()
+    for item, path in [(entry, source)] + [(v, v["path"]) for v in entry["variants"]]:
+        if not path.lower().endswith(STATIC_EXTENSIONS):
+            continue
+        name = static_name(path, item["sha256"])
+        target = os.path.join(STATIC_DIR, name)
+        if not os.path.exists(target):
+            shutil.copyfile(os.path.join(ROOT_DIR, path), target)
+        item["static"] = name
+        published.add(name)
+    return published
+
+
+def previously_published(assets):
+    names = set()
+    for entry in assets.values():
+        for item in [entry] + entry.get("variants", []):
+            if "static" in item:
+                names.add(item["static"])
+    return names
+
+
+def is_current(entry, digest, formats):
+    """True if ``entry`` was built from ``digest`` and all its files still exist."""
+    if not entry or entry.get("sha256") != digest:
+        return False
+    if {v["format"] for v in entry["variants"]} != set(formats):
+        return False
+    return all(os.path.exists(os.path.join(ROOT_DIR, v["path"])) for v in entry["variants"])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build responsive image variants for the showcase pages.")
+    parser.add_argument("--force", action="store_true", help="re-encode every asset even if unchanged")
+    args = parser.parse_args(argv)
+
+    os.makedirs(VARIANT_DIR, exist_ok=True)
+    os.makedirs(STATIC_DIR, exist_ok=True)
+    formats = available_formats()
+    if "avif" not in formats:
+        print("AVIF encoding not available in this Pillow build; writing WebP only.", file=sys.stderr)
+
+    previous = {}
+    if os.path.exists(MANIFEST_PATH):
+        with open(MANIFEST_PATH, "r", encoding="utf-8") as f:
+            previous = json.load(f).get("assets", {})
+
+    assets = {}
+    published = set()
+    for source in find_sources():
+        digest = sha256_file(os.path.join(ROOT_DIR, source))
+        if not args.force and is_current(previous.get(source), digest, formats):
+            entry = previous[source]
+        else:
+            entry = build_asset(source, formats)
+            saved = entry["bytes"] - min(v["bytes"] for v in entry["variants"])
+            print(f"{source}: {len(entry['variants'])} variants, smallest saves {saved / 1024:.0f} KiB")
+        published |= publish_static(entry, source)
+        assets[source] = entry
+
+    # Drop hashed copies that no longer belong to any asset.
+    for name in previously_published(previous) - published:
+        stale = os.path.join(STATIC_DIR, name)
+        if os.path.exists(stale):
+            os.remove(stale)
+
+    with open(MANIFEST_PATH, "w", encoding="utf-8") as f:
+        json.dump({"version": 1, "widths": list(WIDTHS), "assets": assets}, f, indent=2)
+    print(f"Wrote {MANIFEST_PATH} ({len(assets)} assets)")
+    print(f"Wrote {theme.build()}")
+
+
+if __name__ == "__main__":
+    main()
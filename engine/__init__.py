@@ -0,0 +1 @@
+"""Local execution engine for the showcased n8n workflows."""
@@ -0,0 +1,263 @@
+"""Run a workflow against the local stand-ins and report throughput.
+
+Seeds the stand-in sheet with synthetic leads (a share of them with invalid
+e-mail addresses), runs the workflow once from its trigger and prints per
+node counters in topological order.
+
+Usage:
+    python -m engine.bench [workflow.json] [--leads N] [--latency-ms MS] [-c CONCURRENCY] [--http]
+"""
+import argparse
+import asyncio
+import functools
+import os
+import resource
+import sys
+
+from engine import digest, graph as graph_module, htmltext, nodes, ratelimit
+from engine.emails import EmailPartition
+from engine.fetch import HTTPClient
+from engine.incremental import IncrementalSheets, ReadState
+from engine.llmcache import CachedLLM
+from engine.llmjson import ReplyParser
+from engine.runner import Engine
+from engine.services import LocalLLM, LocalMail, LocalSheets, LocalWeb, Services
+from engine.sheets import BatchWriter, SQLiteSheets
+from engine.singleflight import CoalescingWeb, Shared
+from engine.stub import StubServer
+from engine.webcache import CachingWeb, Memoized, WebCache
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_WORKFLOW = os.path.join(ROOT_DIR, "workflow.json")
+
+
+def synthetic_leads(count, invalid_every=10, companies=None, scheme="https"):
+    """``count`` lead rows; every ``invalid_every``-th has a broken e-mail.
+
+    Leads share ``companies`` websites (default: one per lead).
+    """
+    companies = companies or count
+    for i in range(count):
+        company = f"company{i % companies}"
+        email = f"lead{i}.{company}.example.com" if invalid_every and i % invalid_every == 0 \
+            else f"lead{i}@{company}.example.com"
+        yield {
+            "id": str(i + 1),
+            "first_name": f"Lead{i}",
+            "last_name": "Example",
+            "company_name": company.title(),
+            "email": email,
+            "website": f"{scheme}://www.{company}.example.com/",
+            "status": "",
+        }
+
+
+def build_services(leads, latency=0.0, page_bytes=20_000, web=None, sheets=None, keep_outbox=True):
+    return Services(
+        sheets=sheets if sheets is not None else LocalSheets(leads, latency=latency),
+        mail=LocalMail(latency=latency, keep=keep_outbox),
+        llm=LocalLLM(latency=latency),
+        web=web if web is not None else LocalWeb(page_bytes=page_bytes, latency=latency),
+    )
+
+
+def percentile(ordered, pct):
+    """Nearest-rank percentile of an ascending list."""
+    return ordered[min(len(ordered) - 1, len(ordered) * pct // 100)]
+
+
+def report(run, out=sys.stdout):
+    print(f"{'node':32} {'runs':>6} {'in':>8} {'out':>8} {'errors':>7} {'busy s':>9}", file=out)
+    for name in run.graph.order:
+        stats = run.stats[name]
+        if stats.executions:
+            print(f"{name[:32]:32} {stats.executions:6} {stats.items_in:8} {stats.items_out:8} "
+                  f"{stats.errors:7} {stats.seconds:9.3f}", file=out)
+
+
+def rows_read(run):
+    """Rows output by the run's Sheets read nodes."""
+    return sum(run.stats[name].items_out for name, node in run.graph.nodes.items()
+               if node.type == "n8n-nodes-base.googleSheets" and node.parameters.get("operation", "read") == "read")
+
+
+def counters(services):
+    """``(e-mails sent, LLM calls, fetches, sheet writes)`` so far."""
+    return services.mail.sent, services.llm.calls, services.web.fetches, services.sheets.writes
+
+
+def summary(leads, seconds, counts):
+    sent, calls, fetches, writes = counts
+    return (f"{leads} leads in {seconds:.2f}s: {leads / seconds if seconds else 0:.0f} leads/s, "
+            f"{sent} e-mails sent, {calls} LLM calls, {fetches} fetches, {writes} sheet writes")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark a workflow on the local engine.")
+    parser.add_argument("workflow", nargs="?", default=DEFAULT_WORKFLOW)
+    parser.add_argument("--leads", type=int, default=1000, help="synthetic lead rows (default: %(default)s)")
+    parser.add_argument("--companies", type=int, help="distinct company websites (default: one per lead)")
+    parser.add_argument("--latency-ms", type=float, default=20.0,
+                        help="per-call latency of every stand-in service (default: %(default)s)")
+    parser.add_argument("--page-bytes", type=int, default=20_000, help="size of generated pages")
+    parser.add_argument("-c", "--concurrency", type=int, default=64, help="items in flight per node")
+    parser.add_argument("--time-scale", type=float, default=0.0,
+                        help="multiplier for Wait node delays (default: %(default)s, no waiting)")
+    parser.add_argument("--trigger", help="trigger node to start from (default: the first one)")
+    parser.add_argument("--http", action="store_true",
+                        help="fetch websites over real sockets from a local stub server")
+    parser.add_argument("--max-connections", type=int, default=100, help="with --http: global connection cap")
+    parser.add_argument("--per-host", type=int, default=4, help="with --http: connections per host")
+    parser.add_argument("--max-body", type=int, default=1 << 20, help="with --http: body size cap in bytes")
+    parser.add_argument("--limit", default="",
+                        help="service rate limits, replacing the Wait nodes they cover, e.g. gmail=600/min,gemini=300/min:10")
+    parser.add_argument("--sqlite", metavar="PATH", nargs="?", const=":memory:",
+                        help="keep the lead sheet in SQLite (default path: in memory)")
+    parser.add_argument("--batch-rows", type=int, default=0,
+                        help="coalesce sheet updates into batches of this many rows (default: off)")
+    parser.add_argument("--incremental", metavar="PATH", nargs="?", const=":memory:",
+                        help="read only new or changed rows, keeping the watermark in PATH (default: in memory)")
+    parser.add_argument("--batch-delay", type=float, default=1.0, help="seconds before a partial batch is flushed")
+    parser.add_argument("--workers", type=int, default=0, help="worker processes for Clean Data (default: inline)")
+    parser.add_argument("--chunk-size", type=int, default=32, help="with --workers: most items per worker task")
+    parser.add_argument("--text-budget", type=int, default=htmltext.MAX_CHARS,
+                        help="characters of page text Clean Data keeps (default: %(default)s)")
+    parser.add_argument("--digest-tokens", type=int,
+                        help="replace Clean Data's page text with a digest of at most this many tokens")
+    parser.add_argument("--llm-ms-per-1k", type=float, default=0.0,
+                        help="extra LLM latency per 1000 prompt tokens (default: %(default)s)")
+    parser.add_argument("--llm-cache", metavar="PATH", nargs="?", const="",
+                        help="cache LLM answers in memory and, given a PATH, in a SQLite file")
+    parser.add_argument("--web-cache", metavar="PATH", nargs="?", const=":memory:",
+                        help="keep fetched pages and Clean Data results in a SQLite cache (default path: in memory)")
+    parser.add_argument("--single-flight", action="store_true",
+                        help="share concurrent fetches of one URL and Clean Data work on one page")
+    parser.add_argument("--validate-emails", action="store_true",
+                        help="validate e-mails in bulk (syntax, duplicates, disposable domains) instead of the regex")
+    parser.add_argument("--sloppy-llm", type=float, default=0.0,
+                        help="share of LLM replies in malformed shapes (default: %(default)s)")
+    parser.add_argument("--runs", type=int, default=1, help="run the workflow this many times (default: 1)")
+    parser.add_argument("--stream", type=int, metavar="BATCH", nargs="?", const=256,
+                        help="stream items in batches of BATCH (default: %(const)s) instead of whole lists")
+    parser.add_argument("--queue-size", type=int, default=4, help="with --stream: batches queued per node")
+    args = parser.parse_args(argv)
+    try:
+        limits = ratelimit.parse(args.limit)
+    except ValueError as e:
+        parser.error(str(e))
+
+    graph = graph_module.load(args.workflow)
+    latency = args.latency_ms / 1000
+    server = web = None
+    if args.http:
+        server = StubServer(page_bytes=args.page_bytes, delay=latency).start()
+        web = HTTPClient(max_connections=args.max_connections, per_host=args.per_host,
+                         max_body=args.max_body, resolver=server.resolve)
+    leads = synthetic_leads(args.leads, companies=args.companies, scheme="http" if args.http else "https")
+    sheets = SQLiteSheets(args.sqlite, rows=leads, latency=latency) if args.sqlite else LocalSheets(leads, latency)
+    if args.batch_rows:
+        sheets = BatchWriter(sheets, args.batch_rows, args.batch_delay)
+    if args.incremental:
+        sheets = IncrementalSheets(sheets, ReadState(args.incremental))
+    services = build_services(leads, latency, args.page_bytes, web, sheets, keep_outbox=not args.stream)
+    if args.digest_tokens:
+        clean_data = functools.partial(digest.digest_data, max_tokens=args.digest_tokens)
+    else:
+        clean_data = functools.partial(nodes.clean_data, max_chars=args.text_budget)
+    clean_data.batch = True
+    services.llm.per_token = args.llm_ms_per_1k / 1000 / 1000
+    services.llm.sloppy = args.sloppy_llm
+    parse_json = ReplyParser()
+    web_cache = None
+    # Single flight goes outside the cache for fetches and inside it for Clean Data.
+    if args.single_flight:
+        clean_data = shared = Shared(clean_data)
+    if args.web_cache:
+        web_cache = WebCache(args.web_cache)
+        services.web = CachingWeb(services.web, web_cache)
+        clean_data = Memoized(clean_data, web_cache)
+    if args.single_flight:
+        services.web = CoalescingWeb(services.web)
+    if args.llm_cache is not None:
+        services.llm = CachedLLM(services.llm, args.llm_cache or None)
+    partitions = {}
+    if args.validate_emails:
+        partitions["Validate E-mail with regex"] = EmailPartition()
+    engine = Engine(graph, services, code_nodes={"Clean Data": clean_data, "Parse Json": parse_json}, concurrency=args.concurrency,
+                    time_scale=args.time_scale, limits=limits, workers=args.workers,
+                    chunk_size=args.chunk_size, partitions=partitions,
+                    batch_size=args.stream, queue_size=args.queue_size)
+
+    # Partition reports of each run.
+    run_reports = []
+    # (leads read, seconds, counters) of each run.
+    runs = []
+
+    async def bench():
+        try:
+            for number in range(1, args.runs + 1):
+                before = counters(services)
+                run = await engine.run(args.trigger)
+                run_reports.append({name: partition.report for name, partition in partitions.items()})
+                runs.append((rows_read(run), run.elapsed,
+                             tuple(after - start for after, start in zip(counters(services), before))))
+                if args.runs > 1:
+                    print(f"run {number}: {summary(*runs[-1])}")
+            return run
+        finally:
+            if web is not None:
+                await web.close()
+    try:
+        run = asyncio.run(bench())
+    finally:
+        engine.close()
+        if server is not None:
+            server.stop()
+
+    report(run)
+    if web is not None:
+        print(f"\nHTTP: {web.requests} requests over {web.connections_opened} connections "
+              f"({web.connections_reused} reused), {web.bytes_read / (1 << 20):.1f} MiB, "
+              f"{web.truncated} truncated")
+    if args.batch_rows:
+        print(f"\nSheets: {sheets.updates} updates ({sheets.merged} merged) in {sheets.flushes} batch writes")
+    print(f"\nParse Json: {parse_json.snapshot()}")
+    for number, reports in enumerate(run_reports, 1):
+        for name, partition_report in reports.items():
+            print(f"\n{name}{f' (run {number})' if len(run_reports) > 1 else ''}: {partition_report}")
+    if args.incremental:
+        print(f"\nIncremental reads: {sheets.pages} pages, {sheets.rows_read} rows read, "
+              f"{sheets.rows_emitted} emitted")
+    if engine.pool is not None:
+        print(f"Pool: {engine.pool.snapshot()}")
+    for name, bucket in limits.items():
+        print(f"limit {name}: {bucket.snapshot()}")
+    if args.single_flight:
+        print(f"Single flight: {services.web.saved} fetches and {shared.saved} Clean Data runs saved")
+    if web_cache is not None:
+        print(f"Web cache: {services.web.snapshot()}, Clean Data reused {clean_data.hits}/"
+              f"{clean_data.hits + clean_data.misses}")
+        web_cache.close()
+    if args.llm_cache is not None:
+        print(f"LLM cache: {services.llm.snapshot()}")
+        services.llm.close()
+    durations = sorted(services.llm.durations)
+    if durations:
+        print(f"\nLLM: {services.llm.prompt_tokens} prompt tokens "
+              f"({services.llm.prompt_tokens // services.llm.calls} per call), "
+              f"latency p50 {percentile(durations, 50) * 1000:.0f} ms, "
+              f"p95 {percentile(durations, 95) * 1000:.0f} ms")
+    if args.digest_tokens and run.outputs.get("Clean Data"):
+        cleaned = [item.json for item in run.outputs["Clean Data"]]
+        print(f"Digest: {sum(d['tokens_before'] for d in cleaned)} page tokens -> "
+              f"{sum(d['tokens_after'] for d in cleaned)} digest tokens")
+    totals = tuple(map(sum, zip(*(counts for _, _, counts in runs))))
+    print(f"\n{'all runs: ' if len(runs) > 1 else ''}"
+          f"{summary(sum(leads for leads, _, _ in runs), sum(seconds for _, seconds, _ in runs), totals)}")
+    # ru_maxrss is in KiB on Linux.
+    print(f"Peak memory: {resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024:.0f} MiB")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,188 @@
+"""Fixed-budget digests of lead websites for the Outreach Prompt.
+
+The prompt only needs to know what a company does, but it was given the
+page's whole text, so prompt size, latency and cost grew with the website.
+:class:`OutlineExtractor` reads a page once and keeps only the salient
+parts: title, meta description, headings, the first substantial paragraphs,
+and the text of an "about us" section (an element whose id or class says
+"about", or the paragraphs under an "About ..." heading). :func:`digest`
+composes them, most telling first, into a text of at most ``max_tokens``
+and reports the token count of the page text it replaces.
+
+Token counts are estimated at four characters per token, a rough figure for
+English text with Gemini's and similar tokenizers.
+"""
+import re
+from html.parser import HTMLParser
+
+from engine.htmltext import SKIP_TAGS
+
+DIGEST_TOKENS = 400
+CHARS_PER_TOKEN = 4
+
+_ABOUT = re.compile(r"\b(about|who we are|our story|our mission|our company)\b", re.IGNORECASE)
+_ABOUT_ATTR = re.compile(r"about", re.IGNORECASE)
+_BLOCKS = {"title": "title", "h1": "heading", "h2": "heading", "h3": "heading",
+           "p": "paragraph", "li": "paragraph", "blockquote": "paragraph"}
+_HEADINGS = frozenset(("h1", "h2", "h3", "h4", "h5", "h6"))
+MIN_PARAGRAPH = 40
+
+
+def tokens_for_chars(chars):
+    return (chars + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+def estimate_tokens(text):
+    return tokens_for_chars(len(text))
+
+
+class OutlineExtractor(HTMLParser):
+    """Collects the salient parts of a page, each capped, in one pass."""
+
+    def __init__(self, max_headings=12, max_paragraphs=6, max_about_chars=1500):
+        super().__init__(convert_charrefs=True)
+        self.max_headings = max_headings
+        self.max_paragraphs = max_paragraphs
+        self.max_about_chars = max_about_chars
+        self.title = ""
+        self.description = ""
+        self.headings = []
+        self.paragraphs = []
+        self.about = []
+        self.text_chars = 0  # all visible text, for the "before" token count
+        self._skip = 0
+        self._block = None  # (tag, kind, parts)
+        self._about_tag = None
+        self._about_depth = 0
+        self._about_heading = False
+        self._about_chars = 0
+        self._seen = set()
+
+    def handle_starttag(self, tag, attrs):
+        if tag in SKIP_TAGS:
+            self._skip += 1
+            return
+        attrs = dict(attrs)
+        if tag == "meta":
+            name = (attrs.get("name") or attrs.get("property") or "").lower()
+            if name in ("description", "og:description") and not self.description:
+                self.description = " ".join((attrs.get("content") or "").split())
+            return
+        if self._about_tag is None:
+            if _ABOUT_ATTR.search(f"{attrs.get('id') or ''} {attrs.get('class') or ''}"):
+                self._about_tag, self._about_depth = tag, 1
+        elif tag == self._about_tag:
+            self._about_depth += 1
+        if tag in _BLOCKS or tag in _HEADINGS:
+            self._finish_block()
+            self._block = (tag, _BLOCKS.get(tag, "heading"), [])
+
+    def handle_endtag(self, tag):
+        if tag in SKIP_TAGS:
+            self._skip = max(0, self._skip - 1)
+            return
+        if self._block is not None and tag == self._block[0]:
+            self._finish_block()
+        if tag == self._about_tag:
+            self._about_depth -= 1
+            if not self._about_depth:
+                self._about_tag = None
+
+    def handle_data(self, data):
+        if self._skip:
+            return
+        self.text_chars += len(" ".join(data.split()))
+        if self._block is not None:
+            self._block[2].append(data)
+
+    def close(self):
+        super().close()
+        self._finish_block()
+
+    def _finish_block(self):
+        if self._block is None:
+            return
+        tag, kind, parts = self._block
+        self._block = None
+        text = " ".join("".join(parts).split())
+        if not text or text in self._seen:
+            return
+        self._seen.add(text)
+        if kind == "title":
+            self.title = self.title or text
+        elif kind == "heading":
+            self._about_heading = bool(_ABOUT.search(text))
+            if len(self.headings) < self.max_headings:
+                self.headings.append(text)
+        elif self._about_tag is not None or self._about_heading:
+            if self._about_chars < self.max_about_chars:
+                self.about.append(text)
+                self._about_chars += len(text)
+        elif len(self.paragraphs) < self.max_paragraphs and len(text) >= MIN_PARAGRAPH:
+            self.paragraphs.append(text)
+
+
+class Digest:
+    """A page digest and the token counts before and after."""
+
+    __slots__ = ("text", "tokens_before", "tokens_after")
+
+    def __init__(self, text, tokens_before):
+        self.text = text
+        self.tokens_before = tokens_before
+        self.tokens_after = estimate_tokens(text)
+
+
+def _fit(text, chars):
+    if len(text) <= chars:
+        return text
+    cut = text[:max(0, chars - 1)]
+    return (cut.rsplit(" ", 1)[0] if " " in cut else cut) + "…"
+
+
+def digest(html, max_tokens=DIGEST_TOKENS):
+    """Build a :class:`Digest` of the page ``html`` within ``max_tokens``."""
+    outline = OutlineExtractor()
+    outline.feed(html or "")
+    outline.close()
+
+    sections = []
+    if outline.title:
+        sections.append(f"Title: {outline.title}")
+    if outline.description:
+        sections.append(f"Description: {outline.description}")
+    if outline.headings:
+        sections.append("Headings: " + "; ".join(outline.headings))
+    if outline.about:
+        sections.append("About: " + " ".join(outline.about))
+    sections.extend(f"- {paragraph}" for paragraph in outline.paragraphs)
+
+    budget = max_tokens * CHARS_PER_TOKEN
+    lines = []
+    for section in sections:
+        room = budget - sum(len(line) + 1 for line in lines)
+        if room < 20:
+            break
+        lines.append(_fit(section, room))
+    return Digest("\n".join(lines), tokens_for_chars(outline.text_chars))
+
+
+def digest_data(batch, max_tokens=DIGEST_TOKENS):
+    """Batch Code port for Clean Data: ``cleanedData`` becomes the page digest.
+
+    Adds ``tokens_before``/``tokens_after`` to each item. Swap it in with
+    ``Engine(code_nodes={"Clean Data": port})`` after setting ``port.batch``.
+    """
+    output = []
+    for data in batch:
+        data = dict(data)
+        result = digest(data.pop("data", None) or "", max_tokens)
+        data["cleanedData"] = result.text
+        data["tokens_before"] = result.tokens_before
+        data["tokens_after"] = result.tokens_after
+        output.append(data)
+    return output
+
+
+digest_data.batch = True
+digest_data.reads = ("data",)
@@ -0,0 +1,153 @@
+"""Evaluation of n8n parameter expressions.
+
+A string parameter starting with ``=`` is a template whose ``{{ ... }}``
+parts are expressions. The forms the showcased workflows use are supported:
+``$json`` paths and ``$('Node').item`` / ``.first()`` / ``.last()`` followed
+by ``.json`` and a path. A template that is a single expression yields the
+value itself; anything else is rendered to a string.
+
+:func:`compile_value` parses a parameter value into a closure
+``(item, run) -> value``, so a node evaluating its parameters for many items
+only pays for the lookups. Paths become tuples of keys, constants are
+returned as they are, and ``.first()`` / ``.last()`` go through the run's
+per-node index of its first and last output item. Compiled strings are kept
+in a bounded LRU cache; handlers keep their compiled parameters on the node
+with :func:`compiled`, so they live exactly as long as the workflow graph.
+"""
+import functools
+import json
+import re
+
+_TEMPLATE = re.compile(r"\{\{(.*?)\}\}", re.DOTALL)
+_REFERENCE = re.compile(
+    r"""^\s*(?:\$json|\$\(\s*(?P<q>['"])(?P<node>.+?)(?P=q)\s*\)\s*\.\s*(?P<pick>item|first\(\)|last\(\))\s*\.\s*json)"""
+    r"""(?P<path>(?:\s*\.\s*[A-Za-z_$][\w$]*|\s*\[\s*(?:\d+|'[^']*'|"[^"]*")\s*\])*)\s*$""")
+_STEP = re.compile(r"""\.\s*([A-Za-z_$][\w$]*)|\[\s*(\d+|'[^']*'|"[^"]*")\s*\]""")
+
+# Distinct template strings kept compiled.
+STRING_CACHE = 4096
+
+
+class ExpressionError(Exception):
+    """An expression is malformed or uses an unsupported construct."""
+
+
+def _steps(path):
+    """``.a['b'][0]`` -> ``("a", "b", 0)``."""
+    steps = []
+    for match in _STEP.finditer(path):
+        name, index = match.groups()
+        if name is not None:
+            steps.append(name)
+        elif index[0] in "'\"":
+            steps.append(index[1:-1])
+        else:
+            steps.append(int(index))
+    return tuple(steps)
+
+
+def _lookup(value, steps):
+    for step in steps:
+        if value is None:
+            return None
+        if step.__class__ is int:
+            value = value[step] if isinstance(value, list) and step < len(value) else None
+        else:
+            value = value.get(step) if isinstance(value, dict) else None
+    return value
+
+
+def compile_expression(source):
+    """Compile the expression ``source`` into ``(item, run) -> value``."""
+    match = _REFERENCE.match(source)
+    if not match:
+        raise ExpressionError(f"unsupported expression: {source.strip()!r}")
+    steps = _steps(match.group("path"))
+    node = match.group("node")
+    if node is None:
+        if len(steps) == 1 and steps[0].__class__ is str:
+            key = steps[0]
+            return lambda item, run: item.json.get(key) if isinstance(item.json, dict) else None
+        return lambda item, run: _lookup(item.json, steps)
+    pick = match.group("pick")
+    if pick == "item":
+        def resolve(item, run):
+            found = item.ancestor(node)
+            return _lookup(found.json, steps) if found is not None else None
+        return resolve
+    find = "first" if pick == "first()" else "last"
+
+    def resolve(item, run):
+        found = getattr(run, find)(node)
+        return _lookup(found.json, steps) if found is not None else None
+    return resolve
+
+
+def evaluate_expression(source, item, run):
+    """Value of the expression ``source`` for ``item`` in ``run``."""
+    return compile_value("={{" + source + "}}")(item, run)
+
+
+def _render(value):
+    if value is None:
+        return ""
+    if isinstance(value, (dict, list)):
+        return json.dumps(value)
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    return str(value)
+
+
+def _constant(value):
+    return lambda item, run: value
+
+
+def _compile_template(template):
+    parts = _TEMPLATE.split(template)
+    if len(parts) == 3 and not parts[0] and not parts[2]:
+        return compile_expression(parts[1])
+    pieces = [compile_expression(part) if i % 2 else part for i, part in enumerate(parts) if part or i % 2]
+
+    def render(item, run):
+        return "".join([piece if piece.__class__ is str else _render(piece(item, run)) for piece in pieces])
+    return render
+
+
+@functools.lru_cache(maxsize=STRING_CACHE)
+def _compile_string(value):
+    return _compile_template(value[1:]) if value.startswith("=") else _constant(value)
+
+
+def compile_value(value):
+    """``(item, run) -> resolved value`` for a parameter value."""
+    if isinstance(value, str):
+        return _compile_string(value)
+    if isinstance(value, dict):
+        fields = [(key, compile_value(field)) for key, field in value.items()]
+        return lambda item, run: {key: field(item, run) for key, field in fields}
+    if isinstance(value, list):
+        elements = [compile_value(element) for element in value]
+        return lambda item, run: [element(item, run) for element in elements]
+    return _constant(value)
+
+
+def compiled(node, key, build):
+    """``build()``, called once per ``node`` and ``key`` and kept on the node."""
+    cache = node.compiled
+    if cache is None:
+        cache = node.compiled = {}
+    result = cache.get(key)
+    if result is None:
+        result = cache[key] = build()
+    return result
+
+
+def evaluate(value, item, run):
+    """Resolve every expression inside a parameter value."""
+    return compile_value(value)(item, run)
+
+
+def evaluate_batch(value, items, run):
+    """:func:`evaluate` for each of ``items``; the value is compiled once."""
+    compiled = compile_value(value)
+    return [compiled(item, run) for item in items]
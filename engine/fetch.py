@@ -0,0 +1,321 @@
+"""Pooled HTTP/1.1 client for the website-fetch stage.
+
+Built on asyncio streams so it needs nothing beyond the standard library.
+Connections are kept alive and reused per ``(scheme, host, port)``. At most
+``max_connections`` requests are in flight overall and at most ``per_host``
+to any one host. A request first waits for its host's slot and only then
+takes a global one, so a lead list dominated by one company cannot starve
+the others. Bodies are read incrementally and cut off at ``max_body`` bytes;
+a truncated response's connection is closed instead of being drained.
+
+:class:`HTTPClient` has the same ``fetch(url, timeout, response_format)``
+interface as :class:`engine.services.LocalWeb`, so it can replace it in
+:class:`engine.services.Services`.
+"""
+import asyncio
+import json
+import ssl
+import time
+from urllib.parse import urljoin, urlsplit
+
+USER_AGENT = "n8n-showcase-engine/1.0"
+READ_SIZE = 64 * 1024
+REDIRECTS = frozenset((301, 302, 303, 307, 308))
+# Responses that never have a body.
+NO_BODY = frozenset((204, 304))
+
+
+class HTTPError(Exception):
+    """The server answered with a status n8n treats as a failure."""
+
+    def __init__(self, status, reason, url):
+        super().__init__(f"Request failed with status code {status} ({reason}) for {url}")
+        self.status = status
+        self.reason = reason
+        self.url = url
+
+
+class Response:
+    """Status, headers and (possibly truncated) body of one response."""
+
+    __slots__ = ("url", "status", "reason", "headers", "body", "truncated")
+
+    def __init__(self, url, status, reason, headers, body, truncated):
+        self.url = url
+        self.status = status
+        self.reason = reason
+        self.headers = headers
+        self.body = body
+        self.truncated = truncated
+
+    @property
+    def charset(self):
+        content_type = self.headers.get("content-type", "")
+        for param in content_type.split(";")[1:]:
+            name, _, value = param.strip().partition("=")
+            if name.lower() == "charset" and value:
+                return value.strip('"')
+        return "utf-8"
+
+    def text(self):
+        try:
+            return self.body.decode(self.charset, errors="replace")
+        except LookupError:
+            return self.body.decode("utf-8", errors="replace")
+
+    def content(self, response_format="string"):
+        """The body as n8n's HTTP Request node returns it for ``response_format``."""
+        if response_format == "file":
+            return self.body
+        if response_format == "json":
+            return json.loads(self.text())
+        return self.text()
+
+
+class _Connection:
+    __slots__ = ("key", "reader", "writer", "idle_since")
+
+    def __init__(self, key, reader, writer):
+        self.key = key
+        self.reader = reader
+        self.writer = writer
+        self.idle_since = 0.0
+
+    def close(self):
+        self.writer.close()
+
+
+class HTTPClient:
+    """Keep-alive HTTP client with global and per-host concurrency limits.
+
+    ``resolver(host, port) -> (host, port)`` redirects where a connection
+    is opened, e.g. to send every lead website to a local stub server.
+    """
+
+    def __init__(self, max_connections=100, per_host=4, max_body=1 << 20, idle_timeout=30.0,
+                 max_redirects=5, resolver=None, user_agent=USER_AGENT):
+        self.max_connections = max_connections
+        self.per_host = per_host
+        self.max_body = max_body
+        self.idle_timeout = idle_timeout
+        self.max_redirects = max_redirects
+        self.resolver = resolver
+        self.user_agent = user_agent
+        self._global = asyncio.Semaphore(max_connections)
+        self._hosts = {}  # key -> [semaphore, users]
+        self._idle = {}  # key -> [_Connection]
+        self._ssl = None
+        self.fetches = 0
+        self.requests = 0
+        self.connections_opened = 0
+        self.connections_reused = 0
+        self.bytes_read = 0
+        self.truncated = 0
+
+    # Connection pool
+
+    def _checkout(self, key):
+        idle = self._idle.get(key)
+        now = time.monotonic()
+        while idle:
+            conn = idle.pop()
+            if now - conn.idle_since < self.idle_timeout and not conn.reader.at_eof():
+                self.connections_reused += 1
+                return conn
+            conn.close()
+        return None
+
+    def _checkin(self, conn):
+        idle = self._idle.setdefault(conn.key, [])
+        if len(idle) >= self.per_host:
+            conn.close()
+            return
+        conn.idle_since = time.monotonic()
+        idle.append(conn)
+
+    async def _open(self, key):
+        scheme, host, port = key
+        if self.resolver is not None:
+            host, port = self.resolver(key[1], key[2])
+        context = None
+        if scheme == "https":
+            if self._ssl is None:
+                self._ssl = ssl.create_default_context()
+            context = self._ssl
+        reader, writer = await asyncio.open_connection(
+            host, port, ssl=context, server_hostname=key[1] if context else None, limit=READ_SIZE)
+        self.connections_opened += 1
+        return _Connection(key, reader, writer)
+
+    async def close(self):
+        """Close every idle connection."""
+        for idle in self._idle.values():
+            for conn in idle:
+                conn.close()
+        self._idle.clear()
+
+    # Concurrency limits
+
+    async def _acquire(self, key):
+        slot = self._hosts.get(key)
+        if slot is None:
+            slot = self._hosts[key] = [asyncio.Semaphore(self.per_host), 0]
+        slot[1] += 1
+        try:
+            await slot[0].acquire()
+            try:
+                await self._global.acquire()
+            except BaseException:
+                slot[0].release()
+                raise
+        except BaseException:
+            self._leave(key, slot)
+            raise
+        return slot
+
+    def _release(self, key, slot):
+        self._global.release()
+        slot[0].release()
+        self._leave(key, slot)
+
+    def _leave(self, key, slot):
+        slot[1] -= 1
+        if not slot[1]:
+            del self._hosts[key]
+
+    # Protocol
+
+    def _request_bytes(self, parts, headers=None):
+        path = parts.path or "/"
+        if parts.query:
+            path += "?" + parts.query
+        host = parts.hostname
+        if parts.port:
+            host += f":{parts.port}"
+        extra = "".join(f"{name}: {value}\r\n" for name, value in (headers or {}).items())
+        return (f"GET {path} HTTP/1.1\r\nHost: {host}\r\nUser-Agent: {self.user_agent}\r\n"
+                f"Accept: */*\r\nAccept-Encoding: identity\r\nConnection: keep-alive\r\n{extra}\r\n"
+                ).encode("latin-1")
+
+    async def _read_head(self, reader):
+        head = await reader.readuntil(b"\r\n\r\n")
+        lines = head.decode("latin-1").split("\r\n")
+        version, status, reason = (lines[0].split(" ", 2) + [""])[:3]
+        headers = {}
+        for line in lines[1:]:
+            if ":" in line:
+                name, _, value = line.partition(":")
+                headers[name.strip().lower()] = value.strip()
+        keep_alive = version == "HTTP/1.1" and headers.get("connection", "").lower() != "close"
+        return int(status), reason, headers, keep_alive
+
+    async def _read_body(self, reader, status, headers):
+        """Return ``(body, complete)``; ``complete`` is False if cut at ``max_body``."""
+        if status in NO_BODY or 100 <= status < 200:
+            return b"", True
+        limit = self.max_body
+        parts = []
+        size = 0
+        if headers.get("transfer-encoding", "").lower() == "chunked":
+            while True:
+                chunk_size = int((await reader.readline()).split(b";")[0], 16)
+                if chunk_size == 0:
+                    while (await reader.readline()) not in (b"\r\n", b""):
+                        pass  # trailers
+                    return b"".join(parts), True
+                if size + chunk_size > limit:
+                    parts.append(await reader.readexactly(limit - size))
+                    return b"".join(parts), False
+                parts.append(await reader.readexactly(chunk_size))
+                size += chunk_size
+                await reader.readexactly(2)
+        length = headers.get("content-length")
+        if length is not None:
+            remaining = int(length)
+            while remaining and size < limit:
+                data = await reader.readexactly(min(remaining, READ_SIZE, limit - size))
+                parts.append(data)
+                size += len(data)
+                remaining -= len(data)
+            return b"".join(parts), remaining == 0
+        # Delimited by the end of the connection.
+        while size < limit:
+            data = await reader.read(min(READ_SIZE, limit - size))
+            if not data:
+                return b"".join(parts), False
+            parts.append(data)
+            size += len(data)
+        return b"".join(parts), False
+
+    async def _exchange(self, key, parts, headers=None):
+        """One request/response on a pooled connection (retried once if stale)."""
+        for attempt in (0, 1):
+            conn = self._checkout(key) if attempt == 0 else None
+            reused = conn is not None
+            if conn is None:
+                conn = await self._open(key)
+            try:
+                conn.writer.write(self._request_bytes(parts, headers))
+                await conn.writer.drain()
+                try:
+                    status, reason, response_headers, keep_alive = await self._read_head(conn.reader)
+                except (ConnectionError, asyncio.IncompleteReadError):
+                    if reused:
+                        # The server closed an idle connection; retry on a new one.
+                        conn.close()
+                        continue
+                    raise
+                body, complete = await self._read_body(conn.reader, status, response_headers)
+            except BaseException:
+                conn.close()
+                raise
+            self.requests += 1
+            self.bytes_read += len(body)
+            if keep_alive and complete:
+                self._checkin(conn)
+            else:
+                conn.close()
+            return status, reason, response_headers, body, complete
+        raise ConnectionError("connection closed by server")
+
+    async def get(self, url, headers=None):
+        """GET ``url``, following redirects; returns a :class:`Response`.
+
+        ``headers`` are extra request headers, e.g. ``If-None-Match``.
+        """
+        for _ in range(self.max_redirects + 1):
+            parts = urlsplit(url)
+            if parts.scheme not in ("http", "https") or not parts.hostname:
+                raise ValueError(f"Invalid URL: {url!r}")
+            key = (parts.scheme, parts.hostname.lower(), parts.port or (443 if parts.scheme == "https" else 80))
+            slot = await self._acquire(key)
+            try:
+                status, reason, response_headers, body, complete = await self._exchange(key, parts, headers)
+            finally:
+                self._release(key, slot)
+            if status in REDIRECTS and "location" in response_headers:
+                url = urljoin(url, response_headers["location"])
+                continue
+            if not complete:
+                self.truncated += 1
+            return Response(url, status, reason, response_headers, body, not complete)
+        raise HTTPError(310, "Too many redirects", url)
+
+    async def request(self, url, timeout=None, headers=None):
+        """:meth:`get` with a ``timeout`` (seconds) that covers waiting for a slot too."""
+        if not url:
+            raise ValueError("URL is empty")
+        response = await (asyncio.wait_for(self.get(url, headers), timeout) if timeout else self.get(url, headers))
+        self.fetches += 1
+        return response
+
+    async def fetch(self, url, timeout=None, response_format="string"):
+        """Body of ``url`` as n8n's HTTP Request node returns it.
+
+        ``response_format`` is ``"string"``, ``"json"`` or ``"file"`` (bytes).
+        Statuses of 400 and up raise :class:`HTTPError`.
+        """
+        response = await self.request(url, timeout)
+        if response.status >= 400:
+            raise HTTPError(response.status, response.reason, response.url)
+        return response.content(response_format)
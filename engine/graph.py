@@ -0,0 +1,159 @@
+"""Executable view of a workflow's nodes and connections.
+
+:class:`Graph` splits n8n's ``connections`` into the ``main`` edges items
+flow along and the sub-node edges (``ai_languageModel`` and friends) that
+attach a configuration node such as a chat model to its parent. The main
+edges are ordered topologically; a cycle raises :class:`WorkflowError`.
+"""
+import os
+import re
+
+from showcase.models import Workflow
+
+MAIN = "main"
+TRIGGER_SUFFIXES = ("Trigger", "trigger")
+# Literal escape sequences of a workflow serialized one time too many.
+_ESCAPE = re.compile(r'\\(["\\/nrt])')
+_ESCAPES = {'"': '"', "\\": "\\", "/": "/", "n": "\n", "r": "\r", "t": "\t"}
+
+
+class WorkflowError(Exception):
+    """The workflow cannot be run as given."""
+
+
+class Graph:
+    """Nodes of one workflow with their main and sub-node edges."""
+
+    def __init__(self, workflow):
+        self.workflow = workflow
+        self.nodes = {node.name: node for node in workflow.nodes}
+        self._targets = {}
+        self._sub_nodes = {}
+        for conn in workflow.connections:
+            if conn.target not in self.nodes:
+                raise WorkflowError(f"{conn.source!r} connects to unknown node {conn.target!r}")
+            if conn.kind == MAIN:
+                self._targets.setdefault((conn.source, conn.output_index), []).append(conn.target)
+            else:
+                self._sub_nodes.setdefault((conn.target, conn.kind), []).append(conn.source)
+        self.order = self._topological_order()
+
+    def _topological_order(self):
+        indegree = {name: 0 for name in self.nodes}
+        for targets in self._targets.values():
+            for target in targets:
+                indegree[target] += 1
+        ready = [name for name in self.nodes if indegree[name] == 0]
+        order = []
+        while ready:
+            name = ready.pop(0)
+            order.append(name)
+            for target in self.children(name):
+                indegree[target] -= 1
+                if indegree[target] == 0:
+                    ready.append(target)
+        if len(order) != len(self.nodes):
+            stuck = sorted(name for name, count in indegree.items() if count)
+            raise WorkflowError(f"workflow has a cycle through {', '.join(stuck)}")
+        return order
+
+    def node(self, name):
+        try:
+            return self.nodes[name]
+        except KeyError:
+            raise WorkflowError(f"no node named {name!r}") from None
+
+    def targets(self, name, output_index=0):
+        """Nodes fed by output ``output_index`` of ``name``."""
+        return self._targets.get((name, output_index), ())
+
+    def children(self, name):
+        """Every node fed by any output of ``name``, without duplicates."""
+        seen = {}
+        for (source, _), targets in self._targets.items():
+            if source == name:
+                seen.update(dict.fromkeys(targets))
+        return list(seen)
+
+    def connections(self, name):
+        """``(output index, target)`` for every main connection out of ``name``."""
+        return [(index, target) for (source, index), targets in self._targets.items() if source == name
+                for target in targets]
+
+    def sub_nodes(self, name, kind):
+        """Nodes attached to ``name`` through a ``kind`` connection."""
+        return [self.nodes[source] for source in self._sub_nodes.get((name, kind), ())]
+
+    def is_sub_node(self, name):
+        return any(source == name for sources in self._sub_nodes.values() for source in sources)
+
+    def triggers(self):
+        """Nodes that start a run, in topological order."""
+        return [name for name in self.order
+                if self.nodes[name].type.endswith(TRIGGER_SUFFIXES) and not self.nodes[name].disabled]
+
+    def trigger(self, name=None):
+        """The named trigger node, or the first one."""
+        if name is not None:
+            return self.node(name)
+        triggers = self.triggers()
+        if not triggers:
+            raise WorkflowError("workflow has no trigger node")
+        return self.nodes[triggers[0]]
+
+    def reachable(self, start):
+        """Names of the nodes a run from ``start`` can execute, in order."""
+        seen = {start}
+        stack = [start]
+        while stack:
+            for target in self.children(stack.pop()):
+                if target not in seen:
+                    seen.add(target)
+                    stack.append(target)
+        return [name for name in self.order if name in seen]
+
+
+def _unescape(value):
+    if isinstance(value, str):
+        return _ESCAPE.sub(lambda m: _ESCAPES[m.group(1)], value)
+    if isinstance(value, dict):
+        return {key: _unescape(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_unescape(item) for item in value]
+    return value
+
+
+def _strings(value):
+    if isinstance(value, str):
+        yield value
+    elif isinstance(value, dict):
+        for item in value.values():
+            yield from _strings(item)
+    elif isinstance(value, list):
+        for item in value:
+            yield from _strings(item)
+
+
+def is_double_escaped(workflow):
+    """True if string parameters carry ``\\n`` literally but no real newline.
+
+    Some exports (``workflow.json`` among them) went through JSON encoding
+    twice, so code, prompts and regexes read ``\\n``, ``\\"`` and ``\\\\s``.
+    """
+    strings = [s for node in workflow.nodes for s in _strings(node.parameters)]
+    return any("\\n" in s for s in strings) and not any("\n" in s for s in strings)
+
+
+def load(path, decode_escapes=None):
+    """Load the workflow at ``path`` as a :class:`Graph`.
+
+    ``decode_escapes`` undoes one level of string escaping in node parameters;
+    by default it is applied only when :func:`is_double_escaped` says so.
+    """
+    workflow = Workflow.load(os.fspath(path))
+    if decode_escapes is None:
+        decode_escapes = is_double_escaped(workflow)
+    if decode_escapes:
+        for node in workflow.nodes:
+            node.parameters = _unescape(node.parameters)
+    return Graph(workflow)
@@ -0,0 +1,110 @@
+"""Streaming HTML-to-text extraction for the Clean Data stage.
+
+The workflow's Clean Data node strips tags with ``/<[^>]*>/g``, which keeps
+the bodies of ``<script>`` and ``<style>``, leaves entities encoded and
+copies the whole page. :class:`TextExtractor` is an incremental
+``HTMLParser``: the page is fed in slices, noise elements (scripts, styles,
+navigation, footers, ...) are skipped, entities are decoded, whitespace is
+collapsed and block elements become line breaks. Parsing stops as soon as
+``max_chars`` of text have been collected, so neither the time nor the
+memory spent depends on how long the page runs on after that.
+"""
+import codecs
+from html.parser import HTMLParser
+
+MAX_CHARS = 8000
+FEED_SIZE = 16 * 1024
+
+SKIP_TAGS = frozenset(("script", "style", "noscript", "template", "svg", "iframe", "canvas", "object",
+                       "nav", "footer", "aside"))
+BLOCK_TAGS = frozenset(("address", "article", "blockquote", "br", "dd", "div", "dl", "dt", "figcaption",
+                        "h1", "h2", "h3", "h4", "h5", "h6", "header", "hr", "li", "main", "ol", "p",
+                        "pre", "section", "table", "td", "th", "title", "tr", "ul"))
+
+
+class TextExtractor(HTMLParser):
+    """Collects the readable text of a page, up to ``max_chars``."""
+
+    def __init__(self, max_chars=MAX_CHARS):
+        super().__init__(convert_charrefs=True)
+        self.max_chars = max_chars
+        self.done = False
+        self._skip = 0
+        self._parts = []
+        self._size = 0
+        self._separator = ""
+
+    def handle_starttag(self, tag, attrs):
+        if tag in SKIP_TAGS:
+            self._skip += 1
+        elif tag in BLOCK_TAGS:
+            self._separator = "\n"
+
+    def handle_startendtag(self, tag, attrs):
+        if tag in BLOCK_TAGS:
+            self._separator = "\n"
+
+    def handle_endtag(self, tag):
+        if tag in SKIP_TAGS:
+            self._skip = max(0, self._skip - 1)
+        elif tag in BLOCK_TAGS:
+            self._separator = "\n"
+
+    def handle_data(self, data):
+        if self._skip or self.done:
+            return
+        text = " ".join(data.split())
+        if not text:
+            if data and not self._separator:
+                self._separator = " "
+            return
+        if data[0].isspace() and not self._separator:
+            self._separator = " "
+        if self._parts and self._separator:
+            self._append(self._separator)
+        self._separator = " " if data[-1].isspace() else ""
+        self._append(text)
+
+    def _append(self, text):
+        room = self.max_chars - self._size
+        if len(text) > room:
+            # Cut at a word boundary when there is one.
+            text = text[:room]
+            if " " in text:
+                text = text.rsplit(" ", 1)[0]
+            self.done = True
+        self._parts.append(text)
+        self._size += len(text)
+        if self._size >= self.max_chars:
+            self.done = True
+
+    def text(self):
+        return "".join(self._parts).strip()
+
+
+def _chunks(source):
+    """Slices of ``source``: a str, bytes (UTF-8) or an iterable of either."""
+    if isinstance(source, str):
+        for start in range(0, len(source), FEED_SIZE):
+            yield source[start:start + FEED_SIZE]
+        return
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        view = memoryview(source)
+        source = (view[start:start + FEED_SIZE] for start in range(0, len(view), FEED_SIZE))
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    for chunk in source:
+        yield chunk if isinstance(chunk, str) else decoder.decode(chunk)
+    yield decoder.decode(b"", final=True)
+
+
+def extract_text(source, max_chars=MAX_CHARS):
+    """Readable text of the HTML in ``source``, at most ``max_chars`` long."""
+    parser = TextExtractor(max_chars)
+    for chunk in _chunks(source):
+        parser.feed(chunk)
+        if parser.done:
+            break
+    else:
+        parser.close()
+    return parser.text()
+
@@ -0,0 +1,45 @@
+"""Items flowing between nodes."""
+
+
+class Item:
+    """One n8n item: its ``json`` plus where it came from.
+
+    ``source`` is the input item this one was produced from, which is how
+    ``$('Node').item`` finds the matching item of an earlier node.
+    """
+
+    __slots__ = ("json", "node", "source")
+
+    def __init__(self, json, node=None, source=None):
+        self.json = json
+        self.node = node
+        self.source = source
+
+    def derive(self, json, node):
+        """A new item produced by ``node`` from this one."""
+        return Item(json, node, self)
+
+    def ancestor(self, name):
+        """The item node ``name`` produced on the way to this one, or None."""
+        item = self
+        while item is not None and item.node != name:
+            item = item.source
+        return item
+
+    def __repr__(self):
+        return f"Item({self.node!r}, {self.json!r})"
+
+
+def json_changes(before, after):
+    """What turned the JSON object ``before`` into ``after``, for :func:`apply_changes`."""
+    return {
+        "set": {name: value for name, value in after.items() if before.get(name) != value},
+        "drop": [name for name in before if name not in after],
+    }
+
+
+def apply_changes(json, changes):
+    """Apply :func:`json_changes` output to another JSON object (a new dict)."""
+    result = {name: value for name, value in json.items() if name not in changes["drop"]}
+    result.update(changes["set"])
+    return result
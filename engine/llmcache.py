@@ -0,0 +1,206 @@
+"""Content-addressed cache for chat model completions.
+
+The Schedule Trigger re-reads the lead sheet every minute, so the Outreach
+Prompt keeps sending Gemini the same lead and website. :class:`CachedLLM`
+sits in front of an LLM client and answers repeated prompts from a cache.
+The key is the model name, a hash of the prompt template (the node's
+unrendered ``text``, so editing the prompt invalidates old answers) and a
+hash of the rendered input. Answers are kept in two tiers: an in-memory LRU
+and, optionally, a SQLite file that survives restarts. Entries of both
+expire ``ttl`` seconds after the model answered, and the least recently
+used ones on disk are evicted once the file grows past ``max_bytes``.
+Concurrent misses on one key share a single model call.
+"""
+import asyncio
+import collections
+import hashlib
+import sqlite3
+import time
+
+from engine.ratelimit import Limited
+
+MEMORY_ENTRIES = 4096
+TTL = 7 * 86400.0
+MAX_BYTES = 256 << 20
+
+
+def _digest(text):
+    return hashlib.sha256((text or "").encode("utf-8")).hexdigest()
+
+
+def cache_key(model, template, prompt, system=None):
+    """``model`` + hash of the template + hash of the rendered input."""
+    return f"{model}:{_digest(template)[:16]}:{_digest(_digest(system) + prompt)}"
+
+
+class DiskCache:
+    """Key/value store in SQLite with a TTL and a total size bound."""
+
+    def __init__(self, path, ttl=TTL, max_bytes=MAX_BYTES, clock=time.time):
+        self.conn = sqlite3.connect(path)
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.clock = clock
+        self.conn.execute("CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, value TEXT, "
+                          "created REAL, accessed REAL, size INTEGER)")
+        self.conn.execute("CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed)")
+        self.size = self.conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        self.expired = 0
+        self.evicted = 0
+
+    def get(self, key):
+        entry = self.entry(key)
+        return entry[0] if entry is not None else None
+
+    def entry(self, key):
+        """``(value, created)`` for ``key``, or None if it is missing or expired."""
+        row = self.conn.execute("SELECT value, created, size FROM responses WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        value, created, size = row
+        now = self.clock()
+        with self.conn:
+            if self.ttl and created + self.ttl <= now:
+                self.conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self.size -= size
+                self.expired += 1
+                return None
+            self.conn.execute("UPDATE responses SET accessed = ? WHERE key = ?", (now, key))
+        return value, created
+
+    def set(self, key, value):
+        size = len(key) + len(value.encode("utf-8"))
+        now = self.clock()
+        with self.conn:
+            old = self.conn.execute("SELECT size FROM responses WHERE key = ?", (key,)).fetchone()
+            self.conn.execute("INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?)",
+                              (key, value, now, now, size))
+            self.size += size - (old[0] if old else 0)
+            if self.size > self.max_bytes:
+                self._evict()
+
+    def _evict(self):
+        # Drop least recently used entries down to 90% of the bound.
+        target = self.max_bytes * 9 // 10
+        if self.ttl:
+            cursor = self.conn.execute("DELETE FROM responses WHERE created <= ? RETURNING size",
+                                       (self.clock() - self.ttl,))
+            for (size,) in cursor.fetchall():
+                self.size -= size
+                self.expired += 1
+        victims = []
+        for key, size in self.conn.execute("SELECT key, size FROM responses ORDER BY accessed"):
+            if self.size <= target:
+                break
+            victims.append((key,))
+            self.size -= size
+        self.conn.executemany("DELETE FROM responses WHERE key = ?", victims)
+        self.evicted += len(victims)
+
+    def __len__(self):
+        return self.conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+    def close(self):
+        self.conn.close()
+
+
+class CachedLLM:
+    """LLM client wrapper answering repeated prompts from the cache tiers."""
+
+    def __init__(self, client, path=None, memory_entries=MEMORY_ENTRIES, ttl=TTL, max_bytes=MAX_BYTES,
+                 clock=time.time):
+        self.client = client
+        self.memory_entries = memory_entries
+        self.ttl = ttl
+        self.clock = clock
+        self.disk = DiskCache(path, ttl, max_bytes, clock) if path else None
+        # key -> (value, created)
+        self._memory = collections.OrderedDict()
+        self._inflight = {}
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.shared = 0
+        self.misses = 0
+        self.memory_expired = 0
+
+    def __getattr__(self, name):
+        # Counters and anything else go to the wrapped client.
+        return getattr(self.client, name)
+
+    def limit(self, bucket):
+        """Rate-limit the wrapped client, so cache hits take no token."""
+        self.client = Limited(self.client, bucket)
+
+    def _remember(self, key, value, created):
+        self._memory[key] = (value, created)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+    def lookup(self, key):
+        entry = self._memory.get(key)
+        if entry is not None:
+            value, created = entry
+            if not self.ttl or created + self.ttl > self.clock():
+                self._memory.move_to_end(key)
+                self.memory_hits += 1
+                return value
+            del self._memory[key]
+            self.memory_expired += 1
+        if self.disk is not None:
+            entry = self.disk.entry(key)
+            if entry is not None:
+                # The disk entry's age, so memory does not extend its life.
+                self._remember(key, *entry)
+                self.disk_hits += 1
+                return entry[0]
+        return None
+
+    async def complete(self, model, prompt, system=None, template=None):
+        key = cache_key(model, prompt if template is None else template, prompt, system)
+        value = self.lookup(key)
+        if value is not None:
+            return value
+        pending = self._inflight.get(key)
+        if pending is not None:
+            self.shared += 1
+            return await asyncio.shield(pending)
+        self.misses += 1
+        pending = self._inflight[key] = asyncio.get_running_loop().create_future()
+        try:
+            value = await self.client.complete(model, prompt, system)
+        except BaseException as e:
+            pending.set_exception(e)
+            pending.exception()  # retrieved: no warning when nobody shares the call
+            raise
+        else:
+            pending.set_result(value)
+            self._remember(key, value, self.clock())
+            if self.disk is not None:
+                self.disk.set(key, value)
+            return value
+        finally:
+            del self._inflight[key]
+
+    def hit_rate(self):
+        hits = self.memory_hits + self.disk_hits + self.shared
+        return hits / (hits + self.misses) if hits + self.misses else 0.0
+
+    def snapshot(self):
+        stats = {
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "shared": self.shared,
+            "misses": self.misses,
+            "hit_rate": round(self.hit_rate(), 3),
+            "memory_entries": len(self._memory),
+            "memory_expired": self.memory_expired,
+        }
+        if self.disk is not None:
+            stats.update(disk_entries=len(self.disk), disk_bytes=self.disk.size,
+                         expired=self.disk.expired, evicted=self.disk.evicted)
+        return stats
+
+    def close(self):
+        if self.disk is not None:
+            self.disk.close()
@@ -0,0 +1,294 @@
+"""Tolerant extraction of the e-mail JSON object from model replies.
+
+The workflow's Parse Json node only accepts a fenced ```json block that
+``JSON.parse`` takes as is (and its regex could never match at all), so
+every reply that is slightly off is lost after the LLM call was paid for.
+:class:`ReplyParser` scans a reply for JSON objects with
+:class:`ObjectScanner`, which can be fed the reply in pieces as it streams
+in and closes an object the reply was cut off in. Each candidate is tried
+as is and then with cumulative repairs: trailing commas, missing commas
+between lines (the prompt's own example leaves them out) and typographic
+quotes. Keys are matched loosely (``Opening Line``, ``body``, ...), a
+wrapper object such as ``{"email": {...}}`` is unwrapped, and replies
+without any object fall back to ``key: value`` lines. The first candidate
+that passes the compiled schema wins.
+
+The parser counts replies, clean parses, repaired parses and failures;
+``success_rate()`` is what the cost per delivered e-mail depends on.
+"""
+import json
+import re
+
+EMAIL_FIELDS = ("subject", "greeting", "opening_line", "main_body", "ending")
+EMAIL_SCHEMA = {
+    "type": "object",
+    "required": list(EMAIL_FIELDS),
+    "properties": {name: {"type": "string", "minLength": 1} for name in EMAIL_FIELDS},
+}
+ALIASES = {
+    "subject_line": "subject", "title": "subject",
+    "salutation": "greeting", "opening": "opening_line", "opening_sentence": "opening_line",
+    "intro": "opening_line", "body": "main_body", "message": "main_body",
+    "closing": "ending", "sign_off": "ending", "signoff": "ending", "closing_line": "ending",
+}
+
+_TYPES = {"object": dict, "array": list, "string": str, "boolean": bool, "integer": int, "number": (int, float)}
+_SPECIAL = re.compile(r'[{}\[\]"\\]')
+_STRING_SPECIAL = re.compile(r'["\\]')
+_TRAILING_COMMA = re.compile(r",\s*([}\]])")
+_MISSING_COMMA = re.compile(r'("|\d|true|false|null|[}\]])([ \t]*\r?\n\s*)(")')
+_SMART_QUOTES = str.maketrans({"“": '"', "”": '"', "„": '"', "″": '"'})
+_KEY_LINE = re.compile(r'^[\s*>#-]*"?([A-Za-z][\w -]{1,30}?)"?\**\s*[:=]\**\s*(.+?)\s*$', re.MULTILINE)
+
+
+def compile_schema(schema, path="$"):
+    """Compile a JSON Schema subset into ``check(value) -> [error, ...]``.
+
+    Supports ``type``, ``required``, ``properties``, ``additionalProperties``
+    (false), ``items``, ``enum``, ``minLength`` and ``maxLength``.
+    """
+    checks = []
+    kind = schema.get("type")
+    if kind is not None:
+        expected = _TYPES[kind]
+
+        def check_type(value):
+            if not isinstance(value, expected) or kind in ("integer", "number") and isinstance(value, bool):
+                return [f"{path}: expected {kind}"]
+            return []
+        checks.append(check_type)
+    if "enum" in schema:
+        allowed = list(schema["enum"])
+        checks.append(lambda value: [] if value in allowed else [f"{path}: not one of {allowed}"])
+    if "minLength" in schema or "maxLength" in schema:
+        low, high = schema.get("minLength", 0), schema.get("maxLength")
+
+        def check_length(value):
+            if isinstance(value, str) and (len(value.strip()) < low or high is not None and len(value) > high):
+                return [f"{path}: length outside {low}..{high if high is not None else ''}"]
+            return []
+        checks.append(check_length)
+    required = list(schema.get("required", ()))
+    properties = {name: compile_schema(sub, f"{path}.{name}") for name, sub in schema.get("properties", {}).items()}
+    closed = schema.get("additionalProperties") is False
+    if required or properties or closed:
+        def check_object(value):
+            if not isinstance(value, dict):
+                return []
+            errors = [f"{path}: missing {name!r}" for name in required if name not in value]
+            for name, check in properties.items():
+                if name in value:
+                    errors.extend(check(value[name]))
+            if closed:
+                errors.extend(f"{path}: unexpected {name!r}" for name in value if name not in properties)
+            return errors
+        checks.append(check_object)
+    if "items" in schema:
+        check_item = compile_schema(schema["items"], f"{path}[]")
+        checks.append(lambda value: [e for item in value for e in check_item(item)] if isinstance(value, list)
+                      else [])
+
+    def check(value):
+        for step in checks:
+            errors = step(value)
+            if errors:
+                return errors
+        return []
+    return check
+
+
+class ObjectScanner:
+    """Finds the top-level ``{...}`` objects in text fed in pieces.
+
+    Only double quotes delimit strings, so apostrophes in prose are safe.
+    """
+
+    def __init__(self):
+        self.objects = []
+        self._parts = []
+        self._stack = []
+        self._in_string = False
+        self._escaped = False
+
+    def feed(self, text):
+        position = 0
+        while position < len(text):
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                    position = self._take(text, position, position + 1)
+                    continue
+                match = _STRING_SPECIAL.search(text, position)
+                if match is None:
+                    self._take(text, position, len(text))
+                    return
+                char, end = match.group(), match.end()
+                if char == "\\":
+                    self._escaped = True
+                else:
+                    self._in_string = False
+                position = self._take(text, position, end)
+                continue
+            match = _SPECIAL.search(text, position)
+            if match is None:
+                self._take(text, position, len(text))
+                return
+            char, start, end = match.group(), match.start(), match.end()
+            if not self._stack:
+                # Text between objects is skipped.
+                if char == "{":
+                    self._stack.append("}")
+                    self._take(text, start, end)
+                position = end
+                continue
+            position = self._take(text, position, end)
+            if char == '"':
+                self._in_string = True
+            elif char in "{[":
+                self._stack.append("}" if char == "{" else "]")
+            elif char == self._stack[-1]:
+                self._stack.pop()
+                if not self._stack:
+                    self.objects.append("".join(self._parts))
+                    self._parts = []
+
+    def _take(self, text, start, end):
+        if self._stack:
+            self._parts.append(text[start:end])
+        return end
+
+    @property
+    def in_string(self):
+        return self._in_string
+
+    def tail(self):
+        """The object the text ended inside of, closed, or None."""
+        if not self._stack:
+            return None
+        text = "".join(self._parts).rstrip()
+        if self._in_string:
+            text += "\\" if self._escaped else ""
+            text += '"'
+        text = text.rstrip(",:")
+        return text + "".join(reversed(self._stack))
+
+
+def _canonical(name):
+    name = re.sub(r"[\s-]+", "_", str(name).strip().lower())
+    return ALIASES.get(name, name)
+
+
+def _normalize(value, fields):
+    """Map loose keys onto ``fields`` and unwrap a single wrapper object."""
+    if not isinstance(value, dict):
+        return value
+    result = {}
+    for name, item in value.items():
+        result.setdefault(_canonical(name), item.strip() if isinstance(item, str) else item)
+    if not any(name in result for name in fields):
+        for item in result.values():
+            if isinstance(item, dict) and any(_canonical(name) in fields for name in item):
+                return _normalize(item, fields)
+    return result
+
+
+_REPAIRS = (
+    lambda text: _TRAILING_COMMA.sub(r"\1", text),
+    lambda text: _MISSING_COMMA.sub(r"\1,\2\3", text),
+    lambda text: text.translate(_SMART_QUOTES),
+)
+
+
+def candidates(text):
+    """``(object text, ending)`` pairs for the objects in ``text``.
+
+    ``ending`` is None for a complete object, ``"closed"`` for one the text
+    ended inside of and ``"cut"`` if it ended inside one of its strings.
+    """
+    scanner = ObjectScanner()
+    scanner.feed(text)
+    found = [(obj, None) for obj in scanner.objects]
+    tail = scanner.tail()
+    if tail is not None:
+        found.append((tail, "cut" if scanner.in_string else "closed"))
+    if not found and "“" in text:
+        # A reply quoted with typographic quotes only.
+        return candidates(text.translate(_SMART_QUOTES))
+    return found
+
+
+def _loads(text):
+    """Parse ``text`` as is, then with each further repair; ``(value, repaired)``."""
+    try:
+        return json.loads(text, strict=False), False
+    except ValueError as e:
+        error = e
+    for repair in _REPAIRS:
+        text = repair(text)
+        try:
+            return json.loads(text, strict=False), True
+        except ValueError as e:
+            error = e
+    raise error
+
+
+class ReplyParser:
+    """Parse Json port: the schema-valid object in a model reply's ``text``."""
+
+    def __init__(self, schema=EMAIL_SCHEMA, field="text"):
+        self.check = compile_schema(schema)
+        self.fields = tuple(schema.get("properties", ()))
+        self.field = field
+        self.replies = 0
+        self.clean = 0
+        self.repaired = 0
+        self.failed = 0
+
+    def parse(self, text):
+        """Return ``(object, repaired)`` or raise ValueError with the reasons."""
+        problems = []
+        for candidate, ending in candidates(text):
+            try:
+                value, repaired = _loads(candidate)
+            except ValueError as e:
+                problems.append(f"invalid JSON ({e})")
+                continue
+            if ending == "cut" and isinstance(value, dict) and value:
+                # The last value was cut off mid-string; a partial line must not be sent.
+                value.popitem()
+            normalized = _normalize(value, self.fields)
+            errors = self.check(normalized)
+            if not errors:
+                return normalized, repaired or ending is not None or normalized != value
+            problems.append("; ".join(errors))
+        lines = {}
+        for name, value in _KEY_LINE.findall(text):
+            lines.setdefault(_canonical(name), value.strip().rstrip(",").strip().strip('"'))
+        if lines and not self.check(lines):
+            return lines, True
+        raise ValueError(" | ".join(problems) or "No JSON object found in input.")
+
+    def __call__(self, data):
+        self.replies += 1
+        try:
+            value, repaired = self.parse(data.get(self.field) or "")
+        except ValueError as e:
+            self.failed += 1
+            return {"error": "Failed to parse JSON", "details": str(e)}
+        if repaired:
+            self.repaired += 1
+        else:
+            self.clean += 1
+        return value
+
+    def success_rate(self):
+        return (self.clean + self.repaired) / self.replies if self.replies else 0.0
+
+    def snapshot(self):
+        return {
+            "replies": self.replies,
+            "clean": self.clean,
+            "repaired": self.repaired,
+            "failed": self.failed,
+            "success_rate": round(self.success_rate(), 4),
+        }
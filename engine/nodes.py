@@ -0,0 +1,348 @@
+"""Node handlers, keyed by n8n node type.
+
+A handler is ``async def handler(run, node, items)`` and returns one list of
+output items per node output (an IF node has two). Register one with
+``@handles(type, ...)``. Code nodes carry JavaScript the engine cannot run,
+so each one needs a Python port registered by node name with
+``@code_node(name)``; a port takes and returns one item's ``json``. A port
+registered with ``batch=True`` takes and returns a list of them instead; the
+engine can run those in its worker processes (``Engine(workers=N)``, see
+engine.pool), so they must be importable top-level functions. ``reads``
+names the item fields such a port reads; only those are sent to a worker.
+
+A handler may also carry a ``stream`` async generator with the same
+arguments that yields its outputs a batch at a time; streaming runs
+(``Engine(batch_size=N)``) use it instead of the handler.
+"""
+import asyncio
+import re
+
+from engine import ratelimit
+from engine.expressions import compile_value, compiled
+from engine.graph import WorkflowError
+from engine.htmltext import MAX_CHARS, extract_text
+from engine.llmjson import EMAIL_SCHEMA, ReplyParser
+
+HANDLERS = {}
+CODE_NODES = {}
+
+_JS_REGEX = re.compile(r"^/(.*)/([a-z]*)$", re.DOTALL)
+_REGEX_FLAGS = {"i": re.IGNORECASE, "m": re.MULTILINE, "s": re.DOTALL}
+_regex_cache = {}
+_WAIT_UNITS = {"seconds": 1, "minutes": 60, "hours": 3600, "days": 86400}
+
+
+def handles(*node_types):
+    def register(func):
+        for node_type in node_types:
+            HANDLERS[node_type] = func
+        return func
+    return register
+
+
+def code_node(name, batch=False, reads=None):
+    def register(func):
+        func.batch = batch
+        if reads is not None:
+            func.reads = reads
+        CODE_NODES[name] = func
+        return func
+    return register
+
+
+@handles("n8n-nodes-base.scheduleTrigger", "n8n-nodes-base.manualTrigger",
+         "@n8n/n8n-nodes-langchain.chatTrigger")
+async def trigger(run, node, items):
+    return [items]
+
+
+def passthrough(node, items):
+    """The same items, as output by ``node``."""
+    return [item.derive(item.json, node.name) for item in items]
+
+
+@handles("n8n-nodes-base.noOp")
+async def no_op(run, node, items):
+    return [passthrough(node, items)]
+
+
+def _sheet(params):
+    return (params.get("documentId") or {}).get("value"), (params.get("sheetName") or {}).get("value")
+
+
+@handles("n8n-nodes-base.googleSheets")
+async def google_sheets(run, node, items):
+    params = node.parameters
+    operation = params.get("operation", "read")
+    document, sheet = _sheet(params)
+    sheets = run.services.sheets
+
+    if operation == "read":
+        output = []
+        for item in items:
+            rows = await sheets.read(document, sheet)
+            output.extend(item.derive(row, node.name) for row in rows)
+        return [output]
+    if operation == "update":
+        columns = params.get("columns", {})
+        match_columns = columns.get("matchingColumns") or []
+
+        values = compiled(node, "values", lambda: compile_value(columns.get("value") or {}))
+
+        async def update(item):
+            return await sheets.update(match_columns, values(item, run), document, sheet)
+        return [await run.map(node, items, update)]
+    raise WorkflowError(f"{node.name}: Sheets operation {operation!r} is not supported")
+
+
+async def _stream_google_sheets(run, node, items):
+    """Reads yield the rows a page of ``run.batch_size`` at a time."""
+    if node.parameters.get("operation", "read") != "read":
+        yield await google_sheets(run, node, items)
+        return
+    document, sheet = _sheet(node.parameters)
+    sheets = run.services.sheets
+    size = run.batch_size
+    read_pages = getattr(sheets, "read_pages", None)
+    for item in items:
+        if read_pages is None:
+            rows = await sheets.read(document, sheet)
+            for start in range(0, len(rows), size):
+                yield [[item.derive(row, node.name) for row in rows[start:start + size]]]
+            continue
+        async for rows in read_pages(document, sheet, size):
+            yield [[item.derive(row, node.name) for row in rows]]
+
+
+google_sheets.stream = _stream_google_sheets
+
+
+def _js_regex(source):
+    pattern = _regex_cache.get(source)
+    if pattern is None:
+        match = _JS_REGEX.match(source)
+        body, flags = (match.group(1), match.group(2)) if match else (source, "")
+        mode = 0
+        for flag in flags:
+            mode |= _REGEX_FLAGS.get(flag, 0)
+        pattern = _regex_cache[source] = re.compile(body, mode)
+    return pattern
+
+
+def _number(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _is_empty(value):
+    return value is None or value == "" or value == [] or value == {}
+
+
+_STRING_OPERATIONS = {
+    "equals": lambda a, b: a == b,
+    "notEquals": lambda a, b: a != b,
+    "contains": lambda a, b: b in a,
+    "notContains": lambda a, b: b not in a,
+    "startsWith": lambda a, b: a.startswith(b),
+    "notStartsWith": lambda a, b: not a.startswith(b),
+    "endsWith": lambda a, b: a.endswith(b),
+    "notEndsWith": lambda a, b: not a.endswith(b),
+    "regex": lambda a, b: _js_regex(b).search(a) is not None,
+    "notRegex": lambda a, b: _js_regex(b).search(a) is None,
+}
+_NUMBER_OPERATIONS = {
+    "equals": lambda a, b: a == b,
+    "notEquals": lambda a, b: a != b,
+    "gt": lambda a, b: a > b,
+    "gte": lambda a, b: a >= b,
+    "lt": lambda a, b: a < b,
+    "lte": lambda a, b: a <= b,
+}
+
+
+def compile_condition(condition, case_sensitive=True):
+    """Compile one IF/Filter condition (``conditions`` version 2) into ``test(item, run)``."""
+    operator = condition.get("operator", {})
+    kind = operator.get("type", "string")
+    operation = operator.get("operation", "equals")
+    left_value = compile_value(condition.get("leftValue"))
+    right_value = compile_value(condition.get("rightValue"))
+
+    if operation in ("exists", "notExists"):
+        expected = operation == "exists"
+        return lambda item, run: (left_value(item, run) is not None) == expected
+    if operation in ("empty", "notEmpty"):
+        expected = operation == "empty"
+        return lambda item, run: _is_empty(left_value(item, run)) == expected
+    if kind == "boolean":
+        if operation in ("true", "false"):
+            expected = operation == "true"
+            return lambda item, run: bool(left_value(item, run)) == expected
+        same = operation == "equals"
+        return lambda item, run: (bool(left_value(item, run)) == bool(right_value(item, run))) == same
+    if kind == "number":
+        compare = _NUMBER_OPERATIONS[operation]
+
+        def test_number(item, run):
+            left, right = _number(left_value(item, run)), _number(right_value(item, run))
+            return left is not None and right is not None and compare(left, right)
+        return test_number
+
+    try:
+        compare = _STRING_OPERATIONS[operation]
+    except KeyError:
+        raise WorkflowError(f"condition operation {kind}.{operation} is not supported") from None
+    fold = not case_sensitive and operation not in ("regex", "notRegex")
+
+    def test_string(item, run):
+        left, right = left_value(item, run), right_value(item, run)
+        left = "" if left is None else str(left)
+        right = "" if right is None else str(right)
+        if fold:
+            left, right = left.lower(), right.lower()
+        return compare(left, right)
+    return test_string
+
+
+def check_condition(condition, item, run, case_sensitive=True):
+    """Evaluate one IF/Filter condition for ``item``."""
+    return compile_condition(condition, case_sensitive)(item, run)
+
+
+@handles("n8n-nodes-base.if", "n8n-nodes-base.filter")
+async def if_node(run, node, items):
+    partition = run.partitions.get(node.name)
+    if partition is not None:
+        passed, outputs = partition([item.json for item in items])
+        true, false = [], []
+        for item, json, ok in zip(items, outputs, passed):
+            (true if ok else false).append(item.derive(json, node.name))
+        return [true] if node.type.endswith(".filter") else [true, false]
+    conditions = node.parameters.get("conditions", {})
+    options = conditions.get("options", {})
+    case_sensitive = options.get("caseSensitive", True)
+    combine = all if conditions.get("combinator", "and") == "and" else any
+    tests = compiled(node, "tests", lambda: [compile_condition(check, case_sensitive)
+                                             for check in conditions.get("conditions", [])])
+    true, false = [], []
+    for item in items:
+        passed = combine(test(item, run) for test in tests)
+        (true if passed else false).append(item.derive(item.json, node.name))
+    return [true] if node.type.endswith(".filter") else [true, false]
+
+
+@handles("n8n-nodes-base.httpRequest")
+async def http_request(run, node, items):
+    params = node.parameters
+    timeout = params.get("options", {}).get("timeout", 300_000) / 1000
+    response_format = params.get("responseFormat", "json")
+
+    url = compiled(node, "url", lambda: compile_value(params.get("url", "")))
+
+    async def fetch(item):
+        body = await asyncio.wait_for(run.services.web.fetch(url(item, run), timeout, response_format), timeout)
+        return body if isinstance(body, dict) else {"data": body}
+    return [await run.map(node, items, fetch)]
+
+
+def _paced_downstream(run, node):
+    """Whether rate limits pace every service node the outputs of ``node`` lead to."""
+    if not run.limits:
+        return False
+    # The limits needed are a property of the graph, so the walk is done once per node.
+    needed = compiled(node, "limits", lambda: frozenset(
+        ratelimit.NODE_LIMITS[run.graph.node(target).type] for target in run.graph.reachable(node.name)
+        if run.graph.node(target).type in ratelimit.NODE_LIMITS))
+    return bool(needed) and needed <= run.limits.keys()
+
+
+@handles("n8n-nodes-base.wait")
+async def wait(run, node, items):
+    if _paced_downstream(run, node):
+        # Calls are paced by the service rate limits instead.
+        return [passthrough(node, items)]
+    params = node.parameters
+    seconds = float(params.get("amount", 1)) * _WAIT_UNITS[params.get("unit", "seconds")]
+    await asyncio.sleep(seconds * run.time_scale)
+    return [passthrough(node, items)]
+
+
+@handles("@n8n/n8n-nodes-langchain.chainLlm")
+async def chain_llm(run, node, items):
+    params = node.parameters
+    models = run.graph.sub_nodes(node.name, "ai_languageModel")
+    if not models:
+        raise WorkflowError(f"{node.name}: no chat model connected")
+    model = models[0].parameters.get("modelName", "")
+    messages = params.get("messages", {}).get("messageValues", [])
+    template = "\n".join([params.get("text", "")] + [m.get("message", "") for m in messages])
+
+    text, system_parts = compiled(node, "prompt", lambda: (
+        compile_value(params.get("text", "")) if params.get("promptType") == "define" else None,
+        [compile_value(m.get("message", "")) for m in messages]))
+
+    async def complete(item):
+        prompt = text(item, run) if text is not None else item.json.get("chatInput", "")
+        system = "\n".join(part(item, run) for part in system_parts) or None
+        return {"text": await run.services.llm.complete(model, prompt, system, template=template)}
+    return [await run.map(node, items, complete)]
+
+
+@handles("n8n-nodes-base.gmail")
+async def gmail(run, node, items):
+    params = node.parameters
+    send_to, subject, message = compiled(node, "message", lambda: tuple(
+        compile_value(params.get(name, "")) for name in ("sendTo", "subject", "message")))
+
+    async def send(item):
+        return await run.services.mail.send(
+            send_to(item, run), subject(item, run), message(item, run), params.get("emailType", "html"))
+    return [await run.map(node, items, send)]
+
+
+@handles("n8n-nodes-base.code")
+async def code(run, node, items):
+    port = run.code_nodes.get(node.name)
+    if port is None:
+        raise WorkflowError(f"Code node {node.name!r} has no Python port")
+    if getattr(port, "batch", False):
+        results = await run.run_batch(port, [item.json for item in items])
+        return [[item.derive(result, node.name) for item, result in zip(items, results)]]
+    output = []
+    for item in items:
+        try:
+            result = port(item.json)
+        except Exception as e:
+            if not node.continue_on_fail:
+                raise
+            result = {"error": str(e)}
+        output.append(item.derive(result, node.name))
+    return [output]
+
+
+# Python ports of the Code nodes in workflow.json. Both JavaScript originals
+# loop over ``$input``; the ports handle every item.
+
+
+@code_node("Clean Data", batch=True, reads=("data",))
+def clean_data(batch, max_chars=MAX_CHARS):
+    """Extract the text of the page in ``data`` into ``cleanedData``.
+
+    The page itself is dropped from the output; nothing downstream reads it
+    and it is by far the largest part of the item. Bind another text budget
+    with ``functools.partial`` (keeping ``.batch = True``).
+    """
+    output = []
+    for data in batch:
+        data = dict(data)
+        data["cleanedData"] = extract_text(data.pop("data", None) or "", max_chars)
+        output.append(data)
+    return output
+
+
+# Parse Json: the schema-valid e-mail object in the model reply's ``text``,
+# repaired where needed (the original's ``[^\s\S]`` regex can never match).
+# Failures keep the original's ``{"error": "Failed to parse JSON", ...}``.
+parse_json = code_node("Parse Json")(ReplyParser(EMAIL_SCHEMA))
@@ -0,0 +1,154 @@
+"""A warm pool of worker processes for CPU-bound Code node ports.
+
+Clean Data parses every fetched page. Run inline, it holds the event loop,
+and the HTTP, LLM, Gmail and Sheets calls of every other item wait behind
+it. :class:`WarmPool` runs batch ports (``@code_node(name, batch=True)``) in
+worker processes instead, and every other node stays on the event loop.
+The workers are started when the pool is, before the first batch, and stay
+up across runs. Each one imports the modules the ports need as it starts.
+
+A batch is cut into one chunk per worker, at most ``chunk_size`` items
+each, so even a streaming run's small batches reach every core. Results
+come back in input order. A port that names the fields it reads in
+``reads`` gets only those: the rest of each item does not cross the
+process boundary, and only the changes the port made come back.
+
+Usage:
+    python -m engine.pool [--workers N] [--pages N] [--page-bytes N] [--chunk-size N]
+"""
+import argparse
+import asyncio
+import concurrent.futures
+import importlib
+import os
+import sys
+import time
+
+from engine.items import apply_changes, json_changes
+from engine.nodes import clean_data
+from engine.services import LocalWeb
+
+# Imported by each worker as it starts.
+PRELOAD = ("engine.nodes", "engine.digest")
+
+
+def _warm(modules):
+    for name in modules:
+        importlib.import_module(name)
+
+
+def _ready():
+    return os.getpid()
+
+
+def _call(port, chunk, changes_only):
+    results = port(chunk)
+    if not changes_only:
+        return results
+    return [json_changes(data, result) for data, result in zip(chunk, results)]
+
+
+def port_reads(port):
+    """The fields a batch port reads, or None for the whole item."""
+    reads = getattr(port, "reads", None)
+    if reads is None and hasattr(port, "func"):
+        # A functools.partial of a registered port.
+        reads = getattr(port.func, "reads", None)
+    return reads
+
+
+class WarmPool:
+    """``workers`` processes running batch ports ``chunk_size`` items at a time."""
+
+    def __init__(self, workers, chunk_size=32, preload=PRELOAD):
+        if workers < 1:
+            raise ValueError("a pool needs at least one worker")
+        self.workers = workers
+        self.chunk_size = chunk_size
+        self.preload = tuple(preload)
+        self.startup = 0.0
+        self.batches = 0
+        self.chunks = 0
+        self.items = 0
+        self._executor = None
+
+    def start(self):
+        """Start the workers and wait until each has done its imports."""
+        if self._executor is None:
+            started = time.perf_counter()
+            self._executor = concurrent.futures.ProcessPoolExecutor(
+                self.workers, initializer=_warm, initargs=(self.preload,))
+            for future in [self._executor.submit(_ready) for _ in range(self.workers)]:
+                future.result()
+            self.startup = time.perf_counter() - started
+        return self
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    async def map(self, port, batch):
+        """``port(batch)``, computed in the workers."""
+        self.start()
+        reads = port_reads(port)
+        sent = batch if reads is None else [{name: data[name] for name in reads if name in data}
+                                            for data in batch]
+        size = max(1, min(self.chunk_size, -(-len(batch) // self.workers)))
+        loop = asyncio.get_running_loop()
+        chunks = await asyncio.gather(*(
+            loop.run_in_executor(self._executor, _call, port, sent[start:start + size], reads is not None)
+            for start in range(0, len(sent), size)
+        ))
+        self.batches += 1
+        self.chunks += len(chunks)
+        self.items += len(batch)
+        results = [result for chunk in chunks for result in chunk]
+        if reads is None:
+            return results
+        return [apply_changes(data, changes) for data, changes in zip(batch, results)]
+
+    def snapshot(self):
+        return {
+            "workers": self.workers,
+            "startup_s": round(self.startup, 3),
+            "batches": self.batches,
+            "chunks": self.chunks,
+            "items": self.items,
+        }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Time Clean Data inline and in warm pools of 1..N workers.")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="largest pool (default: %(default)s)")
+    parser.add_argument("--pages", type=int, default=2000, help="pages to clean (default: %(default)s)")
+    parser.add_argument("--page-bytes", type=int, default=20_000)
+    parser.add_argument("--chunk-size", type=int, default=32)
+    args = parser.parse_args(argv)
+
+    web = LocalWeb(page_bytes=args.page_bytes)
+    batch = [{"data": web.page(f"https://www.company{i}.example.com/"), "id": str(i)} for i in range(args.pages)]
+
+    started = time.perf_counter()
+    expected = clean_data(batch)
+    inline = time.perf_counter() - started
+    print(f"{'inline':10} {args.pages / inline:10,.0f} pages/s")
+
+    counts = sorted({1, args.workers} | {n for n in (2, 4, 8, 16, 32) if n < args.workers})
+    for workers in counts:
+        pool = WarmPool(workers, args.chunk_size).start()
+        try:
+            started = time.perf_counter()
+            results = asyncio.run(pool.map(clean_data, batch))
+            seconds = time.perf_counter() - started
+        finally:
+            pool.close()
+        if results != expected:
+            raise SystemExit(f"{workers} workers: results differ from the inline run")
+        print(f"{workers:3} workers {args.pages / seconds:10,.0f} pages/s  x{inline / seconds:.2f}  "
+              f"(started in {pool.startup:.2f}s)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,194 @@
+"""Token-bucket rate limits for the services a run calls.
+
+The outreach workflow paces itself with a fixed two second Wait node, and
+only on the invalid-email branch, so the Gmail sends are not limited at all.
+Here each downstream service gets a :class:`TokenBucket` sized to its quota
+(e.g. ``gmail=60/min``). A bucket refills continuously at ``rate`` and holds
+up to ``burst`` tokens: ``burst=1`` spaces calls evenly (a leaky bucket) and
+a larger burst lets idle time be spent at once. Waiters are served in FIFO
+order.
+
+:func:`apply` wraps the clients in :class:`engine.services.Services` so that
+every call takes a token first. A Wait node then passes its items straight
+through if buckets pace every service called after it (:data:`NODE_LIMITS`);
+otherwise it still waits.
+"""
+import asyncio
+import collections
+import inspect
+import time
+
+UNITS = {"s": 1.0, "sec": 1.0, "min": 60.0, "h": 3600.0, "hour": 3600.0, "day": 86400.0}
+# Limit names and the Services attribute each one guards.
+SERVICES = {"sheets": "sheets", "gmail": "mail", "gemini": "llm", "web": "web"}
+# The limit that paces the calls of each service node type.
+NODE_LIMITS = {
+    "n8n-nodes-base.googleSheets": "sheets",
+    "n8n-nodes-base.gmail": "gmail",
+    "@n8n/n8n-nodes-langchain.chainLlm": "gemini",
+    "n8n-nodes-base.httpRequest": "web",
+}
+
+
+class TokenBucket:
+    """``rate`` tokens per ``per`` seconds, bursting up to ``burst``."""
+
+    def __init__(self, rate, per=60.0, burst=1, clock=time.monotonic):
+        if rate <= 0 or burst < 1:
+            raise ValueError("rate must be positive and burst at least 1")
+        self.rate = rate
+        self.per = per
+        self.burst = burst
+        self.clock = clock
+        self._fill_rate = rate / per
+        self._tokens = float(burst)
+        self._updated = clock()
+        self._lock = asyncio.Lock()
+        self._recent = collections.deque()
+        self._started = None
+        self.granted = 0
+        self.waits = 0
+        self.waited = 0.0
+
+    def _refill(self):
+        now = self.clock()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self._fill_rate)
+        self._updated = now
+        return now
+
+    def _grant(self, tokens, now):
+        self._tokens -= tokens
+        self.granted += tokens
+        if self._started is None:
+            self._started = now
+        self._recent.append((now, tokens))
+
+    def try_acquire(self, tokens=1):
+        """Take ``tokens`` if they are available right now."""
+        if self._lock.locked():
+            return False
+        now = self._refill()
+        if self._tokens < tokens:
+            return False
+        self._grant(tokens, now)
+        return True
+
+    async def acquire(self, tokens=1):
+        """Wait until ``tokens`` are available and take them."""
+        if tokens > self.burst:
+            raise ValueError(f"cannot take {tokens} tokens from a bucket of {self.burst}")
+        async with self._lock:
+            self._refill()
+            missing = tokens - self._tokens
+            if missing > 0:
+                delay = missing / self._fill_rate
+                self.waits += 1
+                self.waited += delay
+                await asyncio.sleep(delay)
+            self._grant(tokens, self._refill())
+
+    @property
+    def available(self):
+        self._refill()
+        return self._tokens
+
+    def utilization(self):
+        """Share of the quota used over the last ``per`` seconds (0..1).
+
+        Before a full period has passed, the period since the first grant
+        is used, so a short run still reads close to 1 when saturated.
+        """
+        now = self.clock()
+        while self._recent and self._recent[0][0] <= now - self.per:
+            self._recent.popleft()
+        if self._started is None:
+            return 0.0
+        window = min(self.per, max(now - self._started, 1 / self._fill_rate))
+        used = sum(tokens for _, tokens in self._recent)
+        # The initial burst is free; it should not read as over 100%.
+        return min(1.0, used / (window * self._fill_rate + self.burst))
+
+    def snapshot(self):
+        return {
+            "rate": f"{self.rate:g}/{self.per:g}s",
+            "burst": self.burst,
+            "available": round(self.available, 2),
+            "utilization": round(self.utilization(), 3),
+            "granted": self.granted,
+            "waits": self.waits,
+            "waited_s": round(self.waited, 3),
+        }
+
+
+def parse(spec):
+    """Parse ``"gmail=60/min,gemini=15/min:5"`` into ``{name: TokenBucket}``.
+
+    Each entry is ``name=rate/unit`` with an optional ``:burst``.
+    """
+    limits = {}
+    for entry in filter(None, (part.strip() for part in spec.split(","))):
+        name, _, quota = entry.partition("=")
+        name = name.strip()
+        if name not in SERVICES:
+            raise ValueError(f"unknown service {name!r}; expected one of {', '.join(SERVICES)}")
+        quota, _, burst = quota.partition(":")
+        rate, _, unit = quota.partition("/")
+        try:
+            per = UNITS[unit.strip() or "s"]
+            limits[name] = TokenBucket(float(rate), per, int(burst) if burst else 1)
+        except (KeyError, ValueError):
+            raise ValueError(f"invalid rate limit {entry!r}") from None
+    return limits
+
+
+class Limited:
+    """Proxy that takes a token before every coroutine method call.
+
+    Async generator methods (``read_pages``) take one before each item they
+    yield, as each item is one paged call.
+    """
+
+    def __init__(self, client, bucket):
+        self._client = client
+        self._bucket = bucket
+
+    def __getattr__(self, name):
+        value = getattr(self._client, name)
+        bucket = self._bucket
+        if inspect.isasyncgenfunction(value):
+            async def pages(*args, **kwargs):
+                generator = value(*args, **kwargs)
+                try:
+                    while True:
+                        await bucket.acquire()
+                        try:
+                            item = await anext(generator)
+                        except StopAsyncIteration:
+                            return
+                        yield item
+                finally:
+                    await generator.aclose()
+            return pages
+        if not inspect.iscoroutinefunction(value):
+            return value
+
+        async def call(*args, **kwargs):
+            await bucket.acquire()
+            return await value(*args, **kwargs)
+        return call
+
+
+def apply(services, limits):
+    """Wrap the clients of ``services`` named in ``limits`` in :class:`Limited`.
+
+    A client with a ``limit(bucket)`` method (one that batches calls) is
+    asked to apply the bucket itself, so a token stands for one real call.
+    """
+    for name, bucket in limits.items():
+        attribute = SERVICES[name]
+        client = getattr(services, attribute)
+        if hasattr(type(client), "limit"):
+            client.limit(bucket)
+        else:
+            setattr(services, attribute, Limited(client, bucket))
+    return services
@@ -0,0 +1,319 @@
+"""Asyncio execution of a workflow graph.
+
+A run starts at a trigger node. Each node's outputs fire their connected
+nodes as soon as they are ready, like n8n's ``executionOrder: v1``, and
+every fired branch runs as its own task, so the true and false outputs of an
+IF node proceed concurrently. Inside a node, :meth:`Run.map` handles the
+items concurrently, bounded by the engine's ``concurrency``. A node with
+several incoming connections (``Outreach Prompt`` has two) runs once per
+connection that fires.
+
+With ``Engine(batch_size=N)`` a run streams instead: no node ever holds all
+of a run's items. Each node reachable from the trigger gets a queue of at
+most ``queue_size`` input batches of at most ``batch_size`` items and
+handles them one batch at a time, so a Code node's ``$input.all()`` is one
+batch. A full queue blocks the node feeding it, which throttles a fast
+sheet read to the pace of the LLM and mail calls behind it. Handlers with a
+``stream`` generator (the sheet read) yield their output page by page, and
+outputs are not kept unless ``keep_outputs`` is set, so peak memory depends
+on the batch and queue sizes rather than on the number of leads. Batch
+ports (the IF partition, Clean Data) see one batch at a time; a partition
+port with a ``reset`` method, such as engine.emails.EmailPartition, keeps
+its state across a run's batches and is reset when the run starts.
+"""
+import asyncio
+import collections
+import time
+
+from engine import nodes, ratelimit
+from engine.graph import Graph, WorkflowError
+from engine.items import Item
+from engine.pool import WarmPool
+from engine.services import Services
+
+
+_END = object()  # closes one connection into a streaming node's queue
+
+
+class NodeError(WorkflowError):
+    """A node failed and does not continue on fail."""
+
+    def __init__(self, node, error):
+        super().__init__(f"{node}: {error}")
+        self.node = node
+        self.error = error
+
+
+class NodeStats:
+    """Counters for one node over a run."""
+
+    __slots__ = ("executions", "items_in", "items_out", "errors", "seconds")
+
+    def __init__(self):
+        self.executions = 0
+        self.items_in = 0
+        self.items_out = 0
+        self.errors = 0
+        self.seconds = 0.0
+
+
+class Run:
+    """State and results of one workflow run."""
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.graph = engine.graph
+        self.services = engine.services
+        self.code_nodes = engine.code_nodes
+        self.partitions = engine.partitions
+        self.time_scale = engine.time_scale
+        self.limits = engine.limits
+        self.batch_size = engine.batch_size
+        self.outputs = {}
+        # First and last output item per node, for $('Node').first() / .last().
+        self._first = {}
+        self._last = {}
+        self.stats = {name: NodeStats() for name in self.graph.order}
+        self.elapsed = 0.0
+        self._limit = asyncio.Semaphore(engine.concurrency)
+
+    def first(self, name):
+        """First item node ``name`` has output in this run, or None."""
+        return self._first.get(name)
+
+    def last(self, name):
+        return self._last.get(name)
+
+    async def map(self, node, items, func):
+        """Apply async ``func(item) -> json`` to every item concurrently.
+
+        Results keep the input order. With ``continueOnFail`` a failing item
+        yields ``{"error": message}`` instead of failing the node.
+        """
+        stats = self.stats[node.name]
+
+        async def one(item):
+            async with self._limit:
+                try:
+                    return item.derive(await func(item), node.name)
+                except Exception as e:
+                    if not node.continue_on_fail:
+                        raise
+                    stats.errors += 1
+                    return item.derive({"error": str(e) or type(e).__name__}, node.name)
+        return list(await asyncio.gather(*(one(item) for item in items)))
+
+    async def run_batch(self, port, batch):
+        """Run a batch port, in the engine's worker processes if it has any.
+
+        A port with ``lookup``/``store`` (see engine.webcache.Memoized) answers
+        what it has seen before, and one with ``unique``/``expand`` (see
+        engine.singleflight.Shared) folds duplicates; only the rest goes to
+        its ``port``.
+        """
+        if hasattr(port, "unique"):
+            distinct, owners = port.unique(batch)
+            results = await self.run_batch(port.port, distinct)
+            return port.expand(batch, distinct, results, owners)
+        if hasattr(port, "lookup"):
+            results = port.lookup(batch)
+            missing = [index for index, result in enumerate(results) if result is None]
+            if missing:
+                misses = [batch[index] for index in missing]
+                computed = await self.run_batch(port.port, misses)
+                for index, result in zip(missing, computed):
+                    results[index] = result
+                port.store(misses, computed)
+            return results
+        pool = self.engine.pool
+        if pool is None or len(batch) <= 1:
+            return port(batch)
+        return await pool.map(port, batch)
+
+    def _record(self, name, outputs):
+        stats = self.stats[name]
+        for output in outputs:
+            stats.items_out += len(output)
+            if not output:
+                continue
+            self._first.setdefault(name, output[0])
+            self._last[name] = output[-1]
+            if self.engine.keep_outputs:
+                self.outputs.setdefault(name, []).extend(output)
+
+    async def _execute(self, name, items):
+        """Run node ``name``'s handler on ``items`` and return its outputs."""
+        node = self.graph.node(name)
+        stats = self.stats[name]
+        started = time.perf_counter()
+        if node.disabled:
+            outputs = [nodes.passthrough(node, items)]
+        else:
+            try:
+                outputs = await self.engine.handler(node)(self, node, items)
+            except WorkflowError:
+                raise
+            except Exception as e:
+                raise NodeError(name, e) from e
+        stats.executions += 1
+        stats.items_in += len(items)
+        stats.seconds += time.perf_counter() - started
+        self._record(name, outputs)
+        return outputs
+
+    async def fire(self, name, items):
+        """Execute node ``name`` on ``items`` and everything downstream of it."""
+        outputs = await self._execute(name, items)
+        await asyncio.gather(*(
+            self.fire(target, output)
+            for index, output in enumerate(outputs) if output
+            for target in self.graph.targets(name, index)
+        ))
+
+    async def _execute_streaming(self, name, items, emit):
+        """Execute ``name`` on ``items``, passing each batch of outputs to ``emit``."""
+        node = self.graph.node(name)
+        stream = None if node.disabled else getattr(self.engine.handler(node), "stream", None)
+        if stream is None:
+            await emit(name, await self._execute(name, items))
+            return
+        stats = self.stats[name]
+        stats.executions += 1
+        stats.items_in += len(items)
+        batches = stream(self, node, items)
+        try:
+            while True:
+                started = time.perf_counter()
+                try:
+                    outputs = await anext(batches)
+                except StopAsyncIteration:
+                    break
+                except WorkflowError:
+                    raise
+                except Exception as e:
+                    raise NodeError(name, e) from e
+                finally:
+                    stats.seconds += time.perf_counter() - started
+                self._record(name, outputs)
+                await emit(name, outputs)
+        finally:
+            await batches.aclose()
+
+    async def stream(self, start, items):
+        """Execute node ``start`` on ``items`` and everything downstream, in batches."""
+        graph = self.graph
+        size = self.engine.batch_size
+        names = graph.reachable(start)
+        queues = {name: asyncio.Queue(self.engine.queue_size) for name in names}
+        # Connections into each node that have not finished yet.
+        open_inputs = collections.Counter(target for name in names for _, target in graph.connections(name))
+
+        async def emit(name, outputs):
+            for index, output in enumerate(outputs):
+                for target in graph.targets(name, index):
+                    for first in range(0, len(output), size):
+                        await queues[target].put(output[first:first + size])
+
+        async def finish(name):
+            for _, target in graph.connections(name):
+                await queues[target].put(_END)
+
+        async def consume(name):
+            while open_inputs[name]:
+                batch = await queues[name].get()
+                if batch is _END:
+                    open_inputs[name] -= 1
+                else:
+                    await self._execute_streaming(name, batch, emit)
+            await finish(name)
+
+        async def source():
+            await self._execute_streaming(start, items, emit)
+            await finish(start)
+
+        tasks = [asyncio.ensure_future(source())]
+        tasks.extend(asyncio.ensure_future(consume(name)) for name in names if name != start)
+        try:
+            await asyncio.gather(*tasks)
+        finally:
+            # A failed node leaves the others waiting on their queues.
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+
+class Engine:
+    """Runs one workflow graph against a set of services."""
+
+    def __init__(self, graph, services=None, handlers=None, code_nodes=None, concurrency=64,
+                 time_scale=1.0, keep_outputs=None, limits=None, workers=0, chunk_size=32, partitions=None,
+                 batch_size=None, queue_size=4):
+        self.graph = graph if isinstance(graph, Graph) else Graph(graph)
+        self.services = services if services is not None else Services()
+        # {name: TokenBucket} (see engine.ratelimit); replaces the pacing of Wait nodes it covers.
+        self.limits = limits or {}
+        if self.limits:
+            ratelimit.apply(self.services, self.limits)
+        self.handlers = dict(nodes.HANDLERS, **(handlers or {}))
+        self.code_nodes = dict(nodes.CODE_NODES, **(code_nodes or {}))
+        # {IF node name: port(batch) -> (passed, outputs)}; replaces its conditions (see engine.emails).
+        self.partitions = dict(partitions or {})
+        self.concurrency = concurrency
+        # Multiplies Wait node delays; 0 skips them.
+        self.time_scale = time_scale
+        # Streaming runs (batch_size) keep no outputs unless asked to.
+        self.keep_outputs = keep_outputs if keep_outputs is not None else not batch_size
+        self.batch_size = batch_size
+        self.queue_size = queue_size
+        # Worker processes for batch Code node ports, fed chunk_size items at a time;
+        # every other node, all of them waiting on I/O, stays on the event loop.
+        self.workers = workers
+        self.chunk_size = chunk_size
+        self.pool = WarmPool(workers, chunk_size) if workers else None
+
+    def close(self):
+        """Shut the worker processes down."""
+        if self.pool is not None:
+            self.pool.close()
+
+    def handler(self, node):
+        try:
+            return self.handlers[node.type]
+        except KeyError:
+            raise WorkflowError(f"no handler for {node.name!r} ({node.type})") from None
+
+    def check(self, trigger):
+        """Fail before running if a node reachable from ``trigger`` cannot run."""
+        for name in self.graph.reachable(trigger):
+            node = self.graph.nodes[name]
+            if node.disabled:
+                continue
+            self.handler(node)
+            if node.type == "n8n-nodes-base.code" and name not in self.code_nodes:
+                raise WorkflowError(f"Code node {name!r} has no Python port")
+
+    async def run(self, trigger=None, items=None):
+        """Run from ``trigger`` (default: the first trigger) and return the :class:`Run`.
+
+        ``items`` are the trigger's output JSON objects, ``[{}]`` by default.
+        """
+        start = self.graph.trigger(trigger)
+        self.check(start.name)
+        if self.pool is not None:
+            self.pool.start()
+        for port in self.partitions.values():
+            reset = getattr(port, "reset", None)
+            if reset is not None:
+                reset()
+        run = Run(self)
+        started = time.perf_counter()
+        try:
+            items = [Item(json, start.name) for json in (items or [{}])]
+            if self.batch_size:
+                await run.stream(start.name, items)
+            else:
+                await run.fire(start.name, items)
+        finally:
+            await self.services.flush()
+        run.elapsed = time.perf_counter() - started
+        return run
@@ -0,0 +1,240 @@
+"""Local stand-ins for the services the workflows call.
+
+Each stand-in has the async interface the node handlers use, does its work
+in memory and can add a fixed ``latency`` (seconds) per call to imitate a
+remote API. That is enough to run ``workflow.json`` end to end and to
+measure how the engine overlaps calls, without Google credentials or an n8n
+server.
+"""
+import asyncio
+import collections
+import hashlib
+import itertools
+import json
+import re
+import time
+from urllib.parse import urlsplit
+
+
+async def _delay(seconds):
+    if seconds > 0:
+        await asyncio.sleep(seconds)
+
+
+class LocalSheets:
+    """A single spreadsheet table of row dicts.
+
+    Every sheet reference resolves to the same table, which is how the
+    outreach workflow uses its lead list: it reads the leads and writes each
+    lead's ``status`` back.
+    """
+
+    def __init__(self, rows=(), latency=0.0):
+        self.rows = []
+        self.latency = latency
+        self.reads = 0
+        self.writes = 0
+        for row in rows:
+            self.append(row)
+
+    def append(self, row):
+        row = dict(row)
+        row["row_number"] = len(self.rows) + 2  # row 1 holds the headers
+        self.rows.append(row)
+
+    async def read(self, document=None, sheet=None):
+        await _delay(self.latency)
+        self.reads += 1
+        return [dict(row) for row in self.rows]
+
+    async def read_page(self, document=None, sheet=None, start=2, limit=1000, newer=None):
+        """Up to ``limit`` rows from row ``start`` on.
+
+        ``newer`` is ``(column, value)``: only rows whose ``column`` sorts
+        at or after ``value`` (e.g. an ISO updated-at timestamp).
+        """
+        await _delay(self.latency)
+        self.reads += 1
+        rows = self.rows[max(0, start - 2):]
+        if newer is not None:
+            column, value = newer
+            rows = (row for row in rows if str(row.get(column) or "") >= value)
+        return [dict(row) for row in itertools.islice(rows, limit)]
+
+    async def read_pages(self, document=None, sheet=None, size=1000):
+        """Every row, as pages of ``size`` rows read one after another."""
+        start = 2
+        while True:
+            page = await self.read_page(document, sheet, start, size)
+            if page:
+                yield page
+            if len(page) < size:
+                return
+            start = page[-1]["row_number"] + 1
+
+    def _apply(self, match_columns, values):
+        key = [(column, str(values.get(column))) for column in match_columns]
+        updated = None
+        for row in self.rows:
+            if all(str(row.get(column)) == value for column, value in key):
+                row.update(values)
+                updated = row
+        return updated
+
+    async def update(self, match_columns, values, document=None, sheet=None):
+        """Update the rows whose ``match_columns`` equal ``values``'."""
+        await _delay(self.latency)
+        self.writes += 1
+        updated = self._apply(match_columns, values)
+        return dict(updated) if updated is not None else dict(values)
+
+    async def batch_update(self, match_columns, rows, document=None, sheet=None):
+        """Update many rows in one call."""
+        await _delay(self.latency)
+        self.writes += 1
+        for values in rows:
+            self._apply(match_columns, values)
+
+
+class LocalMail:
+    """Gmail stand-in that keeps every sent message in ``outbox``.
+
+    With ``keep=False`` it only counts them in ``sent``, for long runs.
+    """
+
+    def __init__(self, latency=0.0, keep=True):
+        self.latency = latency
+        self.keep = keep
+        self.outbox = []
+        self.sent = 0
+        self._ids = itertools.count(1)
+
+    async def send(self, to, subject, body, email_type="text"):
+        await _delay(self.latency)
+        message = {"id": f"local-{next(self._ids)}", "to": to, "subject": subject,
+                   "body": body, "type": email_type}
+        self.sent += 1
+        if self.keep:
+            self.outbox.append(message)
+        return {"id": message["id"], "threadId": message["id"], "labelIds": ["SENT"]}
+
+
+_SLOPPY = (
+    lambda email, text: f"Sure! Here's a draft you can use: {json.dumps(email)} Let me know if you want changes.",
+    lambda email, text: f"```json\n{text[:-2]},\n}}\n```",
+    lambda email, text: "```json\n{" + "\n".join(f"{json.dumps(k)}: {json.dumps(v)}" for k, v in email.items()) + "}\n```",
+    lambda email, text: re.sub(r'"([^"]*)"', "\u201c\\1\u201d", text),
+    lambda email, text: json.dumps({"email": {"Subject Line": email["subject"], "Greeting": email["greeting"],
+                                               "Opening": email["opening_line"], "Body": email["main_body"],
+                                               "Sign-off": email["ending"]}}),
+    lambda email, text: f"```json\n{text[:len(text) * 3 // 4]}",
+)
+
+
+class LocalLLM:
+    """Chat model stand-in answering with a fenced JSON email.
+
+    The reply is derived from a hash of the prompt, so it is deterministic.
+    Latency grows with the prompt (``latency + per_token * tokens``, about
+    four characters per token), like a hosted model's. ``template`` is the
+    unrendered prompt; caching clients (engine.llmcache) key on it.
+
+    A ``sloppy`` share of replies (0..1) come in the shapes real models
+    produce: no fence, trailing or missing commas, typographic quotes,
+    another key naming, or cut off before the end.
+    """
+
+    def __init__(self, latency=0.0, per_token=0.0, sloppy=0.0):
+        self.latency = latency
+        self.per_token = per_token
+        self.sloppy = sloppy
+        self.calls = 0
+        self.prompt_tokens = 0
+        # The most recent call durations, enough for percentiles.
+        self.durations = collections.deque(maxlen=100_000)
+
+    async def complete(self, model, prompt, system=None, template=None):
+        started = time.perf_counter()
+        tokens = (len(prompt) + len(system or "")) // 4
+        await _delay(self.latency + self.per_token * tokens)
+        self.calls += 1
+        self.prompt_tokens += tokens
+        self.durations.append(time.perf_counter() - started)
+        name = re.search(r"first_Name:[ \t]*(.*)", prompt)
+        company = re.search(r"co\w*_\w*ame:[ \t]*(.*)", prompt)
+        tag = hashlib.sha256(prompt.encode("utf-8")).hexdigest()[:8]
+        email = {
+            "subject": f"Quick idea for {company.group(1).strip() if company else 'your team'}",
+            "greeting": f"Hi {name.group(1).strip() if name else 'there'},",
+            "opening_line": f"I came across your website and liked what you are building ({tag}).",
+            "main_body": "We help teams manage employees at scale with less admin work.",
+            "ending": "Looking forward to hearing from you!",
+        }
+        text = json.dumps(email, indent=2)
+        draw = int(tag, 16)
+        if draw % 1000 >= self.sloppy * 1000:
+            return f"Here is the email:\n```json\n{text}\n```"
+        return _SLOPPY[draw // 1000 % len(_SLOPPY)](email, text)
+
+
+class LocalWeb:
+    """Website stand-in serving generated HTML pages.
+
+    ``pages`` maps URLs to fixed bodies; any other URL gets a generated page
+    of roughly ``page_bytes``. Hosts in ``dead_hosts`` time out.
+    """
+
+    def __init__(self, pages=None, page_bytes=20_000, dead_hosts=(), latency=0.0):
+        self.pages = dict(pages or {})
+        self.page_bytes = page_bytes
+        self.dead_hosts = set(dead_hosts)
+        self.latency = latency
+        self.fetches = 0
+
+    def page(self, url):
+        labels = (urlsplit(url).hostname or url).split(".")
+        company = labels[1] if labels[0] == "www" and len(labels) > 1 else labels[0]
+        paragraph = (f"<p>{company.title()} builds software for growing businesses. "
+                     f"Our customers rely on us for reliable, friendly service.</p>\n")
+        filler = paragraph * max(1, self.page_bytes // len(paragraph))
+        return (
+            f"<html><head><title>{company.title()}</title>"
+            f'<meta name="description" content="{company.title()} helps businesses grow.">'
+            "<style>body { font-family: sans-serif; }</style>"
+            "<script>window.analytics = [];</script></head>"
+            f"<body><nav><a href='/'>Home</a> &middot; <a href='/about'>About</a></nav>"
+            f"<h1>Welcome to {company.title()}</h1>\n{filler}"
+            f"<h2>About us</h2><p>{company.title()} was founded to make work simpler.</p>"
+            "</body></html>"
+        )
+
+    async def fetch(self, url, timeout=None, response_format="string"):
+        await _delay(self.latency)
+        self.fetches += 1
+        if not url:
+            raise ValueError("URL is empty")
+        if (urlsplit(url).hostname or "") in self.dead_hosts:
+            raise asyncio.TimeoutError(f"timeout of {timeout}s exceeded")
+        body = self.pages.get(url)
+        if body is None:
+            body = self.page(url)
+        return json.loads(body) if response_format == "json" else body
+
+
+class Services:
+    """The service clients one engine run talks to."""
+
+    __slots__ = ("sheets", "mail", "llm", "web")
+
+    def __init__(self, sheets=None, mail=None, llm=None, web=None):
+        self.sheets = sheets if sheets is not None else LocalSheets()
+        self.mail = mail if mail is not None else LocalMail()
+        self.llm = llm if llm is not None else LocalLLM()
+        self.web = web if web is not None else LocalWeb()
+
+    async def flush(self):
+        """Let clients that buffer writes (see engine.sheets.BatchWriter) finish them."""
+        for name in self.__slots__:
+            flush = getattr(getattr(self, name), "flush", None)
+            if flush is not None:
+                await flush()
@@ -0,0 +1,231 @@
+"""Spreadsheet stand-in on SQLite and write-behind batching of row updates.
+
+:class:`SQLiteSheets` keeps a lead sheet in a SQLite table (a file, or
+memory) and counts API-equivalent calls. It can be loaded from and saved to
+CSV. :class:`BatchWriter` sits in front of any sheets client with a
+``batch_update`` and turns the workflow's one-write-per-item "Update row in
+sheet" into a few batched calls. Updates to the same row (by the match
+columns, ``id`` in the workflow) are merged while they wait, and only the
+columns an update sets are written, not the node's full column schema. A
+batch is flushed once ``max_rows`` rows are pending or ``max_delay`` seconds
+after its first update, whichever comes first.
+"""
+import asyncio
+import csv
+import sqlite3
+
+from engine.ratelimit import Limited
+
+ROW_NUMBER = "row_number"
+
+
+def _quote(name):
+    return '"' + name.replace('"', '""') + '"'
+
+
+class SQLiteSheets:
+    """One sheet as a SQLite table; ``row_number`` follows the sheet's (from 2)."""
+
+    def __init__(self, path=":memory:", table="sheet", rows=(), latency=0.0):
+        self.conn = sqlite3.connect(path)
+        self.table = _quote(table)
+        self.latency = latency
+        self.conn.execute(f"CREATE TABLE IF NOT EXISTS {self.table} ({ROW_NUMBER} INTEGER PRIMARY KEY)")
+        self.columns = [name for _, name, *_ in self.conn.execute(f"PRAGMA table_info({self.table})")
+                        if name != ROW_NUMBER]
+        self._indexed = set()
+        self.reads = 0
+        self.writes = 0
+        self.rows_written = 0
+        self.extend(rows)
+
+    @classmethod
+    def from_csv(cls, csv_path, path=":memory:", **kwargs):
+        with open(csv_path, newline="", encoding="utf-8") as f:
+            return cls(path, rows=csv.DictReader(f), **kwargs)
+
+    def to_csv(self, csv_path):
+        with open(csv_path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.DictWriter(f, self.columns, extrasaction="ignore")
+            writer.writeheader()
+            writer.writerows(self.rows())
+
+    def _ensure_columns(self, names):
+        for name in names:
+            if name != ROW_NUMBER and name not in self.columns:
+                self.conn.execute(f"ALTER TABLE {self.table} ADD COLUMN {_quote(name)} TEXT")
+                self.columns.append(name)
+
+    def _ensure_index(self, match_columns):
+        key = tuple(match_columns)
+        if key not in self._indexed:
+            name = _quote("match_" + "_".join(key))
+            self.conn.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {self.table} "
+                              f"({', '.join(map(_quote, key))})")
+            self._indexed.add(key)
+
+    def extend(self, rows):
+        """Append rows (dicts) below the existing ones."""
+        with self.conn:
+            for row in rows:
+                self._ensure_columns(row)
+                names = [name for name in row if name != ROW_NUMBER]
+                self.conn.execute(
+                    f"INSERT INTO {self.table} ({', '.join(map(_quote, names))}) VALUES ({', '.join('?' * len(names))})",
+                    [None if row[name] is None else str(row[name]) for name in names])
+
+    def append(self, row):
+        self.extend([row])
+
+    def __len__(self):
+        return self.conn.execute(f"SELECT COUNT(*) FROM {self.table}").fetchone()[0]
+
+    def rows(self, where="", params=(), limit=-1):
+        cursor = self.conn.execute(
+            f"SELECT {ROW_NUMBER} + 1, {', '.join(map(_quote, self.columns)) or 'NULL'} "
+            f"FROM {self.table} {where} ORDER BY {ROW_NUMBER} LIMIT ?", (*params, limit))
+        for values in cursor:
+            row = {name: "" if value is None else value for name, value in zip(self.columns, values[1:])}
+            row[ROW_NUMBER] = values[0]
+            yield row
+
+    async def _call(self):
+        if self.latency > 0:
+            await asyncio.sleep(self.latency)
+
+    async def read(self, document=None, sheet=None):
+        await self._call()
+        self.reads += 1
+        return list(self.rows())
+
+    async def read_page(self, document=None, sheet=None, start=2, limit=1000, newer=None):
+        """Up to ``limit`` rows from row ``start`` on, like a ranged read.
+
+        ``newer`` is ``(column, value)``: only rows whose ``column`` sorts
+        at or after ``value`` (e.g. an ISO updated-at timestamp).
+        """
+        await self._call()
+        self.reads += 1
+        where, params = f"WHERE {ROW_NUMBER} >= ?", [start - 1]
+        if newer is not None:
+            column, value = newer
+            if column not in self.columns:
+                return []
+            self._ensure_index((column,))
+            where += f" AND {_quote(column)} >= ?"
+            params.append(value)
+        return list(self.rows(where, params, limit))
+
+    async def read_pages(self, document=None, sheet=None, size=1000):
+        """Every row, as pages of ``size`` rows read one after another."""
+        start = 2
+        while True:
+            page = await self.read_page(document, sheet, start, size)
+            if page:
+                yield page
+            if len(page) < size:
+                return
+            start = page[-1][ROW_NUMBER] + 1
+
+    async def update(self, match_columns, values, document=None, sheet=None):
+        """Update the rows matching ``values`` on ``match_columns`` (one call)."""
+        await self.batch_update(match_columns, [values], document, sheet)
+        return dict(values)
+
+    async def batch_update(self, match_columns, rows, document=None, sheet=None):
+        """Update many rows in one call; rows are dicts including the match columns."""
+        await self._call()
+        self.writes += 1
+        self._ensure_index(match_columns)
+        with self.conn:
+            statements = {}
+            for values in rows:
+                self._ensure_columns(values)
+                names = tuple(name for name in values if name not in match_columns and name != ROW_NUMBER)
+                if not names:
+                    continue
+                statements.setdefault(names, []).append(
+                    [str(values[name]) for name in names] + [str(values[name]) for name in match_columns])
+            where = " AND ".join(f"{_quote(name)} = ?" for name in match_columns)
+            for names, params in statements.items():
+                assignments = ", ".join(f"{_quote(name)} = ?" for name in names)
+                self.conn.executemany(f"UPDATE {self.table} SET {assignments} WHERE {where}", params)
+        self.rows_written += len(rows)
+
+
+class BatchWriter:
+    """Coalescing write-behind buffer for row updates.
+
+    ``update`` returns at once with the values it queued; call :meth:`flush`
+    (the engine does at the end of a run) to wait for everything to land.
+    A failed background flush is raised by the next ``update`` or ``flush``.
+    """
+
+    def __init__(self, client, max_rows=500, max_delay=1.0):
+        self.client = client
+        self.max_rows = max_rows
+        self.max_delay = max_delay
+        self._pending = {}  # (document, sheet, match columns) -> {match values: row}
+        self._size = 0
+        self._timer = None
+        self._lock = asyncio.Lock()
+        self._error = None
+        self.updates = 0
+        self.merged = 0
+        self.flushes = 0
+        self.rows_flushed = 0
+
+    def __getattr__(self, name):
+        # Reads and counters go to the wrapped client.
+        return getattr(self.client, name)
+
+    def limit(self, bucket):
+        """Rate-limit the wrapped client: one token per batch, not per update."""
+        self.client = Limited(self.client, bucket)
+
+    def _raise_error(self):
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise error
+
+    async def update(self, match_columns, values, document=None, sheet=None):
+        self._raise_error()
+        self.updates += 1
+        match_columns = tuple(match_columns)
+        rows = self._pending.setdefault((document, sheet, match_columns), {})
+        key = tuple(str(values.get(column)) for column in match_columns)
+        if key in rows:
+            rows[key].update(values)
+            self.merged += 1
+        else:
+            rows[key] = dict(values)
+            self._size += 1
+        if self._size >= self.max_rows:
+            await self.flush()
+        elif self._timer is None:
+            self._timer = asyncio.create_task(self._flush_later())
+        return dict(values)
+
+    async def _flush_later(self):
+        await asyncio.sleep(self.max_delay)
+        self._timer = None
+        try:
+            await self.flush()
+        except Exception as e:
+            self._error = e
+
+    async def flush(self):
+        """Write every pending update."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        async with self._lock:
+            pending, self._pending, self._size = self._pending, {}, 0
+            for (document, sheet, match_columns), rows in pending.items():
+                rows = list(rows.values())
+                for start in range(0, len(rows), self.max_rows):
+                    batch = rows[start:start + self.max_rows]
+                    await self.client.batch_update(list(match_columns), batch, document, sheet)
+                    self.flushes += 1
+                    self.rows_flushed += len(batch)
+        self._raise_error()
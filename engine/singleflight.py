@@ -0,0 +1,138 @@
+"""Single-flight coalescing of website fetches and Clean Data work.
+
+Lead lists often hold many contacts at one company, so "HTTP Request: Get
+Website" asks for the same site many times at once. :class:`CoalescingWeb`
+wraps the web client and lets concurrent fetches of one normalized URL
+share a single in-flight request. :class:`Shared` wraps the Clean Data port
+and runs it once per distinct page in a batch; the other items get the same
+result. Both count what they saved.
+"""
+import asyncio
+from urllib.parse import urlsplit, urlunsplit
+
+from engine.items import apply_changes, json_changes
+from engine.ratelimit import Limited
+
+DEFAULT_PORTS = {"http": 80, "https": 443}
+
+
+def normalize_url(url):
+    """``url`` with the scheme and host lower-cased, no default port and no fragment."""
+    try:
+        parts = urlsplit(url.strip())
+        port = parts.port
+    except ValueError:
+        return url
+    if not parts.hostname:
+        return url
+    scheme = parts.scheme.lower()
+    host = parts.hostname.lower()
+    if port is not None and port != DEFAULT_PORTS.get(scheme):
+        host = f"{host}:{port}"
+    return urlunsplit((scheme, host, parts.path or "/", parts.query, ""))
+
+
+class SingleFlight:
+    """Runs one call per key at a time; concurrent callers share its result."""
+
+    def __init__(self):
+        self._calls = {}
+        self.calls = 0
+        self.shared = 0
+
+    async def do(self, key, func, *args):
+        pending = self._calls.get(key)
+        if pending is not None:
+            self.shared += 1
+            # Shielded: one caller's cancellation must not cancel the others'.
+            return await asyncio.shield(pending)
+        self.calls += 1
+        pending = self._calls[key] = asyncio.ensure_future(func(*args))
+        try:
+            return await asyncio.shield(pending)
+        finally:
+            if pending.done():
+                self._calls.pop(key, None)
+            else:
+                pending.add_done_callback(lambda _: self._calls.pop(key, None))
+
+
+class CoalescingWeb:
+    """Web client wrapper sharing concurrent fetches of one normalized URL."""
+
+    def __init__(self, client):
+        self.client = client
+        self.flights = SingleFlight()
+
+    def __getattr__(self, name):
+        # Counters and close() go to the wrapped client.
+        return getattr(self.client, name)
+
+    def limit(self, bucket):
+        """Rate-limit the wrapped client: one token per real fetch."""
+        self.client = Limited(self.client, bucket)
+
+    @property
+    def saved(self):
+        """Fetches that shared another's request."""
+        return self.flights.shared
+
+    async def fetch(self, url, timeout=None, response_format="string"):
+        key = (normalize_url(url), response_format)
+        return await self.flights.do(key, self.client.fetch, url, timeout, response_format)
+
+
+class Shared:
+    """Batch Code port wrapper running ``port`` once per distinct page.
+
+    Items whose ``field`` holds the same page get the changes the port made
+    to the first of them. :meth:`engine.runner.Run.run_batch` hands ``port``
+    only the distinct items; calling the wrapper directly works too.
+    """
+
+    batch = True
+
+    def __init__(self, port, field="data"):
+        self.port = port
+        self.field = field
+        self.items = 0
+        self.computed = 0
+
+    @property
+    def saved(self):
+        return self.items - self.computed
+
+    def unique(self, batch):
+        """``(distinct items, index of each item's distinct item)``."""
+        distinct = []
+        owners = []
+        seen = {}
+        for data in batch:
+            page = data.get(self.field)
+            if isinstance(page, (str, bytes)) and page:
+                index = seen.setdefault(page, len(distinct))
+            else:
+                index = len(distinct)
+            if index == len(distinct):
+                distinct.append(data)
+            owners.append(index)
+        self.items += len(batch)
+        self.computed += len(distinct)
+        return distinct, owners
+
+    def expand(self, batch, distinct, results, owners):
+        """Results for the whole batch from the ``results`` of the distinct items."""
+        changes = {}
+        output = []
+        for data, index in zip(batch, owners):
+            if data is distinct[index]:
+                output.append(results[index])
+                continue
+            if index not in changes:
+                changes[index] = json_changes(distinct[index], results[index])
+            output.append(apply_changes(data, changes[index]))
+        return output
+
+    def __call__(self, batch):
+        distinct, owners = self.unique(batch)
+        return self.expand(batch, distinct, self.port(distinct), owners)
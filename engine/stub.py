@@ -0,0 +1,118 @@
+"""Local HTTP server standing in for lead websites.
+
+Serves :meth:`engine.services.LocalWeb.page` for whatever host a request
+names, over keep-alive HTTP/1.1, from a background thread. Point an
+:class:`engine.fetch.HTTPClient` at it with ``resolver=server.resolve`` to
+exercise real sockets without touching the network::
+
+    with StubServer(delay=0.05) as server:
+        client = HTTPClient(resolver=server.resolve)
+
+Paths under ``/status/<code>`` answer with that status, ``/slow/<seconds>``
+waits before answering and ``/chunked/`` uses chunked transfer encoding.
+Pages carry an ``ETag`` and ``Last-Modified`` and a matching
+``If-None-Match`` gets ``304 Not Modified``.
+"""
+import hashlib
+import threading
+import time
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from engine.services import LocalWeb
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        server = self.server
+        host = self.headers.get("Host", "localhost")
+        with server.lock:
+            server.requests += 1
+            server.hosts[host] = server.hosts.get(host, 0) + 1
+        if server.delay:
+            time.sleep(server.delay)
+        parts = self.path.strip("/").split("/")
+        if parts[0] == "slow" and len(parts) > 1:
+            time.sleep(float(parts[1]))
+        if parts[0] == "status" and len(parts) > 1:
+            body = f"status {parts[1]}".encode()
+            self.send_response(int(parts[1]))
+            self.send_header("Content-Type", "text/plain")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+            return
+        body = server.web.page(f"http://{host}{self.path}").encode("utf-8")
+        etag = '"' + hashlib.sha256(body).hexdigest()[:16] + '"'
+        if self.headers.get("If-None-Match") == etag:
+            with server.lock:
+                server.not_modified += 1
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("ETag", etag)
+        self.send_header("Last-Modified", server.last_modified)
+        if parts[0] == "chunked":
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+            for start in range(0, len(body), 4096):
+                piece = body[start:start + 4096]
+                self.wfile.write(f"{len(piece):x}\r\n".encode() + piece + b"\r\n")
+            self.wfile.write(b"0\r\n\r\n")
+        else:
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    # The default backlog of 5 drops connects when a pool opens many at once.
+    request_queue_size = 1024
+
+
+class StubServer:
+    """Threaded stub web server on ``127.0.0.1`` and a free port."""
+
+    def __init__(self, page_bytes=20_000, delay=0.0, pages=None):
+        self.httpd = _Server(("127.0.0.1", 0), _Handler)
+        self.httpd.web = LocalWeb(pages=pages, page_bytes=page_bytes)
+        self.httpd.delay = delay
+        self.httpd.lock = threading.Lock()
+        self.httpd.requests = 0
+        self.httpd.not_modified = 0
+        self.httpd.last_modified = formatdate(usegmt=True)
+        self.httpd.hosts = {}
+        self.port = self.httpd.server_address[1]
+        self._thread = None
+
+    @property
+    def requests(self):
+        return self.httpd.requests
+
+    def resolve(self, host, port):
+        """Resolver for :class:`engine.fetch.HTTPClient`: every host is this server."""
+        return "127.0.0.1", self.port
+
+    def start(self):
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
@@ -0,0 +1,274 @@
+"""On-disk cache for the website-fetch stage.
+
+Every scheduled run downloads every lead's website again and cleans it
+again. :class:`CachingWeb` wraps the web client and keeps each page in a
+:class:`WebCache` (a SQLite file) with its ``ETag`` and ``Last-Modified``.
+The next fetch of the URL is a conditional request, and a ``304 Not
+Modified`` is answered from the stored body. :class:`Memoized` wraps the
+Clean Data port and reuses its result for a page whose content hash it has
+seen before, whether the page came from a 304 or was downloaded again
+unchanged.
+
+Hosts that time out, refuse connections or answer with a 5xx are cached as
+failures too. Until their backoff expires (``backoff`` seconds, doubling
+with every further failure up to ``max_backoff``) fetches from them fail
+at once with :class:`HostBackoff` instead of waiting out the timeout again.
+"""
+import asyncio
+import functools
+import hashlib
+import json
+import sqlite3
+import time
+from urllib.parse import urlsplit
+
+from engine.fetch import HTTPError, Response
+from engine.items import apply_changes, json_changes
+
+BACKOFF = 300.0
+MAX_BACKOFF = 6 * 3600.0
+# Response headers kept with a page.
+STORED_HEADERS = ("content-type", "etag", "last-modified")
+
+
+class HostBackoff(Exception):
+    """The host failed recently and is skipped until its backoff expires."""
+
+    def __init__(self, host, error, retry_in):
+        super().__init__(f"{host} failed recently ({error}); skipped for another {retry_in:.0f}s")
+        self.host = host
+        self.error = error
+        self.retry_in = retry_in
+
+
+def content_hash(body):
+    if isinstance(body, str):
+        body = body.encode("utf-8")
+    return hashlib.sha256(body).hexdigest()
+
+
+class WebCache:
+    """Pages, derived results and host failures in one SQLite file."""
+
+    def __init__(self, path=":memory:"):
+        self.conn = sqlite3.connect(path)
+        with self.conn:
+            self.conn.execute("CREATE TABLE IF NOT EXISTS pages (url TEXT PRIMARY KEY, headers TEXT, "
+                              "body BLOB, hash TEXT, fetched REAL)")
+            self.conn.execute("CREATE TABLE IF NOT EXISTS derived (key TEXT PRIMARY KEY, value TEXT)")
+            self.conn.execute("CREATE TABLE IF NOT EXISTS failures (host TEXT PRIMARY KEY, error TEXT, "
+                              "failures INTEGER, until REAL)")
+
+    def page(self, url):
+        """``(headers, body, hash)`` stored for ``url``, or None."""
+        row = self.conn.execute("SELECT headers, body, hash FROM pages WHERE url = ?", (url,)).fetchone()
+        return None if row is None else (json.loads(row[0]), row[1], row[2])
+
+    def store_page(self, url, headers, body, digest):
+        with self.conn:
+            self.conn.execute("INSERT OR REPLACE INTO pages VALUES (?, ?, ?, ?, ?)",
+                              (url, json.dumps(headers), body, digest, time.time()))
+
+    def derived(self, key):
+        row = self.conn.execute("SELECT value FROM derived WHERE key = ?", (key,)).fetchone()
+        return None if row is None else json.loads(row[0])
+
+    def store_derived(self, items):
+        """Store ``(key, value)`` pairs; values are JSON-serializable."""
+        with self.conn:
+            self.conn.executemany("INSERT OR REPLACE INTO derived VALUES (?, ?)",
+                                  ((key, json.dumps(value)) for key, value in items))
+
+    def failure(self, host, now):
+        """``(error, seconds left)`` if ``host`` is backing off at ``now``, else None."""
+        row = self.conn.execute("SELECT error, until FROM failures WHERE host = ?", (host,)).fetchone()
+        if row is None or row[1] <= now:
+            return None
+        return row[0], row[1] - now
+
+    def record_failure(self, host, error, now, backoff, max_backoff):
+        row = self.conn.execute("SELECT failures FROM failures WHERE host = ?", (host,)).fetchone()
+        failures = (row[0] if row else 0) + 1
+        delay = min(max_backoff, backoff * 2 ** (failures - 1))
+        with self.conn:
+            self.conn.execute("INSERT OR REPLACE INTO failures VALUES (?, ?, ?, ?)",
+                              (host, error, failures, now + delay))
+        return delay
+
+    def clear_failure(self, host):
+        with self.conn:
+            self.conn.execute("DELETE FROM failures WHERE host = ?", (host,))
+
+    def close(self):
+        self.conn.close()
+
+
+class CachingWeb:
+    """Web client wrapper with conditional re-fetches and host backoff.
+
+    With a client that has ``request(url, timeout, headers)``
+    (:class:`engine.fetch.HTTPClient`) stored pages are revalidated;
+    with one that only has ``fetch`` pages are still hashed, which is what
+    :class:`Memoized` needs.
+    """
+
+    def __init__(self, client, cache, backoff=BACKOFF, max_backoff=MAX_BACKOFF, clock=time.time):
+        self.client = client
+        self.cache = cache
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.clock = clock
+        self.not_modified = 0
+        self.unchanged = 0
+        self.changed = 0
+        self.new = 0
+        self.failures = 0
+        self.skipped = 0
+
+    def __getattr__(self, name):
+        # Counters and close() go to the wrapped client.
+        return getattr(self.client, name)
+
+    def _failed(self, host, error):
+        self.failures += 1
+        self.cache.record_failure(host, error, self.clock(), self.backoff, self.max_backoff)
+
+    async def fetch(self, url, timeout=None, response_format="string"):
+        host = (urlsplit(url).hostname or "").lower()
+        failure = self.cache.failure(host, self.clock()) if host else None
+        if failure is not None:
+            self.skipped += 1
+            raise HostBackoff(host, *failure)
+        started = time.monotonic()
+        try:
+            body = await self._fetch(url, timeout, response_format)
+        except asyncio.CancelledError:
+            # The HTTP Request node's own timeout cancels the fetch.
+            if host and timeout and time.monotonic() - started >= timeout:
+                self._failed(host, f"timeout of {timeout}s exceeded")
+            raise
+        except (OSError, asyncio.TimeoutError) as e:
+            if host:
+                self._failed(host, str(e) or type(e).__name__)
+            raise
+        except HTTPError as e:
+            if host and e.status >= 500:
+                self._failed(host, str(e))
+            raise
+        if host:
+            self.cache.clear_failure(host)
+        return body
+
+    def _store(self, url, headers, body):
+        digest = content_hash(body)
+        stored = self.cache.page(url)
+        if stored is None:
+            self.new += 1
+        elif stored[2] == digest:
+            self.unchanged += 1
+        else:
+            self.changed += 1
+        self.cache.store_page(url, headers, body, digest)
+
+    async def _fetch(self, url, timeout, response_format):
+        request = getattr(self.client, "request", None)
+        if request is None:
+            body = await self.client.fetch(url, timeout, response_format)
+            if isinstance(body, (str, bytes)):
+                self._store(url, {}, body)
+            return body
+        stored = self.cache.page(url)
+        conditions = {}
+        if stored is not None:
+            if "etag" in stored[0]:
+                conditions["If-None-Match"] = stored[0]["etag"]
+            if "last-modified" in stored[0]:
+                conditions["If-Modified-Since"] = stored[0]["last-modified"]
+        response = await request(url, timeout, conditions)
+        if response.status == 304 and stored is not None:
+            self.not_modified += 1
+            response = Response(response.url, 200, "OK", stored[0], stored[1], False)
+        elif response.status >= 400:
+            raise HTTPError(response.status, response.reason, response.url)
+        else:
+            headers = {name: response.headers[name] for name in STORED_HEADERS if name in response.headers}
+            self._store(url, headers, response.body)
+        return response.content(response_format)
+
+    def snapshot(self):
+        return {
+            "not_modified": self.not_modified,
+            "unchanged": self.unchanged,
+            "changed": self.changed,
+            "new": self.new,
+            "failures": self.failures,
+            "skipped": self.skipped,
+        }
+
+
+def _describe(port):
+    """Stable name of a port and its bound arguments, to key its results."""
+    if isinstance(port, functools.partial):
+        arguments = ",".join(f"{name}={value!r}" for name, value in sorted(port.keywords.items()))
+        return f"{_describe(port.func)}({arguments})"
+    if hasattr(port, "port"):
+        # A wrapper such as engine.singleflight.Shared: same results as its port.
+        return _describe(port.port)
+    return f"{port.__module__}.{port.__qualname__}"
+
+
+class Memoized:
+    """Batch Code port wrapper reusing results for pages seen before.
+
+    ``port`` turns the page in ``field`` into other fields (Clean Data).
+    What it changed is stored under the page's content hash and the port's
+    name and arguments. :meth:`engine.runner.Run.run_batch` only hands the
+    misses to ``port``; calling the wrapper directly works too.
+    """
+
+    batch = True
+
+    def __init__(self, port, cache, field="data", variant=None):
+        self.port = port
+        self.cache = cache
+        self.field = field
+        self.variant = variant or _describe(port)
+        self.hits = 0
+        self.misses = 0
+
+    def _key(self, data):
+        page = data.get(self.field)
+        if not isinstance(page, (str, bytes)) or not page:
+            return None
+        return f"{content_hash(page)}:{self.variant}"
+
+    def lookup(self, batch):
+        """Results for the items already seen; None for the others."""
+        results = []
+        for data in batch:
+            key = self._key(data)
+            change = self.cache.derived(key) if key is not None else None
+            if change is None:
+                self.misses += 1
+                results.append(None)
+                continue
+            self.hits += 1
+            results.append(apply_changes(data, change))
+        return results
+
+    def store(self, batch, results):
+        changes = []
+        for data, result in zip(batch, results):
+            key = self._key(data)
+            if key is not None:
+                changes.append((key, json_changes(data, result)))
+        self.cache.store_derived(changes)
+
+    def __call__(self, batch):
+        results = self.lookup(batch)
+        missing = [index for index, result in enumerate(results) if result is None]
+        computed = self.port([batch[index] for index in missing]) if missing else []
+        for index, result in zip(missing, computed):
+            results[index] = result
+        self.store([batch[index] for index in missing], computed)
+        return results
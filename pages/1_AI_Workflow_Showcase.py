@@ -1,6 +1,7 @@
 import streamlit as st
 import json
-import os
+
+from showcase import catalog, downloads, images, theme
 
 # Page configuration
 st.set_page_config(
@@ -10,98 +11,19 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
-# Custom CSS for better styling
-st.markdown("""
-<style>
-    .main-header {
-        text-align: center;
-        padding: 2rem 0;
-        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-        color: white;
-        border-radius: 10px;
-        margin-bottom: 2rem;
-    }
-    .workflow-card {
-        background: white;
-        padding: 2rem;
-        border-radius: 15px;
-        box-shadow: 0 4px 6px rgba(0, 0, 0, 0.1);
-        margin: 1rem 0;
-    }
-    .workflow-title {
-        color: #2c3e50;
-        font-size: 1.8rem;
-        font-weight: bold;
-        margin-bottom: 1rem;
-    }
-    .description-box {
-        background: #f8f9fa;
-        padding: 1.5rem;
-        border-radius: 10px;
-        border-left: 4px solid #667eea;
-        margin: 1rem 0;
-    }
-    .description-title {
-        color: #667eea;
-        font-weight: bold;
-        font-size: 1.2rem;
-        margin-bottom: 0.5rem;
-    }
-    .description-content {
-        color: #495057;
-        line-height: 1.8;
-        white-space: pre-line;
-    }
-    .image-container {
-        text-align: center;
-        padding: 2rem;
-        background: #f8f9fa;
-        border-radius: 10px;
-        margin: 1rem 0;
-    }
-    .download-section {
-        text-align: center;
-        padding: 2rem;
-        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-        border-radius: 10px;
-        margin: 2rem 0;
-    }
-    .stDownloadButton button {
-        background-color: white !important;
-        color: #667eea !important;
-        font-weight: bold !important;
-        padding: 0.75rem 2rem !important;
-        border-radius: 25px !important;
-        border: 2px solid white !important;
-        font-size: 1.1rem !important;
-    }
-    .stDownloadButton button:hover {
-        background-color: #f8f9fa !important;
-        transform: scale(1.05);
-        transition: all 0.3s ease;
-    }
-</style>
-""", unsafe_allow_html=True)
+# Shared theme (showcase/theme.css)
+theme.apply()
 
 # Load workflow data
 def load_workflow_data():
-    workflow_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), "workflow.json")
-    if not os.path.exists(workflow_path):
-        st.warning("⚠️ workflow.json not found in the parent directory.")
-        return {"name": "Untitled Workflow", "nodes": [], "id": "N/A", "active": False, "versionId": "N/A"}
     try:
-        with open(workflow_path, 'r', encoding='utf-8') as f:
-            return json.load(f)
+        return catalog.load_workflow("workflow.json")
+    except FileNotFoundError:
+        st.warning("⚠️ workflow.json not found in the parent directory.")
+        return catalog.placeholder("Untitled Workflow")
     except json.JSONDecodeError as e:
         st.error(f"❌ Error parsing workflow.json: {e}")
-        return {"name": "Untitled Workflow", "nodes": [], "id": "N/A", "active": False, "versionId": "N/A"}
-
-def extract_description(workflow_data):
-    """Extract description from Sticky Note node"""
-    for node in workflow_data.get('nodes', []):
-        if node.get('type') == 'n8n-nodes-base.stickyNote' and 'content' in node.get('parameters', {}):
-            return node['parameters']['content']
-    return "No description provided."
+        return catalog.placeholder("Untitled Workflow")
 
 # Main app
 def main():
@@ -114,9 +36,9 @@ def main():
     """, unsafe_allow_html=True)
     
     # Load workflow
-    workflow_data = load_workflow_data()
-    workflow_name = workflow_data.get('name', 'Untitled Workflow')
-    description = extract_description(workflow_data)
+    workflow = load_workflow_data()
+    workflow_name = workflow.name or 'Untitled Workflow'
+    description = workflow.description
     
     # Workflow card
     st.markdown('<div class="workflow-card">', unsafe_allow_html=True)
@@ -133,10 +55,7 @@ def main():
         st.markdown("### 🤖 AI Employee Automation")
         
         # Check if product image exists
-        image_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), "streamlit_app", "product_image.webp")
-        if os.path.exists(image_path):
-            st.image(image_path, use_column_width=True, caption="AI-Powered Workflow Automation")
-        else:
+        if not images.show_image("streamlit_app/product_image.webp", caption="AI-Powered Workflow Automation"):
             st.info("🖼️ Product image will be displayed here")
         
         st.markdown('</div>', unsafe_allow_html=True)
@@ -160,20 +79,20 @@ def main():
     st.markdown("---")
     st.markdown("### 📊 Workflow Statistics")
     
+    stats = workflow.stats(8)
     col_stat1, col_stat2, col_stat3, col_stat4 = st.columns(4)
     
     with col_stat1:
-        st.metric("Total Nodes", len(workflow_data.get('nodes', [])))
+        st.metric("Total Nodes", stats.node_count)
     
     with col_stat2:
-        st.metric("Workflow ID", workflow_data.get('id', 'N/A')[:8] + "...")
+        st.metric("Workflow ID", stats.workflow_id)
     
     with col_stat3:
-        active_status = "Active" if workflow_data.get('active', False) else "Inactive"
-        st.metric("Status", active_status)
+        st.metric("Status", stats.status)
     
     with col_stat4:
-        st.metric("Version", workflow_data.get('versionId', 'N/A')[:8] + "...")
+        st.metric("Version", stats.version)
     
     # Download section
     st.markdown("---")
@@ -181,18 +100,9 @@ def main():
     st.markdown("### 📥 Download Workflow")
     st.markdown("Click the button below to download the complete workflow JSON file and import it into your n8n instance", unsafe_allow_html=True)
     
-    # Create download button
-    workflow_json = json.dumps(workflow_data, indent=2)
-    
     col_download1, col_download2, col_download3 = st.columns([1, 2, 1])
     with col_download2:
-        st.download_button(
-            label="⬇️ Download Workflow JSON",
-            data=workflow_json,
-            file_name=f"{workflow_name.replace(' ', '_')}.json",
-            mime="application/json",
-            use_column_width=True
-        )
+        downloads.download_buttons(workflow, workflow_name, use_container_width=True)
     
     st.markdown('</div>', unsafe_allow_html=True)
     
@@ -1,6 +1,6 @@
 import streamlit as st
-import json
-import os
+
+from showcase import catalog, downloads, fragments, images, theme
 
 # Page configuration
 st.set_page_config(
@@ -10,84 +10,28 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
-# Custom CSS for better styling
-st.markdown("""
-<style>
-    .main-header {
-        text-align: center;
-        padding: 2rem 0;
-        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-        color: white;
-        border-radius: 10px;
-        margin-bottom: 2rem;
-    }
-    .workflow-card {
-        background: white;
-        padding: 2rem;
-        border-radius: 15px;
-        box-shadow: 0 4px 6px rgba(0, 0, 0, 0.1);
-        margin: 1rem 0;
-    }
-    .workflow-title {
-        color: #2c3e50;
-        font-size: 1.8rem;
-        font-weight: bold;
-        margin-bottom: 1rem;
-    }
-    .description-box {
-        background: #f8f9fa;
-        padding: 1.5rem;
-        border-radius: 10px;
-        border-left: 4px solid #667eea;
-        margin: 1rem 0;
-    }
-    .description-title {
-        color: #667eea;
-        font-weight: bold;
-        font-size: 1.2rem;
-        margin-bottom: 0.5rem;
-    }
-    .description-content {
-        color: #495057;
-        line-height: 1.8;
-        white-space: pre-line;
-    }
-    .image-container {
-        text-align: center;
-        padding: 2rem;
-        background: #f8f9fa;
-        border-radius: 10px;
-        margin: 1rem 0;
-    }
-    .download-section {
-        text-align: center;
-        padding: 2rem;
-        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-        border-radius: 10px;
-        margin: 2rem 0;
-    }
-    .stDownloadButton button {
-        background-color: white !important;
-        color: #667eea !important;
-        font-weight: bold !important;
-        padding: 0.75rem 2rem !important;
-        border-radius: 25px !important;
-        border: 2px solid white !important;
-        font-size: 1.1rem !important;
-    }
-    .stDownloadButton button:hover {
-        background-color: #f8f9fa !important;
-        transform: scale(1.05);
-        transition: all 0.3s ease;
-    }
-</style>
-""", unsafe_allow_html=True)
+# Shared theme (showcase/theme.css)
+theme.apply()
+
+# Static page content (rendered once by showcase.fragments)
+BENEFITS = (
+    ("📞 24/7 Availability", "Never miss a booking opportunity. AI handles calls and schedules appointments even outside business hours, across all time zones."),
+    ("🎯 Zero Double-Booking", "Intelligent conflict detection ensures your calendar stays organized. Automatic rescheduling suggestions when conflicts arise."),
+    ("📉 Reduce No-Shows", "Automated reminders via SMS and email reduce no-show rates by up to 70%. Keep your schedule full and productive."),
+)
+
+USE_CASES = (
+    ("Medical Practices", "Patient appointment scheduling, reminder calls, rescheduling management, waitlist automation"),
+    ("Sales Teams", "Demo scheduling, prospect calls, follow-up automation, meeting coordination"),
+    ("Service Businesses", "Client bookings, consultation scheduling, service appointments, capacity management"),
+    ("Consultants", "Client meetings, discovery calls, project kickoffs, availability management"),
+    ("Real Estate", "Property viewings, client consultations, open house scheduling, follow-up calls"),
+    ("Legal Services", "Client consultations, court date management, case review scheduling, intake calls"),
+)
 
 # Load workflow data
 def load_workflow_data():
-    workflow_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), "workflow_ai_phone_call.json")
-    with open(workflow_path, 'r') as f:
-        return json.load(f)
+    return catalog.load_workflow("workflow_ai_phone_call.json")
 
 # Main app
 def main():
@@ -100,8 +44,8 @@ def main():
     """, unsafe_allow_html=True)
     
     # Load workflow
-    workflow_data = load_workflow_data()
-    workflow_name = workflow_data.get('name', 'AI Phone Call Assistant')
+    workflow = load_workflow_data()
+    workflow_name = workflow.name or 'AI Phone Call Assistant'
     
     # Workflow card
     st.markdown('<div class="workflow-card">', unsafe_allow_html=True)
@@ -117,10 +61,7 @@ def main():
         st.markdown('<div class="image-container">', unsafe_allow_html=True)
         st.markdown("### 📞 AI Phone Automation")
         
-        image_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), "streamlit_app", "ai_phone_call.png")
-        if os.path.exists(image_path):
-            st.image(image_path, use_column_width=True, caption="AI Phone Call - Calendar Booking Assistant")
-        else:
+        if not images.show_image("streamlit_app/ai_phone_call.png", caption="AI Phone Call - Calendar Booking Assistant"):
             st.info("🖼️ Product image will be displayed here")
         
         st.markdown('</div>', unsafe_allow_html=True)
@@ -151,76 +92,32 @@ def main():
     st.markdown("---")
     st.markdown("### 💡 Business Benefits")
     
-    col_benefit1, col_benefit2, col_benefit3 = st.columns(3)
-    
-    with col_benefit1:
-        st.markdown("""
-        <div class="description-box">
-            <h4>📞 24/7 Availability</h4>
-            <p>Never miss a booking opportunity. AI handles calls and schedules appointments even outside business hours, across all time zones.</p>
-        </div>
-        """, unsafe_allow_html=True)
-    
-    with col_benefit2:
-        st.markdown("""
-        <div class="description-box">
-            <h4>🎯 Zero Double-Booking</h4>
-            <p>Intelligent conflict detection ensures your calendar stays organized. Automatic rescheduling suggestions when conflicts arise.</p>
-        </div>
-        """, unsafe_allow_html=True)
-    
-    with col_benefit3:
-        st.markdown("""
-        <div class="description-box">
-            <h4>📉 Reduce No-Shows</h4>
-            <p>Automated reminders via SMS and email reduce no-show rates by up to 70%. Keep your schedule full and productive.</p>
-        </div>
-        """, unsafe_allow_html=True)
+    st.markdown(fragments.benefit_cards(BENEFITS), unsafe_allow_html=True)
 
     # Use Cases section
     st.markdown("---")
     st.markdown("### 🎯 Perfect For")
     
-    use_cases = [
-        ("Medical Practices", "Patient appointment scheduling, reminder calls, rescheduling management, waitlist automation"),
-        ("Sales Teams", "Demo scheduling, prospect calls, follow-up automation, meeting coordination"),
-        ("Service Businesses", "Client bookings, consultation scheduling, service appointments, capacity management"),
-        ("Consultants", "Client meetings, discovery calls, project kickoffs, availability management"),
-        ("Real Estate", "Property viewings, client consultations, open house scheduling, follow-up calls"),
-        ("Legal Services", "Client consultations, court date management, case review scheduling, intake calls")
-    ]
-    
-    for i in range(0, len(use_cases), 2):
-        cols = st.columns(2)
-        for j, col in enumerate(cols):
-            if i + j < len(use_cases):
-                title, desc = use_cases[i + j]
-                with col:
-                    st.markdown(f"""
-                    <div class="description-box">
-                        <div class="description-title">✓ {title}</div>
-                        <div class="description-content">{desc}</div>
-                    </div>
-                    """, unsafe_allow_html=True)
+    st.markdown(fragments.checklist_grid(USE_CASES), unsafe_allow_html=True)
     
     # Workflow statistics
     st.markdown("---")
     st.markdown("### 📊 Workflow Statistics")
     
+    stats = workflow.stats(20, version_suffix="")
     col_stat1, col_stat2, col_stat3, col_stat4 = st.columns(4)
     
     with col_stat1:
-        st.metric("Total Nodes", len(workflow_data.get('nodes', [])))
+        st.metric("Total Nodes", stats.node_count)
     
     with col_stat2:
-        st.metric("Workflow ID", workflow_data.get('id', 'N/A')[:20] + "...")
+        st.metric("Workflow ID", stats.workflow_id)
     
     with col_stat3:
-        active_status = "Active" if workflow_data.get('active', False) else "Inactive"
-        st.metric("Status", active_status)
+        st.metric("Status", stats.status)
     
     with col_stat4:
-        st.metric("Version", workflow_data.get('versionId', 'N/A')[:20])
+        st.metric("Version", stats.version)
     
     # Download section
     st.markdown("---")
@@ -228,18 +125,9 @@ def main():
     st.markdown("### 📥 Download Workflow")
     st.markdown("Click the button below to download the complete workflow JSON file and import it into your n8n instance", unsafe_allow_html=True)
     
-    # Create download button
-    workflow_json = json.dumps(workflow_data, indent=2)
-    
     col_download1, col_download2, col_download3 = st.columns([1, 2, 1])
     with col_download2:
-        st.download_button(
-            label="⬇️ Download Workflow JSON",
-            data=workflow_json,
-            file_name=f"{workflow_name.replace(' ', '_')}.json",
-            mime="application/json",
-            use_container_width=True
-        )
+        downloads.download_buttons(workflow, workflow_name, use_container_width=True)
     
     st.markdown('</div>', unsafe_allow_html=True)
     
@@ -1,6 +1,6 @@
 import streamlit as st
-import json
-import os
+
+from showcase import catalog, downloads, fragments, images, theme
 
 # Page configuration
 st.set_page_config(
@@ -10,84 +10,30 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
-# Custom CSS for better styling
-st.markdown("""
-<style>
-    .main-header {
-        text-align: center;
-        padding: 2rem 0;
-        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-        color: white;
-        border-radius: 10px;
-        margin-bottom: 2rem;
-    }
-    .workflow-card {
-        background: white;
-        padding: 2rem;
-        border-radius: 15px;
-        box-shadow: 0 4px 6px rgba(0, 0, 0, 0.1);
-        margin: 1rem 0;
-    }
-    .workflow-title {
-        color: #2c3e50;
-        font-size: 1.8rem;
-        font-weight: bold;
-        margin-bottom: 1rem;
-    }
-    .description-box {
-        background: #f8f9fa;
-        padding: 1.5rem;
-        border-radius: 10px;
-        border-left: 4px solid #667eea;
-        margin: 1rem 0;
-    }
-    .description-title {
-        color: #667eea;
-        font-weight: bold;
-        font-size: 1.2rem;
-        margin-bottom: 0.5rem;
-    }
-    .description-content {
-        color: #495057;
-        line-height: 1.8;
-        white-space: pre-line;
-    }
-    .image-container {
-        text-align: center;
-        padding: 2rem;
-        background: #f8f9fa;
-        border-radius: 10px;
-        margin: 1rem 0;
-    }
-    .download-section {
-        text-align: center;
-        padding: 2rem;
-        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-        border-radius: 10px;
-        margin: 2rem 0;
-    }
-    .stDownloadButton button {
-        background-color: white !important;
-        color: #667eea !important;
-        font-weight: bold !important;
-        padding: 0.75rem 2rem !important;
-        border-radius: 25px !important;
-        border: 2px solid white !important;
-        font-size: 1.1rem !important;
-    }
-    .stDownloadButton button:hover {
-        background-color: #f8f9fa !important;
-        transform: scale(1.05);
-        transition: all 0.3s ease;
-    }
-</style>
-""", unsafe_allow_html=True)
+# Shared theme (showcase/theme.css)
+theme.apply()
+
+# Static page content (rendered once by showcase.fragments)
+BENEFITS = (
+    ("🚀 Consistent Presence", "Maintain active social media presence 24/7. Never go dark on social platforms with automated, scheduled content delivery."),
+    ("📊 Data-Driven Content", "AI analyzes engagement patterns and optimizes content for maximum reach. Post at the perfect time for your audience."),
+    ("💰 Cost Effective", "Replace expensive social media agencies with intelligent automation. Save thousands while maintaining professional quality."),
+)
+
+PLATFORMS = (
+    ("Facebook", "Posts, stories, reels, groups, business pages, marketplace listings"),
+    ("Instagram", "Feed posts, stories, reels, IGTV, carousel posts, shopping tags"),
+    ("LinkedIn", "Company updates, articles, polls, document sharing, job postings"),
+    ("Twitter/X", "Tweets, threads, polls, spaces promotion, trending hashtags"),
+    ("TikTok", "Video posts, duets, stitches, trending sounds, hashtag challenges"),
+    ("YouTube", "Video uploads, shorts, community posts, premiere scheduling"),
+    ("Pinterest", "Pins, boards, idea pins, shopping catalogs, trend analysis"),
+    ("Reddit", "Subreddit posts, comments, community engagement, AMA scheduling"),
+)
 
 # Load workflow data
 def load_workflow_data():
-    workflow_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), "workflow_ai_social_content.json")
-    with open(workflow_path, 'r') as f:
-        return json.load(f)
+    return catalog.load_workflow("workflow_ai_social_content.json")
 
 # Main app
 def main():
@@ -100,8 +46,8 @@ def main():
     """, unsafe_allow_html=True)
     
     # Load workflow
-    workflow_data = load_workflow_data()
-    workflow_name = workflow_data.get('name', 'AI Social Content Creation')
+    workflow = load_workflow_data()
+    workflow_name = workflow.name or 'AI Social Content Creation'
     
     # Workflow card
     st.markdown('<div class="workflow-card">', unsafe_allow_html=True)
@@ -117,10 +63,7 @@ def main():
         st.markdown('<div class="image-container">', unsafe_allow_html=True)
         st.markdown("### 📱 Social Media Automation")
         
-        image_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), "streamlit_app", "ai_social_content.png")
-        if os.path.exists(image_path):
-            st.image(image_path, use_column_width=True, caption="AI Social Content Creation - Automate Your Social Media")
-        else:
+        if not images.show_image("streamlit_app/ai_social_content.png", caption="AI Social Content Creation - Automate Your Social Media"):
             st.info("🖼️ Product image will be displayed here")
         
         st.markdown('</div>', unsafe_allow_html=True)
@@ -151,78 +94,32 @@ def main():
     st.markdown("---")
     st.markdown("### 💡 Business Benefits")
     
-    col_benefit1, col_benefit2, col_benefit3 = st.columns(3)
-    
-    with col_benefit1:
-        st.markdown("""
-        <div class="description-box">
-            <h4>🚀 Consistent Presence</h4>
-            <p>Maintain active social media presence 24/7. Never go dark on social platforms with automated, scheduled content delivery.</p>
-        </div>
-        """, unsafe_allow_html=True)
-    
-    with col_benefit2:
-        st.markdown("""
-        <div class="description-box">
-            <h4>📊 Data-Driven Content</h4>
-            <p>AI analyzes engagement patterns and optimizes content for maximum reach. Post at the perfect time for your audience.</p>
-        </div>
-        """, unsafe_allow_html=True)
-    
-    with col_benefit3:
-        st.markdown("""
-        <div class="description-box">
-            <h4>💰 Cost Effective</h4>
-            <p>Replace expensive social media agencies with intelligent automation. Save thousands while maintaining professional quality.</p>
-        </div>
-        """, unsafe_allow_html=True)
+    st.markdown(fragments.benefit_cards(BENEFITS), unsafe_allow_html=True)
 
     # Supported Platforms section
     st.markdown("---")
     st.markdown("### 🌐 Supported Platforms")
     
-    platforms = [
-        ("Facebook", "Posts, stories, reels, groups, business pages, marketplace listings"),
-        ("Instagram", "Feed posts, stories, reels, IGTV, carousel posts, shopping tags"),
-        ("LinkedIn", "Company updates, articles, polls, document sharing, job postings"),
-        ("Twitter/X", "Tweets, threads, polls, spaces promotion, trending hashtags"),
-        ("TikTok", "Video posts, duets, stitches, trending sounds, hashtag challenges"),
-        ("YouTube", "Video uploads, shorts, community posts, premiere scheduling"),
-        ("Pinterest", "Pins, boards, idea pins, shopping catalogs, trend analysis"),
-        ("Reddit", "Subreddit posts, comments, community engagement, AMA scheduling")
-    ]
-    
-    for i in range(0, len(platforms), 2):
-        cols = st.columns(2)
-        for j, col in enumerate(cols):
-            if i + j < len(platforms):
-                title, desc = platforms[i + j]
-                with col:
-                    st.markdown(f"""
-                    <div class="description-box">
-                        <div class="description-title">✓ {title}</div>
-                        <div class="description-content">{desc}</div>
-                    </div>
-                    """, unsafe_allow_html=True)
+    st.markdown(fragments.checklist_grid(PLATFORMS), unsafe_allow_html=True)
 
     # Workflow statistics
     st.markdown("---")
     st.markdown("### 📊 Workflow Statistics")
     
+    stats = workflow.stats(20, version_suffix="")
     col_stat1, col_stat2, col_stat3, col_stat4 = st.columns(4)
     
     with col_stat1:
-        st.metric("Total Nodes", len(workflow_data.get('nodes', [])))
+        st.metric("Total Nodes", stats.node_count)
     
     with col_stat2:
-        st.metric("Workflow ID", workflow_data.get('id', 'N/A')[:20] + "...")
+        st.metric("Workflow ID", stats.workflow_id)
     
     with col_stat3:
-        active_status = "Active" if workflow_data.get('active', False) else "Inactive"
-        st.metric("Status", active_status)
+        st.metric("Status", stats.status)
     
     with col_stat4:
-        st.metric("Version", workflow_data.get('versionId', 'N/A')[:20])
+        st.metric("Version", stats.version)
     
     # Download section
     st.markdown("---")
@@ -230,18 +127,9 @@ def main():
     st.markdown("### 📥 Download Workflow")
     st.markdown("Click the button below to download the complete workflow JSON file and import it into your n8n instance", unsafe_allow_html=True)
     
-    # Create download button
-    workflow_json = json.dumps(workflow_data, indent=2)
-    
     col_download1, col_download2, col_download3 = st.columns([1, 2, 1])
     with col_download2:
-        st.download_button(
-            label="⬇️ Download Workflow JSON",
-            data=workflow_json,
-            file_name=f"{workflow_name.replace(' ', '_')}.json",
-            mime="application/json",
-            use_container_width=True
-        )
+        downloads.download_buttons(workflow, workflow_name, use_container_width=True)
     
     st.markdown('</div>', unsafe_allow_html=True)
     
@@ -1,15 +1,171 @@
+"""Extract the name and description of n8n workflow exports.
+
+Each input is a file, a directory (every ``*.json`` inside it) or a glob
+pattern. Files are parsed in parallel across a process pool and one details
+record per workflow is written to a single combined output file. A state file
+next to the output remembers each input's content hash, so unchanged files
+are not parsed again on the next run. A file that fails to parse keeps the
+record of its last good parse. The output and state files are never read as
+inputs, even when they sit in an input directory.
+
+Only the workflow name and the first "Sticky Note" are read, with a streaming
+scan that stops once it has them, so memory stays flat however large the
+export's nodes or pinData are.
+
+Usage:
+    python process_workflow.py [inputs ...] [-o OUTPUT] [-j JOBS] [--force]
+"""
+import argparse
+import glob
+import hashlib
 import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from showcase.jsonstream import scan_workflow
+
+DEFAULT_INPUT = "/home/ubuntu/upload/pasted_content.txt"
+DEFAULT_OUTPUT = "streamlit_app/workflow_details.txt"
+RECORD_SEPARATOR = "\n\n---\n\n"
+
+
+def is_sticky_note(node):
+    return node.get("name") == "Sticky Note"
+
+
+def extract_details(path):
+    """Return the workflow name and the content of its "Sticky Note" node."""
+    header = scan_workflow(path, predicate=is_sticky_note)
+    description = header["description"]
+    return {
+        "name": header.get("name", "Untitled Workflow"),
+        "description": "No description provided." if description is None else description,
+    }
+
+
+def file_digest(path):
+    digest = hashlib.sha256()
+    size = 0
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+            size += len(chunk)
+    return digest.hexdigest(), size
+
+
+def process_file(task):
+    """Worker: hash ``path`` and parse it unless the hash matches ``known``.
+
+    Returns ``(path, digest, size, details, error)``; ``details`` is ``None``
+    when the file is unchanged or failed to parse.
+    """
+    path, known = task
+    try:
+        digest, size = file_digest(path)
+        if digest == known:
+            return path, digest, size, None, None
+        return path, digest, size, extract_details(path), None
+    except OSError as e:
+        return path, None, 0, None, str(e)
+    except ValueError as e:
+        return path, digest, size, None, f"invalid workflow JSON: {e}"
+
+
+def expand_inputs(inputs):
+    """Resolve files, directories and glob patterns to a sorted list of files."""
+    paths = set()
+    for item in inputs:
+        if os.path.isdir(item):
+            matches = glob.glob(os.path.join(item, "*.json"))
+        elif os.path.exists(item):
+            matches = [item]
+        else:
+            matches = glob.glob(item, recursive=True)
+            if not matches:
+                print(f"warning: no files match {item}", file=sys.stderr)
+        paths.update(os.path.abspath(p) for p in matches if os.path.isfile(p))
+    return sorted(paths)
+
+
+def load_state(path):
+    if not os.path.exists(path):
+        return {}
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def write_output(output, records, with_source):
+    parts = []
+    for path, details in records:
+        lines = [f"File: {os.path.relpath(path)}"] if with_source else []
+        lines.append(f"Name: {details['name']}")
+        lines.append(f"Description: {details['description']}")
+        parts.append("\n".join(lines))
+    with open(output, "w") as f:
+        f.write(RECORD_SEPARATOR.join(parts))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Write name/description details for n8n workflow exports.")
+    parser.add_argument("inputs", nargs="*", default=[DEFAULT_INPUT],
+                        help="workflow files, directories or glob patterns (default: %(default)s)")
+    parser.add_argument("-o", "--output", default=DEFAULT_OUTPUT, help="combined details file (default: %(default)s)")
+    parser.add_argument("-j", "--jobs", type=int, default=os.cpu_count(), help="worker processes (default: CPU count)")
+    parser.add_argument("--state", help="hash state file (default: OUTPUT.state.json)")
+    parser.add_argument("--force", action="store_true", help="re-parse files even if their hash is unchanged")
+    args = parser.parse_args(argv)
+
+    state_path = args.state or args.output + ".state.json"
+    state = {} if args.force else load_state(state_path)
+    # The output and state files may sit inside an input directory; they are not workflows.
+    own_files = {os.path.abspath(args.output), os.path.abspath(state_path)}
+    paths = [path for path in expand_inputs(args.inputs) if path not in own_files]
+    if not paths:
+        parser.error("no input files found")
+
+    tasks = [(path, state.get(path, {}).get("sha256")) for path in paths]
+    started = time.perf_counter()
+    new_state = {}
+    changed = unchanged = failed = total_bytes = 0
+    jobs = max(1, min(args.jobs or 1, len(tasks)))
+    chunksize = max(1, len(tasks) // (jobs * 4))
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        for path, digest, size, details, error in pool.map(process_file, tasks, chunksize=chunksize):
+            total_bytes += size
+            if error:
+                failed += 1
+                if path in state:
+                    # Keep the last good record rather than dropping it from the output.
+                    new_state[path] = state[path]
+                    error += "; keeping its previous record"
+                print(f"error: {path}: {error}", file=sys.stderr)
+            elif details is None:
+                unchanged += 1
+                new_state[path] = state[path]
+            else:
+                changed += 1
+                new_state[path] = {"sha256": digest, "details": details}
+    elapsed = time.perf_counter() - started
+
+    records = [(path, new_state[path]["details"]) for path in paths if path in new_state]
+    output_dir = os.path.dirname(args.output)
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
+    write_output(args.output, records, with_source=len(paths) > 1)
+    with open(state_path, "w", encoding="utf-8") as f:
+        json.dump(new_state, f, indent=2)
 
-with open("/home/ubuntu/upload/pasted_content.txt", "r") as f:
-    workflow_data = json.load(f)
+    rate = len(paths) / elapsed if elapsed else float("inf")
+    print(
+        f"Processed {len(paths)} files ({changed} parsed, {unchanged} unchanged, {failed} failed) "
+        f"in {elapsed:.2f}s with {jobs} workers: {rate:.1f} files/s, "
+        f"{total_bytes / (1 << 20) / elapsed if elapsed else 0:.1f} MiB/s",
+        file=sys.stderr,
+    )
+    return 1 if failed else 0
 
-workflow_name = workflow_data.get("name", "Untitled Workflow")
-description = "No description provided."
-for node in workflow_data.get("nodes", []):
-    if node.get("name") == "Sticky Note" and "content" in node.get("parameters", {}):
-        description = node["parameters"]["content"]
-        break
 
-with open("streamlit_app/workflow_details.txt", "w") as f:
-    f.write(f"Name: {workflow_name}\n")
-    f.write(f"Description: {description}")
+if __name__ == "__main__":
+    sys.exit(main())
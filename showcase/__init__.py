@@ -0,0 +1 @@
+"""Shared helpers for the AI Employee Showcase pages."""
@@ -0,0 +1,120 @@
+"""Pick pre-built image variants for the pages.
+
+``build_assets.py`` writes WebP/AVIF variants of each image at several widths
+plus a manifest describing them. The pages ask for an image by its original
+path and get back the smallest variant that is at least as wide as the slot
+it is shown in. Without a manifest (or for an image not listed in it) the
+original file is returned, so the pages keep working before the build step
+has been run.
+
+``build_assets.py`` also publishes content-hashed copies to ``static/``;
+:func:`static_image` describes those so :mod:`showcase.images` can emit a
+plain ``<img>`` that browsers cache instead of sending bytes per session.
+"""
+import json
+import os
+import threading
+
+from showcase.catalog import ROOT_DIR
+
+MANIFEST_PATH = os.path.join(ROOT_DIR, "streamlit_app", "variants", "manifest.json")
+
+# Base URL of the published static/ directory. Streamlit serves it at
+# app/static/ when server.enableStaticServing is on; point this at a CDN or
+# reverse proxy to serve the same files from there.
+STATIC_URL = os.environ.get("SHOWCASE_STATIC_URL", "app/static").rstrip("/")
+
+# Rendered widths, in device pixels, of the slots the pages use with
+# ``use_column_width=True`` on the wide layout: half a column on the workflow
+# pages, the full main area on Home. Sized for 1.5x displays.
+COLUMN_WIDTH = 960
+FULL_WIDTH = 1920
+
+# ``st.image`` serves files with a mimetype guessed from the extension and
+# every browser Streamlit supports can decode WebP.
+DEFAULT_FORMATS = ("webp",)
+
+_manifest = (None, {})
+_lock = threading.Lock()
+
+
+def load_manifest():
+    """Return the asset manifest, re-reading it only when it changes on disk."""
+    global _manifest
+    try:
+        st_ = os.stat(MANIFEST_PATH)
+    except FileNotFoundError:
+        return {}
+    signature = (st_.st_mtime_ns, st_.st_size)
+    if _manifest[0] == signature:
+        return _manifest[1]
+    with _lock:
+        if _manifest[0] != signature:
+            with open(MANIFEST_PATH, "r", encoding="utf-8") as f:
+                _manifest = (signature, json.load(f).get("assets", {}))
+        return _manifest[1]
+
+
+def select_variant(entry, width, formats=DEFAULT_FORMATS):
+    """Return the manifest variant of ``entry`` best suited to ``width`` pixels."""
+    for fmt in formats:
+        candidates = sorted((v for v in entry.get("variants", []) if v["format"] == fmt), key=lambda v: v["width"])
+        if not candidates:
+            continue
+        for variant in candidates:
+            if variant["width"] >= width:
+                return variant
+        return candidates[-1]
+    return None
+
+
+def image_variant(name, width=COLUMN_WIDTH, formats=DEFAULT_FORMATS):
+    """Absolute path of the variant of ``name`` to display at ``width`` pixels.
+
+    ``name`` is the original image path relative to the repository root,
+    e.g. ``"streamlit_app/government_grants.png"``.
+    """
+    entry = load_manifest().get(name)
+    if entry:
+        variant = select_variant(entry, width, formats)
+        if variant is not None:
+            path = os.path.join(ROOT_DIR, variant["path"])
+            if os.path.exists(path):
+                return path
+    return os.path.join(ROOT_DIR, name)
+
+
+def static_url(item):
+    """URL of a published manifest item (an asset or one of its variants).
+
+    The ``v`` query argument makes Streamlit's static handler (a Tornado
+    ``StaticFileHandler``) answer with a ten-year ``Cache-Control`` max-age;
+    the hashed file name alone keeps the URL unique per content.
+    """
+    return f"{STATIC_URL}/{item['static']}?v={item['sha256'][:12]}"
+
+
+def static_image(name, width=COLUMN_WIDTH, formats=DEFAULT_FORMATS):
+    """Describe the published copy of ``name`` for an ``<img>`` tag.
+
+    Returns a dict with ``src`` (the variant for ``width``), ``srcset`` (every
+    published variant of the first matching format), ``width`` and ``height``,
+    or ``None`` if the asset has not been published to ``static/``.
+    """
+    entry = load_manifest().get(name)
+    if not entry or "static" not in entry:
+        return None
+    for fmt in formats:
+        published = sorted(
+            (v for v in entry["variants"] if v["format"] == fmt and "static" in v),
+            key=lambda v: v["width"],
+        )
+        if published:
+            chosen = select_variant({"variants": published}, width, (fmt,))
+            return {
+                "src": static_url(chosen),
+                "srcset": ", ".join(f"{static_url(v)} {v['width']}w" for v in published),
+                "width": chosen["width"],
+                "height": chosen["height"],
+            }
+    return {"src": static_url(entry), "srcset": "", "width": entry["width"], "height": entry["height"]}
@@ -0,0 +1,187 @@
+"""Process-wide catalog of the workflows shown by the pages.
+
+Streamlit re-executes a page script on every widget interaction, but imported
+modules stay loaded for the life of the server process. Entries kept here are
+shared by every session and revalidated with a ``stat`` when the file's
+mtime/size change.
+
+The header, description and statistics come from the persistent workflow
+index (see :mod:`showcase.index`), so rendering a page never reads the
+workflow file itself. The full document is only parsed when it is actually
+downloaded. Serialized download payloads are cached per content hash.
+"""
+import gzip
+import os
+import threading
+
+from showcase import index, jsonio
+from showcase.index import ROOT_DIR
+from showcase.jsonstream import STICKY_NOTE_TYPE
+
+NO_DESCRIPTION = "No description provided."
+# Exports above this size are serialized on request and also offered as a
+# minified, gzip-compressed download.
+LARGE_EXPORT_BYTES = 1 << 20
+
+_entries = {}
+_payloads = {}
+_lock = threading.Lock()
+
+
+def extract_description(workflow_data):
+    """Extract description from Sticky Note node"""
+    for node in workflow_data.get('nodes', []):
+        if node.get('type') == STICKY_NOTE_TYPE and 'content' in node.get('parameters', {}):
+            return node['parameters']['content']
+    return NO_DESCRIPTION
+
+
+class WorkflowStats:
+    """Values shown in the "Workflow Statistics" block of a page."""
+
+    __slots__ = ("node_count", "workflow_id", "status", "version")
+
+    def __init__(self, node_count, workflow_id, status, version):
+        self.node_count = node_count
+        self.workflow_id = workflow_id
+        self.status = status
+        self.version = version
+
+
+class WorkflowEntry:
+    """A workflow file plus the values the pages derive from it.
+
+    ``header`` holds ``name``, ``id``, ``versionId``, ``active``,
+    ``description`` and ``node_count`` as returned by ``scan_workflow``.
+    """
+
+    def __init__(self, header, path=None, digest=None, size=0, data=None):
+        self.path = path
+        self.digest = digest
+        self.size = size
+        self._data = data
+        self.name = header.get('name')
+        description = header.get('description')
+        self.description = NO_DESCRIPTION if description is None else description
+        self.node_count = header.get('node_count', 0)
+        self.workflow_id = str(header.get('id', 'N/A'))
+        self.version_id = str(header.get('versionId', 'N/A'))
+        self.active = bool(header.get('active', False))
+        self.tags = header.get('tags', [])
+        self.node_types = header.get('node_types', [])
+        self._stats = {}
+        self._payloads = {}
+
+    @classmethod
+    def from_data(cls, data, path=None, digest=None):
+        """Build an entry from an already parsed workflow."""
+        header = {key: data[key] for key in ('name', 'id', 'versionId', 'active') if key in data}
+        header['description'] = extract_description(data)
+        header['node_count'] = len(data.get('nodes', []))
+        return cls(header, path=path, digest=digest, size=len(jsonio.dumps(data)), data=data)
+
+    def load_data(self):
+        """Parse the full workflow document.
+
+        The result is not kept on the entry: once the payloads are built the
+        catalog only holds bytes.
+        """
+        if self._data is not None:
+            return self._data
+        return jsonio.load(self.path)
+
+    def stats(self, width=8, version_suffix="..."):
+        """Return the statistics block with id/version truncated to ``width``."""
+        key = (width, version_suffix)
+        stats = self._stats.get(key)
+        if stats is None:
+            stats = WorkflowStats(
+                self.node_count,
+                self.workflow_id[:width] + "...",
+                "Active" if self.active else "Inactive",
+                self.version_id[:width] + version_suffix,
+            )
+            self._stats[key] = stats
+        return stats
+
+    def payload(self, minify=False, compress=False):
+        """Serialized workflow for the download button, built once per version.
+
+        The default is ``indent=2`` JSON as the pages always offered; ``minify``
+        drops the whitespace and ``compress`` gzips the result.
+        """
+        key = (self.digest, minify, compress)
+        cache = self._payloads if self.digest is None else _payloads
+        payload = cache.get(key)
+        if payload is None:
+            payload = jsonio.dumps(self.load_data(), indent=not minify)
+            if compress:
+                payload = gzip.compress(payload, mtime=0)
+            cache[key] = payload
+        return payload
+
+    @property
+    def is_large_export(self):
+        return self.size > LARGE_EXPORT_BYTES
+
+    @property
+    def payload_ready(self):
+        """True if the default payload is already built in this process."""
+        cache = self._payloads if self.digest is None else _payloads
+        return (self.digest, False, False) in cache
+
+
+def placeholder(name):
+    """Entry used by the pages when a workflow file is missing or invalid."""
+    return WorkflowEntry.from_data({"name": name, "nodes": [], "id": "N/A", "active": False, "versionId": "N/A"})
+
+
+def workflow_path(filename):
+    """Resolve a workflow file name relative to the repository root."""
+    return os.path.join(ROOT_DIR, filename)
+
+
+def load_workflow(filename):
+    """Return the cached :class:`WorkflowEntry` for ``filename``.
+
+    Raises ``FileNotFoundError`` if the file does not exist and
+    ``json.JSONDecodeError`` if it cannot be parsed, so each page keeps
+    control over how those cases are reported.
+    """
+    path = workflow_path(filename)
+    st_ = os.stat(path)
+    signature = (st_.st_mtime_ns, st_.st_size)
+
+    cached = _entries.get(path)
+    if cached is not None and cached[0] == signature:
+        return cached[1]
+
+    with _lock:
+        cached = _entries.get(path)
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+        row = index.refresh_file(filename, ROOT_DIR)
+        if cached is not None and cached[1].digest == row.sha256:
+            # Touched but unchanged: keep the entry and its payloads.
+            entry = cached[1]
+        else:
+            entry = WorkflowEntry(row.header(), path=path, digest=row.sha256, size=row.size)
+        _entries[path] = (signature, entry)
+        if cached is not None and cached[1].digest != entry.digest:
+            _drop_payloads(cached[1].digest)
+        return entry
+
+
+def _drop_payloads(digest):
+    """Forget payloads of a superseded version unless another file shares it."""
+    if any(entry.digest == digest for _, entry in _entries.values()):
+        return
+    for key in [key for key in _payloads if key[0] == digest]:
+        del _payloads[key]
+
+
+def clear():
+    """Drop every cached entry."""
+    with _lock:
+        _entries.clear()
+        _payloads.clear()
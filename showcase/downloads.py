@@ -0,0 +1,34 @@
+"""Download buttons for a workflow's JSON export."""
+import streamlit as st
+
+
+def download_buttons(workflow, workflow_name, use_container_width=False):
+    """Render the "Download Workflow JSON" button(s) for ``workflow``.
+
+    Small exports are offered straight away from the per-version payload
+    cache. Large ones are not read or serialized until someone asks for
+    them: the page first shows a "Prepare" button, unless another session
+    has already built the payload in this process.
+    """
+    file_stem = workflow_name.replace(' ', '_')
+    ready_key = f"download_ready_{workflow.digest}"
+    if workflow.is_large_export and not (workflow.payload_ready or st.session_state.get(ready_key)):
+        if not st.button("📦 Prepare Workflow JSON", use_container_width=use_container_width):
+            return
+        st.session_state[ready_key] = True
+
+    st.download_button(
+        label="⬇️ Download Workflow JSON",
+        data=workflow.payload(),
+        file_name=f"{file_stem}.json",
+        mime="application/json",
+        use_container_width=use_container_width
+    )
+    if workflow.is_large_export:
+        st.download_button(
+            label="🗜️ Download Compressed (.json.gz)",
+            data=workflow.payload(minify=True, compress=True),
+            file_name=f"{file_stem}.json.gz",
+            mime="application/gzip",
+            use_container_width=use_container_width
+        )
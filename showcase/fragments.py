@@ -0,0 +1,82 @@
+"""Pre-rendered HTML for the static sections of the pages.
+
+The benefit cards, two-column "use case" grids and similar sections never
+change between reruns, yet each page used to rebuild them with f-strings and
+one ``st.markdown`` call per card on every interaction. Here each section is
+rendered once from its data into a single HTML string and memoized by
+content, so a rerun emits one precomputed element per section.
+
+Section data must be hashable (tuples of strings); it is the cache key.
+"""
+import html
+import threading
+
+_fragments = {}
+_lock = threading.Lock()
+
+
+def _text(value):
+    return html.escape(value, quote=False)
+
+
+def _fragment(kind, content, render):
+    key = (kind, content)
+    markup = _fragments.get(key)
+    if markup is None:
+        markup = render(content)
+        with _lock:
+            _fragments[key] = markup
+    return markup
+
+
+def _grid(cells, columns):
+    return f'<div class="card-grid card-grid-{columns}">' + "".join(cells) + "</div>"
+
+
+def _render_benefits(cards):
+    return _grid([
+        f'<div class="description-box"><h4>{_text(heading)}</h4><p>{_text(text)}</p></div>'
+        for heading, text in cards
+    ], len(cards))
+
+
+def _render_checklist(items):
+    return _grid([
+        f'<div class="description-box"><div class="description-title">✓ {_text(title)}</div>'
+        f'<div class="description-content">{_text(text)}</div></div>'
+        for title, text in items
+    ], 2)
+
+
+def _render_data_points(points):
+    rows = "<br><br>".join(f"<strong>{_text(label)}:</strong> {_text(text)}" for label, text in points)
+    return f'<div class="description-box"><div class="description-content">{rows}</div></div>'
+
+
+def _render_features(features):
+    return _grid([
+        f'<div class="feature-card"><div class="feature-icon">{icon}</div>'
+        f'<div class="feature-title">{_text(title)}</div>'
+        f'<div class="feature-description">{_text(text)}</div></div>'
+        for icon, title, text in features
+    ], len(features))
+
+
+def benefit_cards(cards):
+    """One row of "Business Benefits" cards from ``(heading, text)`` pairs."""
+    return _fragment("benefits", cards, _render_benefits)
+
+
+def checklist_grid(items):
+    """Two-column grid of "✓ title" cards from ``(title, text)`` pairs."""
+    return _fragment("checklist", items, _render_checklist)
+
+
+def data_points(points):
+    """A single box listing ``(label, text)`` pairs."""
+    return _fragment("data_points", points, _render_data_points)
+
+
+def feature_cards(features):
+    """One row of Home page feature cards from ``(icon, title, text)`` triples."""
+    return _fragment("features", features, _render_features)
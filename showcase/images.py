@@ -0,0 +1,64 @@
+"""Render showcase images either as static URLs or through ``st.image``."""
+import html
+import os
+
+import streamlit as st
+
+from showcase import assets
+
+# Matches the caption style Streamlit uses under st.image.
+_FIGURE = (
+    '<figure style="margin: 0 0 1rem 0;">'
+    '<img src="{src}"{srcset} sizes="{sizes}" width="{width}" height="{height}" alt="{alt}" '
+    'loading="lazy" decoding="async" style="width: 100%; height: auto;">'
+    '<figcaption style="text-align: center; color: rgba(49, 51, 63, 0.6); font-size: 14px; margin-top: 0.375rem;">'
+    '{caption}</figcaption></figure>'
+)
+COLUMN_SIZES = "(max-width: 640px) 100vw, 50vw"
+FULL_SIZES = "100vw"
+
+_figures = {}
+
+
+def static_serving_enabled():
+    return bool(st.get_option("server.enableStaticServing"))
+
+
+def _figure_html(name, caption, width, sizes):
+    key = (name, caption, width, sizes, assets.load_manifest().get(name, {}).get("sha256"))
+    markup = _figures.get(key)
+    if markup is None:
+        image = assets.static_image(name, width)
+        if image is None:
+            return None
+        markup = _FIGURE.format(
+            src=html.escape(image["src"]),
+            srcset=f' srcset="{html.escape(image["srcset"])}"' if image["srcset"] else "",
+            sizes=sizes,
+            width=image["width"],
+            height=image["height"],
+            alt=html.escape(caption),
+            caption=html.escape(caption),
+        )
+        _figures[key] = markup
+    return markup
+
+
+def show_image(name, caption, width=assets.COLUMN_WIDTH, sizes=COLUMN_SIZES):
+    """Display image ``name`` (path relative to the repo root) at column width.
+
+    With static serving enabled and the asset published by ``build_assets.py``
+    this emits an ``<img>`` pointing at the content-hashed URL, so the bytes
+    are fetched once per browser and cached. Otherwise the best local variant
+    goes through ``st.image``. Returns ``False`` if no image file exists.
+    """
+    if static_serving_enabled():
+        markup = _figure_html(name, caption, width, sizes)
+        if markup is not None:
+            st.markdown(markup, unsafe_allow_html=True)
+            return True
+    path = assets.image_variant(name, width)
+    if not os.path.exists(path):
+        return False
+    st.image(path, use_column_width=True, caption=caption)
+    return True
@@ -0,0 +1,197 @@
+"""Persistent index of the workflow files in the repository root.
+
+Every ``workflow*.json`` is scanned once (see :mod:`showcase.jsonstream`)
+into a row of a small SQLite database holding what the pages show: name,
+tags, node count, node types, sticky-note description, id, versionId and
+active flag. Rows are refreshed incrementally: a file is only read again
+when its mtime/size change, and only re-scanned when its content hash
+changes too. Because the index outlives the server process, a fresh process
+can render a page without touching the workflow file at all.
+
+Run ``python -m showcase.index`` to build or refresh it ahead of time.
+"""
+import glob
+import hashlib
+import json
+import os
+import sqlite3
+import sys
+import threading
+import time
+
+from showcase.jsonstream import scan_workflow
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+INDEX_PATH = os.environ.get("SHOWCASE_INDEX_PATH", os.path.join(ROOT_DIR, "workflow_index.sqlite"))
+PATTERN = "workflow*.json"
+SCAN_FIELDS = ("name", "id", "versionId", "active", "tags")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS workflows (
+    filename    TEXT PRIMARY KEY,
+    mtime_ns    INTEGER NOT NULL,
+    size        INTEGER NOT NULL,
+    sha256      TEXT NOT NULL,
+    name        TEXT,
+    workflow_id TEXT,
+    version_id  TEXT,
+    active      INTEGER NOT NULL,
+    tags        TEXT NOT NULL,
+    node_count  INTEGER NOT NULL,
+    node_types  TEXT NOT NULL,
+    description TEXT,
+    indexed_at  REAL NOT NULL
+)
+"""
+_COLUMNS = ("filename", "mtime_ns", "size", "sha256", "name", "workflow_id", "version_id", "active",
+            "tags", "node_count", "node_types", "description", "indexed_at")
+
+_local = threading.local()
+_write_lock = threading.Lock()
+
+
+class IndexRow:
+    """One indexed workflow file."""
+
+    __slots__ = _COLUMNS
+
+    def __init__(self, values):
+        for column, value in zip(_COLUMNS, values):
+            setattr(self, column, value)
+        self.tags = json.loads(self.tags)
+        self.node_types = json.loads(self.node_types)
+        self.active = bool(self.active)
+
+    def header(self):
+        """The fields in the shape ``scan_workflow`` returns them."""
+        header = {
+            "name": self.name,
+            "active": self.active,
+            "description": self.description,
+            "node_count": self.node_count,
+            "node_types": self.node_types,
+            "tags": self.tags,
+        }
+        if self.workflow_id is not None:
+            header["id"] = self.workflow_id
+        if self.version_id is not None:
+            header["versionId"] = self.version_id
+        return header
+
+
+def connection():
+    """Per-thread connection to the index, creating the schema if needed."""
+    conn = getattr(_local, "conn", None)
+    if conn is None:
+        try:
+            conn = sqlite3.connect(INDEX_PATH, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+        except sqlite3.OperationalError:
+            # Read-only checkout: keep a per-thread index in memory instead.
+            conn = sqlite3.connect(":memory:")
+        conn.execute(_SCHEMA)
+        _local.conn = conn
+    return conn
+
+
+def _tag_names(tags):
+    """n8n exports tags either as strings or as ``{"name": ...}`` objects."""
+    if not isinstance(tags, list):
+        return []
+    return [tag.get("name", "") if isinstance(tag, dict) else str(tag) for tag in tags]
+
+
+def _file_digest(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _fetch(conn, filename):
+    values = conn.execute(f"SELECT {', '.join(_COLUMNS)} FROM workflows WHERE filename = ?", (filename,)).fetchone()
+    return IndexRow(values) if values else None
+
+
+def _optional_str(value):
+    return None if value is None else str(value)
+
+
+def refresh_file(filename, root=ROOT_DIR):
+    """Return the up-to-date :class:`IndexRow` for ``filename``.
+
+    Raises ``FileNotFoundError`` (and drops the row) if the file is gone and
+    ``json.JSONDecodeError`` if it cannot be scanned.
+    """
+    conn = connection()
+    path = os.path.join(root, filename)
+    try:
+        st_ = os.stat(path)
+    except FileNotFoundError:
+        with _write_lock, conn:
+            conn.execute("DELETE FROM workflows WHERE filename = ?", (filename,))
+        raise
+
+    row = _fetch(conn, filename)
+    if row is not None and (row.mtime_ns, row.size) == (st_.st_mtime_ns, st_.st_size):
+        return row
+
+    digest = _file_digest(path)
+    with _write_lock, conn:
+        if row is not None and row.sha256 == digest:
+            conn.execute("UPDATE workflows SET mtime_ns = ?, size = ? WHERE filename = ?",
+                         (st_.st_mtime_ns, st_.st_size, filename))
+        else:
+            header = scan_workflow(path, count_nodes=True, node_types=True, fields=SCAN_FIELDS)
+            conn.execute(
+                f"INSERT OR REPLACE INTO workflows ({', '.join(_COLUMNS)}) VALUES ({', '.join('?' * len(_COLUMNS))})",
+                (
+                    filename, st_.st_mtime_ns, st_.st_size, digest,
+                    _optional_str(header.get("name")),
+                    _optional_str(header.get("id")),
+                    _optional_str(header.get("versionId")),
+                    int(bool(header.get("active", False))),
+                    json.dumps(_tag_names(header.get("tags"))),
+                    header.get("node_count", 0),
+                    json.dumps(header.get("node_types", [])),
+                    header["description"],
+                    time.time(),
+                ),
+            )
+    return _fetch(conn, filename)
+
+
+def refresh(root=ROOT_DIR, pattern=PATTERN):
+    """Bring the index in line with every file matching ``pattern``.
+
+    Returns ``(rows, failures)`` where ``failures`` maps file names to errors.
+    """
+    filenames = sorted(os.path.basename(p) for p in glob.glob(os.path.join(root, pattern)))
+    rows, failures = [], {}
+    for filename in filenames:
+        try:
+            rows.append(refresh_file(filename, root))
+        except (OSError, ValueError) as e:
+            failures[filename] = e
+    conn = connection()
+    with _write_lock, conn:
+        known = [name for (name,) in conn.execute("SELECT filename FROM workflows")]
+        stale = [(name,) for name in known if name not in filenames]
+        conn.executemany("DELETE FROM workflows WHERE filename = ?", stale)
+    return rows, failures
+
+
+def main():
+    started = time.perf_counter()
+    rows, failures = refresh()
+    for row in rows:
+        print(f"{row.filename}: {row.name} ({row.node_count} nodes, {len(row.node_types)} types)")
+    for filename, error in failures.items():
+        print(f"error: {filename}: {error}", file=sys.stderr)
+    print(f"Indexed {len(rows)} workflows into {INDEX_PATH} in {time.perf_counter() - started:.2f}s")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
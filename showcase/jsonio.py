@@ -0,0 +1,55 @@
+"""JSON encoding and decoding with the fastest available backend.
+
+orjson is used when installed, then msgspec, then the standard library.
+Every backend produces the same Python objects; only speed differs, and
+``dumps`` always returns UTF-8 ``bytes``.
+"""
+import json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+if orjson is not None:
+    BACKEND = "orjson"
+
+    def loads(data):
+        return orjson.loads(data)
+
+    def dumps(obj, indent=False):
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0)
+
+elif msgspec is not None:
+    BACKEND = "msgspec"
+    _decoder = msgspec.json.Decoder()
+    _encoder = msgspec.json.Encoder()
+
+    def loads(data):
+        return _decoder.decode(data)
+
+    def dumps(obj, indent=False):
+        data = _encoder.encode(obj)
+        return msgspec.json.format(data, indent=2) if indent else data
+
+else:
+    BACKEND = "json"
+
+    def loads(data):
+        return json.loads(data)
+
+    def dumps(obj, indent=False):
+        if indent:
+            return json.dumps(obj, indent=2, ensure_ascii=False).encode("utf-8")
+        return json.dumps(obj, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+def load(path):
+    """Read and decode the JSON file at ``path``."""
+    with open(path, "rb") as f:
+        return loads(f.read())
@@ -0,0 +1,262 @@
+"""Incremental scanning of n8n workflow exports.
+
+``json.load`` has to build the whole document before anything can be read
+from it, which for exports with a large ``pinData`` or thousands of nodes
+means tens of MB of objects just to show a name and a description.
+:class:`JSONScanner` pulls tokens from a file in fixed-size chunks and can
+skip values without materializing them, so :func:`scan_workflow` reads only
+the header fields and the first sticky note, stops as soon as it has them,
+and keeps memory bounded by the chunk size plus the values it returns.
+"""
+import json
+import re
+
+CHUNK_SIZE = 64 * 1024
+STICKY_NOTE_TYPE = "n8n-nodes-base.stickyNote"
+HEADER_FIELDS = ("name", "id", "versionId", "active")
+
+_WHITESPACE = re.compile(rb"[ \t\n\r]*")
+# Longest run of string body that does not end in the middle of an escape.
+_STRING_BODY = re.compile(rb'[^"\\]*(?:\\.[^"\\]*)*', re.DOTALL)
+# Run of anything other than brackets, including complete strings.
+_SKIPPABLE = re.compile(rb'(?:[^"{}\[\]]+|"[^"\\]*(?:\\.[^"\\]*)*")*', re.DOTALL)
+_SCALAR = re.compile(rb"[-+0-9.eEa-z]+")
+
+_QUOTE = ord('"')
+_OPENERS = frozenset(b"{[")
+
+
+class JSONScanner:
+    """Pull tokenizer over a binary file object."""
+
+    def __init__(self, f, chunk_size=CHUNK_SIZE):
+        self.f = f
+        self.chunk_size = chunk_size
+        self.buf = b""
+        self.pos = 0
+        self.offset = 0  # file offset of buf[0]
+
+    def _fill(self):
+        """Append the next chunk to the unread part of the buffer."""
+        chunk = self.f.read(self.chunk_size)
+        if not chunk:
+            return False
+        self.offset += self.pos
+        self.buf = self.buf[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def _error(self, message, position=None):
+        if position is None:
+            position = self.offset + self.pos
+        raise json.JSONDecodeError(message, "", position)
+
+    def peek(self):
+        """Next non-whitespace byte (as an int) without consuming it, or None."""
+        while True:
+            self.pos = _WHITESPACE.match(self.buf, self.pos).end()
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self._fill():
+                return None
+
+    def expect(self, char):
+        if self.peek() != ord(char):
+            self._error(f"expected {char!r}")
+        self.pos += 1
+
+    def _string(self, keep):
+        """Consume a string whose opening quote has been consumed."""
+        start = self.offset + self.pos - 1
+        parts = []
+        while True:
+            end = _STRING_BODY.match(self.buf, self.pos).end()
+            if end < len(self.buf) and self.buf[end] == _QUOTE:
+                if keep:
+                    parts.append(self.buf[self.pos:end])
+                self.pos = end + 1
+                if not keep:
+                    return None
+                raw = b"".join(parts)
+                return json.loads(b'"' + raw + b'"') if b"\\" in raw else raw.decode("utf-8")
+            # Buffer ended inside the string (possibly mid-escape): keep the
+            # unmatched tail and read on.
+            if keep:
+                parts.append(self.buf[self.pos:end])
+            self.pos = end
+            if not self._fill():
+                self._error("unterminated string", start)
+
+    def read_string(self):
+        self.expect('"')
+        return self._string(keep=True)
+
+    def _scalar(self):
+        while len(self.buf) - self.pos < 64 and self._fill():
+            pass
+        match = _SCALAR.match(self.buf, self.pos)
+        if not match:
+            self._error("unexpected character")
+        self.pos = match.end()
+        return match.group()
+
+    def skip_rest(self, depth=1):
+        """Skip to the end of the container(s) the scanner is inside."""
+        while depth:
+            end = _SKIPPABLE.match(self.buf, self.pos).end()
+            if end == len(self.buf):
+                self.pos = end
+                if not self._fill():
+                    self._error("unexpected end of data")
+                continue
+            char = self.buf[end]
+            self.pos = end + 1
+            if char == _QUOTE:
+                # A string that runs past the end of the buffer.
+                self._string(keep=False)
+            elif char in _OPENERS:
+                depth += 1
+            else:
+                depth -= 1
+
+    def skip_value(self):
+        """Consume the next value without building it."""
+        char = self.peek()
+        if char is None:
+            self._error("unexpected end of data")
+        if char == _QUOTE:
+            self.pos += 1
+            self._string(keep=False)
+        elif char in _OPENERS:
+            self.pos += 1
+            self.skip_rest()
+        else:
+            self._scalar()
+
+    def read_value(self):
+        """Consume and return the next value. Containers are built in full."""
+        char = self.peek()
+        if char == _QUOTE:
+            return self.read_string()
+        if char in _OPENERS:
+            closer = "}" if char == ord("{") else "]"
+            items = [] if closer == "]" else {}
+            if closer == "}":
+                for key in self.iter_object(opened=False):
+                    items[key] = self.read_value()
+            else:
+                for _ in self.iter_array(opened=False):
+                    items.append(self.read_value())
+            return items
+        return json.loads(self._scalar())
+
+    def iter_object(self, opened=False):
+        """Yield each key of an object; the caller must consume its value."""
+        if not opened:
+            self.expect("{")
+        if self.peek() == ord("}"):
+            self.pos += 1
+            return
+        while True:
+            key = self.read_string()
+            self.expect(":")
+            yield key
+            char = self.peek()
+            if char != ord("}") and char != ord(","):
+                self._error("expected ',' or '}'")
+            self.pos += 1
+            if char == ord("}"):
+                return
+
+    def iter_array(self, opened=False):
+        """Yield once per element of an array; the caller must consume it."""
+        if not opened:
+            self.expect("[")
+        if self.peek() == ord("]"):
+            self.pos += 1
+            return
+        index = 0
+        while True:
+            yield index
+            index += 1
+            char = self.peek()
+            if char != ord("]") and char != ord(","):
+                self._error("expected ',' or ']'")
+            self.pos += 1
+            if char == ord("]"):
+                return
+
+
+def is_sticky_note(node):
+    return node.get("type") == STICKY_NOTE_TYPE
+
+
+def _scan_node(scanner):
+    """Read ``type``, ``name`` and ``parameters.content`` of a node."""
+    node = {}
+    for key in scanner.iter_object():
+        if key in ("type", "name") and scanner.peek() == _QUOTE:
+            node[key] = scanner.read_string()
+        elif key == "parameters" and scanner.peek() == ord("{"):
+            for param in scanner.iter_object():
+                if param == "content":
+                    node["content"] = scanner.read_value()
+                else:
+                    scanner.skip_value()
+        else:
+            scanner.skip_value()
+    return node
+
+
+def scan_workflow(f, predicate=is_sticky_note, count_nodes=False, node_types=False,
+                  fields=HEADER_FIELDS, chunk_size=CHUNK_SIZE):
+    """Read the header fields and first matching note of a workflow export.
+
+    ``f`` is a path or a binary file object. Returns a dict with whichever of
+    ``fields`` (by default ``name``, ``id``, ``versionId`` and ``active``) are
+    present, plus ``description`` (the ``parameters.content`` of the first
+    node accepted by ``predicate``, or ``None``). With ``count_nodes`` the
+    result also has ``node_count`` and with ``node_types`` the distinct node
+    types in order of appearance; both require reading through the whole
+    nodes array. Otherwise scanning stops once everything has been found.
+    """
+    if isinstance(f, (str, bytes)) or hasattr(f, "__fspath__"):
+        with open(f, "rb") as fh:
+            return scan_workflow(fh, predicate, count_nodes, node_types, fields, chunk_size)
+
+    scanner = JSONScanner(f, chunk_size)
+    result = {"description": None}
+    types = {}
+    nodes_done = False
+
+    for key in scanner.iter_object():
+        if key in fields and key not in result:
+            result[key] = scanner.read_value()
+        elif key == "nodes" and not nodes_done and scanner.peek() == ord("["):
+            count = 0
+            for _ in scanner.iter_array():
+                count += 1
+                found = result["description"] is not None
+                if (found and not node_types) or scanner.peek() != ord("{"):
+                    scanner.skip_value()
+                    continue
+                node = _scan_node(scanner)
+                if "type" in node:
+                    types.setdefault(node["type"], None)
+                if not found and "content" in node and predicate(node):
+                    result["description"] = node["content"]
+                    if not (count_nodes or node_types):
+                        scanner.skip_rest()
+                        break
+            else:
+                if count_nodes:
+                    result["node_count"] = count
+                if node_types:
+                    result["node_types"] = list(types)
+            nodes_done = True
+        else:
+            scanner.skip_value()
+
+        if nodes_done and all(field in result for field in fields):
+            break
+    return result
@@ -0,0 +1,116 @@
+"""The shared stylesheet of Home and every page.
+
+Each page used to carry its own copy of a ~70 line ``<style>`` block and send
+it again on every rerun. The rules now live once in ``theme.css``. The
+minified form is written to ``theme.min.css`` at build time (``python -m
+showcase.theme`` or ``build_assets.py``) and is named by the hash of its
+content.
+
+:func:`apply` hands the stylesheet to the browser once per session. It does
+not emit a ``st.markdown`` element, which Streamlit would drop on the next
+rerun that does not repeat it. Instead a zero-height component appends a
+``<style id="showcase-theme-<hash>">`` to the app document's ``<head>``, and
+that element stays there across reruns and page switches. A new hash (after
+the CSS changes) replaces the old element in sessions that are already open.
+"""
+import hashlib
+import json
+import os
+import re
+import sys
+
+import streamlit as st
+import streamlit.components.v1 as components
+
+THEME_DIR = os.path.dirname(os.path.abspath(__file__))
+SOURCE_PATH = os.path.join(THEME_DIR, "theme.css")
+MINIFIED_PATH = os.path.join(THEME_DIR, "theme.min.css")
+
+_COMMENT = re.compile(r"/\*.*?\*/", re.DOTALL)
+_SPACE = re.compile(r"\s+")
+_PUNCTUATION = re.compile(r"\s*([{};:,>])\s*")
+# First line of theme.min.css: the hash of the source it was built from.
+_HEADER = "/*source:{}*/\n"
+
+_INJECT = """<script>
+const doc = window.parent.document;
+if (!doc.getElementById("showcase-theme-{version}")) {{
+    doc.querySelectorAll("style[data-showcase-theme]").forEach((el) => el.remove());
+    const style = doc.createElement("style");
+    style.id = "showcase-theme-{version}";
+    style.dataset.showcaseTheme = "{version}";
+    style.textContent = {css};
+    doc.head.appendChild(style);
+}}
+</script>"""
+
+_stylesheet = None
+
+
+def minify(css):
+    """Drop comments and every whitespace run CSS does not need."""
+    css = _COMMENT.sub("", css)
+    css = _SPACE.sub(" ", css)
+    css = _PUNCTUATION.sub(r"\1", css)
+    return css.replace(";}", "}").strip()
+
+
+def _source():
+    with open(SOURCE_PATH, "r", encoding="utf-8") as f:
+        css = f.read()
+    return css, hashlib.sha256(css.encode("utf-8")).hexdigest()[:12]
+
+
+def build():
+    """Write ``theme.min.css`` from ``theme.css``; return its path."""
+    css, source_hash = _source()
+    with open(MINIFIED_PATH, "w", encoding="utf-8") as f:
+        f.write(_HEADER.format(source_hash) + minify(css))
+    return MINIFIED_PATH
+
+
+def stylesheet():
+    """Return ``(version, minified_css)``.
+
+    Uses the prebuilt ``theme.min.css`` when it was built from the current
+    source, and minifies in-process otherwise (e.g. in a fresh checkout).
+    """
+    global _stylesheet
+    if _stylesheet is None:
+        css, source_hash = _source()
+        minified = None
+        try:
+            with open(MINIFIED_PATH, "r", encoding="utf-8") as f:
+                header = f.readline()
+                if header == _HEADER.format(source_hash):
+                    minified = f.read()
+        except FileNotFoundError:
+            pass
+        if minified is None:
+            minified = minify(css)
+        version = hashlib.sha256(minified.encode("utf-8")).hexdigest()[:12]
+        _stylesheet = (version, minified)
+    return _stylesheet
+
+
+def apply():
+    """Make sure this session's browser has the current theme."""
+    version, css = stylesheet()
+    key = f"theme_{version}"
+    if st.session_state.get(key):
+        return
+    payload = json.dumps(css).replace("</", "<\\/")
+    components.html(_INJECT.format(version=version, css=payload), height=0)
+    st.session_state[key] = True
+
+
+def main():
+    path = build()
+    version, css = stylesheet()
+    source, _ = _source()
+    print(f"Wrote {path} ({len(source)} -> {len(css)} bytes, version {version})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
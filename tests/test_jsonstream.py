@@ -0,0 +1,143 @@
+import io
+import json
+from pathlib import Path
+
+import pytest
+
+from showcase.jsonstream import STICKY_NOTE_TYPE, JSONScanner, scan_workflow
+
+ROOT = Path(__file__).resolve().parent.parent
+CHUNK_SIZES = (1, 2, 3, 5, 7)
+NOTE = "## Lead \"finder\"\n\\ café — \U0001f600 {not [a] container}"
+
+
+def workflow(nodes, **header):
+    return {"name": "Leads", **header, "nodes": nodes, "connections": {}}
+
+
+def note(content, name="Note"):
+    return {"name": name, "type": STICKY_NOTE_TYPE, "parameters": {"content": content}}
+
+
+def node(name, kind="n8n-nodes-base.set", **parameters):
+    return {"name": name, "type": kind, "parameters": parameters}
+
+
+class Reader(io.BytesIO):
+    """Counts the bytes handed out."""
+
+    consumed = 0
+
+    def read(self, size=-1):
+        data = super().read(size)
+        self.consumed += len(data)
+        return data
+
+
+def scan(document, chunk_size, **options):
+    data = document if isinstance(document, bytes) else json.dumps(document).encode()
+    return scan_workflow(io.BytesIO(data), chunk_size=chunk_size, **options)
+
+
+@pytest.mark.parametrize("chunk_size", CHUNK_SIZES)
+def test_escapes_across_chunks(chunk_size):
+    document = workflow([node("Start", code='a\\"b'), note(NOTE)], id="w\\1", versionId="é", active=True)
+    assert scan(document, chunk_size) == {"description": NOTE, "name": "Leads", "id": "w\\1",
+                                          "versionId": "é", "active": True}
+
+
+@pytest.mark.parametrize("chunk_size", CHUNK_SIZES)
+def test_values_match_json(chunk_size):
+    value = {"s": NOTE, "n": [-1.5e3, 0, 12], "t": [True, False, None], "o": {"": [], "x": {}}, "u": "\\u0041"}
+    for text in (json.dumps(value), json.dumps(value, ensure_ascii=False, indent=2)):
+        scanner = JSONScanner(io.BytesIO(text.encode()), chunk_size)
+        assert scanner.read_value() == value
+        assert scanner.peek() is None
+
+
+@pytest.mark.parametrize("chunk_size", CHUNK_SIZES)
+def test_skipped_values(chunk_size):
+    nested = {"a": ["]", "}", "\\\"", {"b": [[], {}]}], "c": "{"}
+    document = workflow([node("Start", nested=nested), node("Note", STICKY_NOTE_TYPE), note(NOTE)],
+                        pinData={"Start": [nested] * 3})
+    assert scan(document, chunk_size, count_nodes=True, node_types=True) == {
+        "description": NOTE,
+        "name": "Leads",
+        "node_count": 3,
+        "node_types": ["n8n-nodes-base.set", STICKY_NOTE_TYPE],
+    }
+
+
+@pytest.mark.parametrize("chunk_size", CHUNK_SIZES)
+def test_first_note_and_predicate(chunk_size):
+    document = workflow([note("first"), note("second", name="Notes")])
+    assert scan(document, chunk_size)["description"] == "first"
+    named = scan(document, chunk_size, predicate=lambda found: found["name"] == "Notes")
+    assert named["description"] == "second"
+    assert scan(workflow([node("Start")]), chunk_size) == {"description": None, "name": "Leads"}
+
+
+@pytest.mark.parametrize("chunk_size", CHUNK_SIZES)
+def test_stops_early(chunk_size):
+    # Everything after the first note is left unread, even if it is malformed.
+    head = json.dumps({"name": "Leads", "id": "1", "versionId": "2", "active": False,
+                       "nodes": [note(NOTE), node("Set")]})[:-1].encode()
+    data = head + b', "pinData": {"Set": "' + b"x" * 10_000 + b'"}, @@@'
+    f = Reader(data)
+    assert scan_workflow(f, chunk_size=chunk_size) == {"description": NOTE, "name": "Leads", "id": "1",
+                                                       "versionId": "2", "active": False}
+    assert f.consumed <= len(head) + chunk_size
+
+
+@pytest.mark.parametrize("chunk_size", CHUNK_SIZES)
+def test_reads_on_for_missing_fields(chunk_size):
+    document = {"nodes": [note(NOTE)], "pinData": {"x": ["]"]}, "name": "Leads"}
+    assert scan(document, chunk_size, fields=("name", "id")) == {"description": NOTE, "name": "Leads"}
+
+
+@pytest.mark.parametrize("chunk_size", CHUNK_SIZES)
+@pytest.mark.parametrize("data", [
+    b'{"name": "x" "id": 1}',
+    b'{"nodes": [1 2]}',
+    b'{"name" 1}',
+    b'{"name": @}',
+    b'{"name": "unterminated',
+    b'{"name": "a\\',
+    b'{"name": "x"',
+    b'{"nodes": [{"a": [1, 2]}, 3',
+    b'  {"nodes": [{"type": "x" 1}]}',
+])
+def test_malformed(data, chunk_size):
+    with pytest.raises(json.JSONDecodeError) as error:
+        scan(data, chunk_size, count_nodes=True)
+    with pytest.raises(json.JSONDecodeError) as expected:
+        json.loads(data)
+    assert error.value.pos == expected.value.pos
+
+
+@pytest.mark.parametrize("chunk_size", CHUNK_SIZES)
+def test_unexpected_end(chunk_size):
+    with pytest.raises(json.JSONDecodeError, match="unexpected end of data") as error:
+        scan(b'{"nodes": [{"a": [1, 2', chunk_size, count_nodes=True)
+    assert error.value.pos == 22
+
+
+@pytest.mark.parametrize("chunk_size", CHUNK_SIZES)
+def test_not_an_object(chunk_size):
+    with pytest.raises(json.JSONDecodeError, match="expected '{'") as error:
+        scan(b'\n [{"name": "Leads"}]', chunk_size)
+    assert error.value.pos == 2
+
+
+@pytest.mark.parametrize("path", sorted(ROOT.glob("workflow*.json")), ids=lambda path: path.name)
+def test_repo_workflows(path):
+    with open(path, encoding="utf-8") as f:
+        document = json.load(f)
+    notes = [n["parameters"]["content"] for n in document["nodes"]
+             if n.get("type") == STICKY_NOTE_TYPE and "content" in n.get("parameters", {})]
+    result = scan_workflow(path, count_nodes=True, node_types=True, chunk_size=7)
+    assert result["description"] == (notes[0] if notes else None)
+    assert result["node_count"] == len(document["nodes"])
+    assert result["node_types"] == list(dict.fromkeys(n["type"] for n in document["nodes"]))
+    assert {key: result[key] for key in ("name", "id", "versionId", "active") if key in result} == \
+        {key: document[key] for key in ("name", "id", "versionId", "active") if key in document}
@@ -0,0 +1,161 @@
+import json
+
+import pytest
+
+from engine.llmjson import ObjectScanner, ReplyParser, compile_schema
+
+EMAIL = {
+    "subject": "Quick idea",
+    "greeting": "Hi Ann,",
+    "opening_line": "I came across your site.",
+    "main_body": "We help teams like yours, and \"fast\".",
+    "ending": "Best, Bo",
+}
+REPLY = json.dumps(EMAIL)
+
+
+def lines(email, end=""):
+    """``email`` as a pretty object whose lines carry no commas."""
+    body = "\n".join(f"  {json.dumps(name)}: {json.dumps(value)}" for name, value in email.items())
+    return "{\n" + body + end + "\n}"
+
+
+@pytest.fixture
+def parser():
+    return ReplyParser()
+
+
+def test_clean_reply(parser):
+    assert parser.parse(REPLY) == (EMAIL, False)
+
+
+def test_object_in_prose_and_fence(parser):
+    assert parser.parse(f"Sure! Here it is:\n```json\n{REPLY}\n```\nLet me know.") == (EMAIL, False)
+
+
+def test_trailing_comma(parser):
+    assert parser.parse(REPLY[:-1] + ",}") == (EMAIL, True)
+
+
+def test_missing_commas(parser):
+    assert parser.parse(lines(EMAIL)) == (EMAIL, True)
+
+
+def test_missing_and_trailing_commas(parser):
+    assert parser.parse(lines(EMAIL, end=",")) == (EMAIL, True)
+
+
+def test_smart_quoted_values(parser):
+    reply = ", ".join(f'"{name}": “{value}”' for name, value in EMAIL.items() if name != "main_body")
+    expected = {name: value for name, value in EMAIL.items() if name != "main_body"}
+    parser = ReplyParser({"type": "object", "required": list(expected)})
+    assert parser.parse("{" + reply + "}") == (expected, True)
+
+
+def test_smart_quotes_only(parser):
+    reply = REPLY.replace('\\"', "'").replace('"', "“")
+    expected = dict(EMAIL, main_body="We help teams like yours, and 'fast'.")
+    assert parser.parse(reply) == (expected, True)
+
+
+def test_cut_off_after_last_value(parser):
+    assert parser.parse(REPLY[:-1]) == (EMAIL, True)
+
+
+def test_cut_off_inside_last_string(parser):
+    # The partial ending is dropped rather than sent.
+    with pytest.raises(ValueError, match="missing 'ending'"):
+        parser.parse(REPLY[:-4])
+
+
+def test_cut_off_keeps_complete_values():
+    parser = ReplyParser({"type": "object", "required": ["subject"]})
+    value, repaired = parser.parse('{"subject": "Quick idea", "greeting": "Hi An')
+    assert value == {"subject": "Quick idea"}
+    assert repaired
+
+
+def test_wrapper_object(parser):
+    assert parser.parse(json.dumps({"email": EMAIL})) == (EMAIL, True)
+
+
+def test_loose_keys(parser):
+    reply = json.dumps({"Subject Line": "Quick idea", "Salutation": "Hi Ann,", "Opening": "I came across your site.",
+                        "body": EMAIL["main_body"], "Sign-off": "Best, Bo"})
+    assert parser.parse(reply) == (EMAIL, True)
+
+
+def test_key_lines(parser):
+    reply = ("**Subject:** Quick idea\nGreeting: Hi Ann\n- Opening Line: I came across your site.\n"
+             "Main Body: We help teams like yours.\nEnding = Best")
+    assert parser.parse(reply) == ({
+        "subject": "Quick idea",
+        "greeting": "Hi Ann",
+        "opening_line": "I came across your site.",
+        "main_body": "We help teams like yours.",
+        "ending": "Best",
+    }, True)
+
+
+def test_first_valid_candidate_wins(parser):
+    assert parser.parse('{"note": "draft"} and then ' + REPLY) == (EMAIL, False)
+
+
+def test_no_object(parser):
+    with pytest.raises(ValueError, match="No JSON object found"):
+        parser.parse("I cannot help with that.")
+
+
+def test_empty_field(parser):
+    with pytest.raises(ValueError, match=r"\$\.main_body: length"):
+        parser.parse(json.dumps(dict(EMAIL, main_body=" ")))
+
+
+def test_invalid_json(parser):
+    with pytest.raises(ValueError, match="invalid JSON"):
+        parser.parse('{"subject": Quick idea}')
+
+
+def test_counts(parser):
+    assert parser({"text": REPLY}) == EMAIL
+    assert parser({"text": REPLY[:-1]}) == EMAIL
+    assert parser({"text": ""})["error"] == "Failed to parse JSON"
+    assert parser({})["error"] == "Failed to parse JSON"
+    assert parser.snapshot() == {"replies": 4, "clean": 1, "repaired": 1, "failed": 2, "success_rate": 0.5}
+
+
+def test_scanner_pieces():
+    text = 'a {"x": "}{\\"", "y": [1, {"z": 2}]} b {"w": 3} c {"v": "ab'
+    scanner = ObjectScanner()
+    for char in text:
+        scanner.feed(char)
+    assert scanner.objects == ['{"x": "}{\\"", "y": [1, {"z": 2}]}', '{"w": 3}']
+    assert scanner.in_string
+    assert scanner.tail() == '{"v": "ab"}'
+
+
+def test_scanner_tail_after_escape():
+    scanner = ObjectScanner()
+    scanner.feed('{"v": "a\\')
+    assert json.loads(scanner.tail()) == {"v": "a\\"}
+
+
+def test_scanner_tail_after_key():
+    scanner = ObjectScanner()
+    scanner.feed('{"a": [1, 2,')
+    assert json.loads(scanner.tail()) == {"a": [1, 2]}
+
+
+def test_compile_schema():
+    check = compile_schema({
+        "type": "object",
+        "required": ["n"],
+        "additionalProperties": False,
+        "properties": {"n": {"type": "integer"}, "tags": {"type": "array", "items": {"enum": ["a", "b"]}}},
+    })
+    assert check({"n": 1, "tags": ["a"]}) == []
+    assert check({"n": True}) == ["$.n: expected integer"]
+    assert check({}) == ["$: missing 'n'"]
+    assert check({"n": 1, "tags": ["c"]}) == ["$.tags[]: not one of ['a', 'b']"]
+    assert check({"n": 1, "x": 0}) == ["$: unexpected 'x'"]
+    assert check([]) == ["$: expected object"]